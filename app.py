@@ -116,6 +116,17 @@ def display_sidebar():
     top_k = st.sidebar.slider("Number of sources to retrieve", 1, 10, 5)
     max_context = st.sidebar.slider("Max context length", 500, 4000, 2000)
     
+    auto_filter = st.sidebar.checkbox("Auto-detect fiscal year / form filters", value=True,
+                                      help="Restrict retrieval to periods and forms named in the question")
+    
+    # Result diversification
+    use_mmr = st.sidebar.checkbox("Diversify sources (MMR)", value=False,
+                                  help="Reduce near-duplicate chunks for broad questions")
+    mmr_lambda = st.sidebar.slider("MMR relevance vs. diversity", 0.0, 1.0, 0.5, 0.05,
+                                   disabled=not use_mmr)
+    mmr_fetch_k = st.sidebar.slider("MMR candidates to fetch", 10, 100, 20, 5,
+                                    disabled=not use_mmr)
+    
     # System information
     st.sidebar.subheader("📊 System Information")
     st.sidebar.info("""
@@ -146,7 +157,7 @@ def display_sidebar():
         if st.sidebar.button(f"📝 {query[:30]}...", key=f"example_{hash(query)}"):
             st.session_state.example_query = query
     
-    return top_k, max_context
+    return top_k, max_context, auto_filter, use_mmr, mmr_lambda, mmr_fetch_k
 
 
 def format_response_display(result: Dict[str, Any]):
@@ -235,7 +246,7 @@ def main():
     display_header()
     
     # Display sidebar and get parameters
-    top_k, max_context = display_sidebar()
+    top_k, max_context, auto_filter, use_mmr, mmr_lambda, mmr_fetch_k = display_sidebar()
     
     # Initialize pipeline
     with st.spinner("🔄 Initializing RAG Pipeline..."):
@@ -272,6 +283,10 @@ def main():
                     # Update pipeline parameters
                     pipeline.top_k_results = top_k
                     pipeline.max_context_length = max_context
+                    pipeline.auto_filter = auto_filter
+                    pipeline.use_mmr = use_mmr
+                    pipeline.mmr_lambda = mmr_lambda
+                    pipeline.mmr_fetch_k = max(mmr_fetch_k, top_k)
                     
                     # Process query
                     start_time = time.time()
@@ -0,0 +1,90 @@
+"""
+Office Loader Benchmark
+
+Compares the direct-XML Word/PowerPoint loaders (DocxXMLLoader,
+PptxXMLLoader) with the Unstructured loaders they replace, on the
+earnings transcript and investor presentation folders. Reports wall time,
+documents produced and extracted characters per loader; a loader whose
+dependencies are not installed is reported as n/a.
+
+Author: Enterprise RAG Pipeline
+Usage: python benchmark_office_loaders.py [--docx-dir DIR] [--pptx-dir DIR] [--limit N]
+"""
+
+import glob
+import os
+import time
+import argparse
+from typing import Dict, Any, List, Optional
+
+from langchain_community.document_loaders import UnstructuredWordDocumentLoader, UnstructuredPowerPointLoader
+
+from modules.office_loader import DocxXMLLoader, PptxXMLLoader
+
+
+def run_loader(loader_class, files: List[str]) -> Optional[Dict[str, Any]]:
+    """Load every file with loader_class; None if the loader cannot run here."""
+    documents = 0
+    characters = 0
+    failures = 0
+    start = time.perf_counter()
+    for file_path in files:
+        try:
+            for doc in loader_class(file_path).lazy_load():
+                documents += 1
+                characters += len(doc.page_content)
+        except ImportError as e:
+            print(f"⚠️  {loader_class.__name__} unavailable: {str(e)}")
+            return None
+        except Exception as e:
+            failures += 1
+            print(f"⚠️  {loader_class.__name__} failed on {os.path.basename(file_path)}: {str(e)}")
+    return {
+        "seconds": time.perf_counter() - start,
+        "documents": documents,
+        "characters": characters,
+        "failures": failures
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark direct-XML vs Unstructured Office loaders")
+    parser.add_argument("--docx-dir", default="business_data/investor_relations/earnings_transcripts",
+                        help="Folder of .docx files (default: earnings transcripts)")
+    parser.add_argument("--pptx-dir", default="business_data/investor_relations/presentations",
+                        help="Folder of .pptx files (default: investor presentations)")
+    parser.add_argument("--limit", type=int, default=0, help="Only load the first N files of each folder")
+    args = parser.parse_args()
+
+    suites = [
+        (".docx", args.docx_dir, [DocxXMLLoader, UnstructuredWordDocumentLoader]),
+        (".pptx", args.pptx_dir, [PptxXMLLoader, UnstructuredPowerPointLoader])
+    ]
+
+    for extension, directory, loader_classes in suites:
+        files = sorted(glob.glob(os.path.join(directory, f"*{extension}")))
+        if args.limit:
+            files = files[:args.limit]
+        size_mb = sum(os.path.getsize(f) for f in files) / (1024 * 1024)
+
+        print(f"\n📊 {extension.upper()} LOADERS ({len(files)} files, {size_mb:.1f} MB in {directory})")
+        print("=" * 72)
+        print(f"  {'loader':<32} {'seconds':>9} {'ms/file':>9} {'documents':>10} {'characters':>11}")
+
+        baseline = None
+        for loader_class in loader_classes:
+            result = run_loader(loader_class, files) if files else None
+            if result is None:
+                print(f"  {loader_class.__name__:<32} {'n/a':>9} {'n/a':>9} {'n/a':>10} {'n/a':>11}")
+                continue
+            print(f"  {loader_class.__name__:<32} {result['seconds']:>9.2f} "
+                  f"{result['seconds'] * 1000 / len(files):>9.1f} {result['documents']:>10} "
+                  f"{result['characters']:>11}")
+            if baseline is None:
+                baseline = result
+            elif baseline["seconds"]:
+                print(f"  -> direct XML is {result['seconds'] / baseline['seconds']:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+PCA Dimensionality Reduction Benchmark
+
+Measures recall@k of PCA-projected embeddings against full-size search on
+an existing vector store. A projection is fitted on the stored vectors for
+each target width (64/128/256 by default), a sample of stored chunks is
+used as queries, and the top-k of an exact search in the reduced space is
+compared with the top-k at full width. Also reports explained variance,
+vector size and scan time per query.
+
+With --synthetic, clustered random vectors are used instead, so no
+populated store is needed (recall on real embeddings is usually higher,
+since their variance is concentrated in fewer directions).
+
+Author: Enterprise RAG Pipeline
+Usage: python benchmark_pca.py [--storage-path ./chroma_db] [--dims 64 128 256]
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from modules.pca_projector import PCAProjector
+from benchmark_quantization import load_corpus, synthetic_corpus
+
+
+def top_k_rows(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Exact cosine top-k rows for each query (vectors are unit length)."""
+    scores = queries @ vectors.T
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recall of PCA-reduced embeddings")
+    parser.add_argument("--storage-path", default="./chroma_db", help="Vector storage path (default: ./chroma_db)")
+    parser.add_argument("--collection-name", default="smb_documents", help="Collection name (default: smb_documents)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of a store")
+    parser.add_argument("--dim", type=int, default=384, help="Synthetic vector dimensions (default: 384)")
+    parser.add_argument("--dims", type=int, nargs="+", default=[64, 128, 256],
+                        help="Projected widths to evaluate (default: 64 128 256)")
+    parser.add_argument("--queries", type=int, default=200, help="Number of sampled queries (default: 200)")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query (default: 5)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        _, vectors = synthetic_corpus(args.synthetic, args.dim)
+    else:
+        _, vectors = load_corpus(args.storage_path, args.collection_name)
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    rng = np.random.default_rng(1)
+    query_rows = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    # Perturb sampled chunks so queries are near, not identical to, stored vectors
+    queries = vectors[query_rows] + 0.05 * rng.normal(size=(len(query_rows), vectors.shape[1])).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    start = time.perf_counter()
+    truth = top_k_rows(vectors, queries, args.top_k)
+    full_scan_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"\n📊 PCA RECALL ({len(vectors)} vectors, dim {vectors.shape[1]}, "
+          f"{len(queries)} queries, top-{args.top_k})")
+    print("=" * 72)
+    print(f"  {'dims':>5} {'explained var':>14} {'bytes/vector':>13} {'fit s':>7} {'scan ms':>9} {'recall@k':>9}")
+    print(f"  {vectors.shape[1]:>5} {1.0:>14.3f} {vectors.shape[1] * 4:>13} {0.0:>7.2f} {full_scan_ms:>9.2f} {1.0:>9.3f}")
+
+    for dims in sorted(args.dims):
+        if dims >= vectors.shape[1]:
+            continue
+        start = time.perf_counter()
+        projector = PCAProjector.fit(vectors, dims)
+        fit_time = time.perf_counter() - start
+
+        projected = projector.transform(vectors)
+        projected_queries = projector.transform(queries)
+
+        start = time.perf_counter()
+        found = top_k_rows(projected, projected_queries, args.top_k)
+        scan_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        hits = sum(len(set(expected) & set(got)) for expected, got in zip(truth, found))
+        info = projector.get_projection_info()
+        print(f"  {dims:>5} {info['explained_variance']:>14.3f} {dims * 4:>13} {fit_time:>7.2f} "
+              f"{scan_ms:>9.2f} {hits / (len(queries) * args.top_k):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Vector Quantization Benchmark
+
+Measures what float16 and int8 quantization cost in recall on an existing
+vector store. Stored vectors are read back from ChromaDB, a sample of them
+is used as queries, and each quantized index is compared against an exact
+float32 scan:
+- recall@k of the quantized scan alone
+- recall@k after exact float32 re-scoring of the candidate set
+- index size (held in addition to the float32 vectors) and scan time
+
+Vectors are added in the batch sizes EnterpriseVectorStorage.add_documents
+uses during ingest: batch_size first, then doubling per write up to the
+maximum write batch, so the int8 range sees what it sees in production.
+
+With --synthetic, random normalized vectors are used instead, so no
+populated store is needed.
+
+Author: Enterprise RAG Pipeline
+Usage: python benchmark_quantization.py [--storage-path ./chroma_db] [--top-k 5]
+"""
+
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from modules.quantized_index import QuantizedVectorIndex, SUPPORTED_QUANTIZATION
+from modules.vector_storage import EnterpriseVectorStorage
+
+
+def load_corpus(storage_path: str, collection_name: str):
+    """Read all IDs and float32 vectors from a vector store."""
+    storage = EnterpriseVectorStorage(storage_path=storage_path, collection_name=collection_name)
+    ids, vectors = [], []
+    while True:
+        page = storage.collection.get(limit=5000, offset=len(ids), include=["embeddings"])
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        vectors.append(np.asarray(page["embeddings"], dtype=np.float32))
+    if not ids:
+        raise SystemExit(f"No vectors found in {storage_path}/{collection_name}; try --synthetic")
+    return ids, np.concatenate(vectors)
+
+
+def synthetic_corpus(count: int, dim: int, seed: int = 0):
+    """Clustered random unit vectors, closer to real embeddings than pure noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, count // 50), dim))
+    vectors = centers[rng.integers(0, len(centers), size=count)] + 0.5 * rng.normal(size=(count, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return [f"chunk-{i}" for i in range(count)], vectors.astype(np.float32)
+
+
+def write_batch_sizes(total: int, first_batch: int, max_batch: int):
+    """Batch sizes of adaptive add_documents writes that stay under the target time."""
+    size = first_batch
+    while total > 0:
+        yield min(size, total)
+        total -= size
+        size = min(max_batch, max(EnterpriseVectorStorage.MIN_WRITE_BATCH_SIZE, size * 2))
+
+
+def exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    """Exact cosine top-k row indices."""
+    scores = (vectors @ query) / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+    return np.argsort(-scores)[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recall of quantized vector search")
+    parser.add_argument("--storage-path", default="./chroma_db", help="Vector storage path (default: ./chroma_db)")
+    parser.add_argument("--collection-name", default="smb_documents", help="Collection name (default: smb_documents)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of a store")
+    parser.add_argument("--dim", type=int, default=384, help="Synthetic vector dimensions (default: 384)")
+    parser.add_argument("--queries", type=int, default=200, help="Number of sampled queries (default: 200)")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query (default: 5)")
+    parser.add_argument("--candidates", type=int, default=64, help="Candidates re-scored in float32 (default: 64)")
+    parser.add_argument("--batch-size", type=int, default=32,
+                        help="First write batch, as ingest.py --batch-size (default: 32)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        ids, vectors = synthetic_corpus(args.synthetic, args.dim)
+    else:
+        ids, vectors = load_corpus(args.storage_path, args.collection_name)
+
+    rng = np.random.default_rng(1)
+    query_rows = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    # Perturb sampled chunks so queries are near, not identical to, stored vectors
+    queries = vectors[query_rows] + 0.05 * rng.normal(size=(len(query_rows), vectors.shape[1])).astype(np.float32)
+    truth = [set(exact_top_k(vectors, query, args.top_k)) for query in queries]
+    row_of = {chunk_id: row for row, chunk_id in enumerate(ids)}
+
+    start = time.perf_counter()
+    for query in queries:
+        vectors @ query
+    float32_scan_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"\n📊 QUANTIZATION RECALL ({len(vectors)} vectors, dim {vectors.shape[1]}, "
+          f"{len(queries)} queries, top-{args.top_k}, {args.candidates} candidates)")
+    print("=" * 72)
+    print(f"  {'mode':<9} {'memory MB':>10} {'scan ms':>9} {'recall (scan)':>14} {'recall (re-scored)':>19}")
+    # The quantized copies are extra memory: ChromaDB keeps the float32 vectors as well
+    print(f"  {'float32':<9} {vectors.nbytes / (1024 * 1024):>10.2f} {float32_scan_ms:>9.2f} {1.0:>14.3f} {1.0:>19.3f}")
+
+    root = tempfile.mkdtemp(prefix="quantization_benchmark_")
+    try:
+        for mode in SUPPORTED_QUANTIZATION:
+            index = QuantizedVectorIndex(f"{root}/{mode}", mode=mode)
+            start = 0
+            for size in write_batch_sizes(len(ids), args.batch_size,
+                                          EnterpriseVectorStorage.DEFAULT_MAX_WRITE_BATCH_SIZE):
+                index.add(ids[start:start + size], vectors[start:start + size])
+                start += size
+
+            scan_hits = rescored_hits = 0
+            scan_time = 0.0
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                candidates = index.search(query, num_candidates=args.candidates)
+                scan_time += time.perf_counter() - start
+
+                rows = np.array([row_of[chunk_id] for chunk_id, _ in candidates])
+                scan_hits += len(expected & set(rows[:args.top_k]))
+                candidate_vectors = vectors[rows]
+                exact = (candidate_vectors @ query) / np.linalg.norm(candidate_vectors, axis=1)
+                rescored_hits += len(expected & set(rows[np.argsort(-exact)[:args.top_k]]))
+
+            total = len(queries) * args.top_k
+            info = index.get_index_info()
+            print(f"  {mode:<9} {info['memory_mb']:>10.2f} {scan_time * 1000 / len(queries):>9.2f} "
+                  f"{scan_hits / total:>14.3f} {rescored_hits / total:>19.3f}")
+            if info["range_refits"]:
+                print(f"            int8 range widened {info['range_refits']} time(s) while adding")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
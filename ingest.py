@@ -12,12 +12,20 @@ import os
 import argparse
 import time
 from datetime import datetime
-from typing import Dict, Any, List
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Iterator
+
+import numpy as np
 
 from modules.document_loader import EnterpriseDocumentLoader
 from modules.text_chunker import EnterpriseTextChunker  
 from modules.embedding_generator import EnterpriseEmbeddingGenerator
-from modules.vector_storage import EnterpriseVectorStorage
+from modules.vector_storage import EnterpriseVectorStorage, BackgroundVectorWriter
+from modules.document_store import DocumentTextStore, DEFAULT_STORE_DIRNAME
+from modules.snapshot_manager import SnapshotManager
+from modules.pca_projector import PCAProjector, pca_projection_path
+from modules.parse_cache import DEFAULT_PARSE_CACHE_DIRNAME
+from modules.near_duplicate import near_duplicate_index_path
 
 
 class IngestionPipelineError(Exception):
@@ -43,6 +51,12 @@ class EnterpriseIngestionPipeline:
     - Batch processing for efficiency
     """
     
+    # Chunks embedded before fitting a PCA projection in background-writer mode
+    PCA_FIT_SAMPLES = 10000
+    
+    # Files whose parse was killed, kept beside the storage path across snapshots
+    QUARANTINE_FILENAME = "parse_quarantine.json"
+    
     def __init__(
         self,
         data_directory: str = "data",
@@ -50,7 +64,25 @@ class EnterpriseIngestionPipeline:
         storage_path: str = "./chroma_db",
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
-        batch_size: int = 32
+        batch_size: int = 32,
+        parent_chunk_size: Optional[int] = None,
+        parent_chunk_overlap: int = 0,
+        external_content: bool = False,
+        partition_by: Optional[str] = None,
+        num_shards: int = 0,
+        publish_snapshot: bool = False,
+        keep_snapshots: int = 3,
+        writer_threads: int = 0,
+        embedding_slice_size: int = 1024,
+        vector_quantization: Optional[str] = None,
+        pca_dims: Optional[int] = None,
+        stream_documents: bool = False,
+        isolate_parsing: bool = False,
+        parse_timeout: float = 300.0,
+        max_parse_memory_mb: Optional[float] = 4096,
+        parse_cache: bool = False,
+        deduplicate: bool = False,
+        dedup_threshold: float = 0.9
     ):
         """
         Initialize the ingestion pipeline with production settings.
@@ -62,6 +94,53 @@ class EnterpriseIngestionPipeline:
             chunk_size: Maximum characters per chunk
             chunk_overlap: Character overlap between chunks
             batch_size: Batch size for embedding generation
+            parent_chunk_size: Characters per parent window; enables small-to-big
+                retrieval with chunk_size-sized children (default: None)
+            parent_chunk_overlap: Character overlap between parent windows
+            external_content: Store chunk text in the compressed content store
+                instead of ChromaDB
+            partition_by: Metadata key to partition the collection on
+                (e.g. "fiscal_year"); new periods never touch older partitions
+            num_shards: Number of shard processes to spread chunks over
+                (default: 0, unsharded)
+            publish_snapshot: Build into a fresh versioned snapshot under
+                storage_path and publish it atomically when the run succeeds,
+                so running query processes never see a half-built store
+            keep_snapshots: Snapshots kept after publishing (default: 3)
+            writer_threads: Background threads writing to vector storage
+                while the next slice is embedded; 0 runs embedding and
+                storage as separate stages (default: 0)
+            embedding_slice_size: Chunks embedded per slice handed to the
+                background writers (default: 1024)
+            vector_quantization: Keep a "float16" or "int8" copy of the
+                vectors for exhaustive searches with exact float32 re-scoring,
+                in addition to ChromaDB's float32 vectors (default: None)
+            pca_dims: Reduce embeddings to this many dimensions with a PCA
+                projection fitted on the first embeddings of the run and saved
+                beside the collection (default: None). Collections that
+                already have a projection always reuse it.
+            stream_documents: Run loading, chunking, embedding and storage as
+                one streaming stage: documents are chunked as each page or
+                section is parsed and embedded in slices of
+                embedding_slice_size, so memory is bounded per slice instead
+                of per corpus (default: False)
+            isolate_parsing: Parse each file in a worker process that is
+                killed when it exceeds parse_timeout or max_parse_memory_mb;
+                such files are listed in <storage_path>/parse_quarantine.json
+                and skipped by later runs until they change (default: False)
+            parse_timeout: Seconds allowed per file when isolated (default: 300)
+            max_parse_memory_mb: Parse worker memory ceiling in MB when
+                isolated (default: 4096)
+            parse_cache: Cache parsed documents in <storage_path>/parse_cache,
+                keyed by file content and loader version, so later runs
+                (e.g. with another chunk size) only re-chunk and re-embed
+                (default: False)
+            deduplicate: Embed only one canonical version of sources with
+                the same content (a filing as DOCX, PDF and EDGAR bundle,
+                backup copies); stored sources are tracked beside the
+                collection so later copies are dropped too (default: False)
+            dedup_threshold: Share of a source's content that must occur in
+                the canonical source for it to be dropped (default: 0.9)
         """
         self.data_directory = data_directory
         self.collection_name = collection_name
@@ -69,22 +148,67 @@ class EnterpriseIngestionPipeline:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.batch_size = batch_size
+        self.parent_chunk_size = parent_chunk_size
+        self.parent_chunk_overlap = parent_chunk_overlap
+        self.text_store = None
+        self.keep_snapshots = keep_snapshots
+        self.writer_threads = writer_threads
+        self.embedding_slice_size = embedding_slice_size
+        self.pca_dims = pca_dims
+        self.stream_documents = stream_documents
+        self.snapshot_manager = None
+        self.snapshot_version = None
         
         # Initialize components
         print("=== Initializing Enterprise RAG Ingestion Pipeline ===\n")
         
         try:
+            # Snapshot builds write to their own directory until published
+            build_path = storage_path
+            if publish_snapshot:
+                self.snapshot_manager = SnapshotManager(storage_path)
+                self.snapshot_version = self.snapshot_manager.create_snapshot()
+                build_path = self.snapshot_manager.snapshot_path(self.snapshot_version)
+                print(f"📸 Building snapshot {self.snapshot_version} at: {build_path}\n")
+            self.build_path = build_path
+            
             print("1. Initializing Document Loader...")
-            self.document_loader = EnterpriseDocumentLoader()
+            # Quarantine list and parse cache outlive snapshots, so they sit beside them
+            self.document_loader = EnterpriseDocumentLoader(
+                isolate_parsing=isolate_parsing,
+                parse_timeout=parse_timeout,
+                max_parse_memory_mb=max_parse_memory_mb,
+                quarantine_path=os.path.join(storage_path, self.QUARANTINE_FILENAME) if isolate_parsing else None,
+                parse_cache_path=os.path.join(storage_path, DEFAULT_PARSE_CACHE_DIRNAME) if parse_cache else None,
+                deduplicate=deduplicate,
+                dedup_threshold=dedup_threshold,
+                dedup_index_path=near_duplicate_index_path(build_path, collection_name) if deduplicate else None
+            )
             print("   ✅ Document Loader ready")
+            if isolate_parsing:
+                print(f"   ✅ Isolated parsing: {parse_timeout:.0f}s, {max_parse_memory_mb:.0f} MB per file "
+                      f"({len(self.document_loader.quarantine)} file(s) quarantined)")
+            if parse_cache:
+                print(f"   ✅ Parse cache: {self.document_loader.parse_cache.cache_path}")
+            if deduplicate:
+                print(f"   ✅ Near-duplicate detection: threshold {dedup_threshold:.2f} "
+                      f"({len(self.document_loader.near_duplicates)} stored source(s) indexed)")
             
             print("\n2. Initializing Text Chunker...")
             self.text_chunker = EnterpriseTextChunker(
                 chunk_size=chunk_size,
-                chunk_overlap=chunk_overlap
+                chunk_overlap=chunk_overlap,
+                parent_chunk_size=parent_chunk_size,
+                parent_chunk_overlap=parent_chunk_overlap
             )
             print(f"   ✅ Text Chunker ready (size: {chunk_size}, overlap: {chunk_overlap})")
             
+            if parent_chunk_size:
+                self.text_store = DocumentTextStore(
+                    os.path.join(build_path, DEFAULT_STORE_DIRNAME)
+                )
+                print(f"   ✅ Parent document store ready (parent size: {parent_chunk_size})")
+            
             print("\n3. Initializing Embedding Generator...")
             self.embedding_generator = EnterpriseEmbeddingGenerator(
                 batch_size=batch_size,
@@ -94,14 +218,38 @@ class EnterpriseIngestionPipeline:
             
             print("\n4. Initializing Vector Storage...")
             self.vector_storage = EnterpriseVectorStorage(
-                storage_path=storage_path,
+                storage_path=build_path,
                 collection_name=collection_name,
                 distance_metric="cosine",
-                batch_size=batch_size
+                batch_size=batch_size,
+                external_content=external_content,
+                partition_by=partition_by,
+                num_shards=num_shards,
+                vector_quantization=vector_quantization
             )
             print(f"   ✅ Vector Storage ready (collection: {collection_name})")
             
+            # A collection stored with a projection must keep using it
+            self.pca_path = pca_projection_path(build_path, collection_name)
+            if os.path.exists(self.pca_path):
+                projector = PCAProjector.load(self.pca_path)
+                if pca_dims and pca_dims != projector.output_dim:
+                    raise IngestionPipelineError(
+                        f"Collection {collection_name} is projected to {projector.output_dim} dimensions, "
+                        f"not {pca_dims}"
+                    )
+                self.embedding_generator.set_projector(projector)
+            elif pca_dims and self.vector_storage._document_count() > 0:
+                raise IngestionPipelineError(
+                    f"Collection {collection_name} already holds full-size embeddings; "
+                    f"use a new collection for --pca-dims"
+                )
+            
+        except IngestionPipelineError:
+            self._discard_snapshot()
+            raise
         except Exception as e:
+            self._discard_snapshot()
             raise IngestionPipelineError(f"Failed to initialize pipeline components: {str(e)}")
         
         # Pipeline statistics
@@ -131,12 +279,28 @@ class EnterpriseIngestionPipeline:
         print(f"Processing Parameters:")
         print(f"  Chunk Size: {self.chunk_size}")
         print(f"  Chunk Overlap: {self.chunk_overlap}")
+        if self.parent_chunk_size:
+            print(f"  Parent Chunk Size: {self.parent_chunk_size}")
         print(f"  Batch Size: {self.batch_size}")
         print()
         
         self.stats["start_time"] = datetime.now()
         overall_start_time = time.time()
         
+        try:
+            if self.stream_documents:
+                result = self._run_streaming_pipeline(overall_start_time)
+            else:
+                result = self._run_batch_pipeline(overall_start_time)
+        except BaseException:
+            self._discard_snapshot()
+            raise
+        if not result["success"]:
+            self._discard_snapshot()
+        return result
+    
+    def _run_batch_pipeline(self, overall_start_time: float) -> Dict[str, Any]:
+        """Load, chunk, embed and store the data directory as separate stages."""
         try:
             # Stage 1: Document Loading
             print("STAGE 1: Document Loading")
@@ -172,58 +336,119 @@ class EnterpriseIngestionPipeline:
             print(f"✅ Stage 2 Complete ({stage_time:.2f}s)")
             print(f"   Chunks created: {len(chunks)}\n")
             
-            # Stage 3: Embedding Generation
-            print("STAGE 3: Embedding Generation")
-            print("-" * 30)
-            stage_start_time = time.time()
-            
-            embedded_docs = self._generate_embeddings(chunks)
+            if self.writer_threads:
+                # Stages 3+4: background writers store each slice while the next is embedded
+                print("STAGE 3+4: Embedding Generation with Background Vector Storage")
+                print("-" * 30)
+                stage_start_time = time.time()
+                
+                embeddings_generated, storage_result = self._embed_and_store(chunks)
+                
+                stage_time = time.time() - stage_start_time
+                self.stats["pipeline_stages"]["embedding_and_storage"] = {
+                    "duration": stage_time,
+                    "embeddings_generated": embeddings_generated,
+                    "documents_stored": storage_result["documents_added"],
+                    "write_time": storage_result["write_time"],
+                    "success": True
+                }
+                
+                print(f"✅ Stages 3+4 Complete ({stage_time:.2f}s)")
+                print(f"   Embeddings generated: {embeddings_generated}")
+                print(f"   Documents stored: {storage_result['documents_added']} "
+                      f"(write time overlapped: {storage_result['write_time']:.2f}s)\n")
+            else:
+                # Stage 3: Embedding Generation
+                print("STAGE 3: Embedding Generation")
+                print("-" * 30)
+                stage_start_time = time.time()
+                
+                embedded_docs = self._generate_embeddings(chunks)
+                embeddings_generated = len(embedded_docs)
+                
+                stage_time = time.time() - stage_start_time
+                self.stats["pipeline_stages"]["embedding_generation"] = {
+                    "duration": stage_time,
+                    "embeddings_generated": embeddings_generated,
+                    "success": True
+                }
+                
+                print(f"✅ Stage 3 Complete ({stage_time:.2f}s)")
+                print(f"   Embeddings generated: {embeddings_generated}\n")
+                
+                # Stage 4: Vector Storage
+                print("STAGE 4: Vector Storage")
+                print("-" * 30)
+                stage_start_time = time.time()
+                
+                storage_result = self._store_vectors(embedded_docs)
+                
+                stage_time = time.time() - stage_start_time
+                self.stats["pipeline_stages"]["vector_storage"] = {
+                    "duration": stage_time,
+                    "documents_stored": storage_result["documents_added"],
+                    "success": True
+                }
+                
+                print(f"✅ Stage 4 Complete ({stage_time:.2f}s)")
+                print(f"   Documents stored: {storage_result['documents_added']}\n")
             
-            stage_time = time.time() - stage_start_time
-            self.stats["pipeline_stages"]["embedding_generation"] = {
-                "duration": stage_time,
-                "embeddings_generated": len(embedded_docs),
-                "success": True
-            }
+            return self._complete_pipeline(
+                overall_start_time, len(documents), len(chunks), embeddings_generated, storage_result
+            )
             
-            print(f"✅ Stage 3 Complete ({stage_time:.2f}s)")
-            print(f"   Embeddings generated: {len(embedded_docs)}\n")
+        except Exception as e:
+            self.stats["errors_encountered"] += 1
+            self.stats["end_time"] = datetime.now()
             
-            # Stage 4: Vector Storage
-            print("STAGE 4: Vector Storage")
+            print(f"❌ Pipeline failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "statistics": self.stats
+            }
+    
+    def _run_streaming_pipeline(self, overall_start_time: float) -> Dict[str, Any]:
+        """
+        Load, chunk, embed and store in one pass over the data directory.
+        
+        Documents are pulled lazily from the loader, chunked one at a time and
+        embedded in slices while background writers store finished slices.
+        Whole-corpus chunk and embedding summaries are not computed here.
+        """
+        try:
+            print("STAGE 1-4: Streaming Load, Chunking, Embedding and Vector Storage")
             print("-" * 30)
             stage_start_time = time.time()
             
-            storage_result = self._store_vectors(embedded_docs)
+            if not os.path.exists(self.data_directory):
+                raise IngestionPipelineError(f"Data directory not found: {self.data_directory}")
+            print(f"Streaming documents from: {self.data_directory}")
+            
+            counts = {"documents": 0, "chunks": 0}
+            embeddings_generated, storage_result = self._embed_and_store(
+                self._stream_chunks(counts),
+                writer_threads=max(self.writer_threads, 1)
+            )
             
             stage_time = time.time() - stage_start_time
-            self.stats["pipeline_stages"]["vector_storage"] = {
+            self.stats["pipeline_stages"]["streaming_ingestion"] = {
                 "duration": stage_time,
+                "documents_loaded": counts["documents"],
+                "chunks_created": counts["chunks"],
+                "embeddings_generated": embeddings_generated,
                 "documents_stored": storage_result["documents_added"],
                 "success": True
             }
             
-            print(f"✅ Stage 4 Complete ({stage_time:.2f}s)")
+            print(f"✅ Streaming Stage Complete ({stage_time:.2f}s)")
+            print(f"   Documents loaded: {counts['documents']}")
+            print(f"   Chunks created: {counts['chunks']}")
             print(f"   Documents stored: {storage_result['documents_added']}\n")
             
-            # Calculate final statistics
-            total_time = time.time() - overall_start_time
-            self.stats["end_time"] = datetime.now()
-            self.stats["total_processing_time"] = total_time
-            self.stats["documents_loaded"] = len(documents)
-            self.stats["chunks_created"] = len(chunks)
-            self.stats["embeddings_generated"] = len(embedded_docs)
-            self.stats["documents_stored"] = storage_result["documents_added"]
-            
-            # Pipeline completion summary
-            print("=== Pipeline Execution Complete ===")
-            self._print_pipeline_summary()
-            
-            return {
-                "success": True,
-                "statistics": self.stats,
-                "collection_info": self.vector_storage.get_collection_info()
-            }
+            return self._complete_pipeline(
+                overall_start_time, counts["documents"], counts["chunks"], embeddings_generated, storage_result
+            )
             
         except Exception as e:
             self.stats["errors_encountered"] += 1
@@ -236,6 +461,99 @@ class EnterpriseIngestionPipeline:
                 "statistics": self.stats
             }
     
+    def _stream_chunks(self, counts: Dict[str, int]) -> Iterator:
+        """Yield the chunks of each document as soon as the loader produces it."""
+        for document in self.document_loader.lazy_load_directory(self.data_directory):
+            counts["documents"] += 1
+            if not document.page_content.strip():
+                continue
+            if self.text_store is not None:
+                chunks = self.text_chunker.chunk_documents_with_parents([document], self.text_store)
+            else:
+                chunks = self.text_chunker.chunk_documents([document])
+            counts["chunks"] += len(chunks)
+            yield from chunks
+        
+        if not counts["documents"]:
+            raise IngestionPipelineError(f"No documents found in {self.data_directory}")
+    
+    def _complete_pipeline(
+        self,
+        overall_start_time: float,
+        documents_loaded: int,
+        chunks_created: int,
+        embeddings_generated: int,
+        storage_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Publish the snapshot (if any), record final statistics and print the summary."""
+        # Stored sources enter the index only once their vectors are written
+        if self.document_loader.dedup_report is not None:
+            self._record_near_duplicate_savings(chunks_created)
+        
+        # Readers switch to the new snapshot only once it is complete
+        if self.snapshot_manager is not None:
+            self._publish_snapshot()
+        
+        # Calculate final statistics
+        total_time = time.time() - overall_start_time
+        self.stats["end_time"] = datetime.now()
+        self.stats["total_processing_time"] = total_time
+        self.stats["documents_loaded"] = documents_loaded
+        self.stats["chunks_created"] = chunks_created
+        self.stats["embeddings_generated"] = embeddings_generated
+        self.stats["documents_stored"] = storage_result["documents_added"]
+        
+        # Pipeline completion summary
+        print("=== Pipeline Execution Complete ===")
+        self._print_pipeline_summary()
+        
+        return {
+            "success": True,
+            "statistics": self.stats,
+            "collection_info": self.vector_storage.get_collection_info()
+        }
+    
+    def _record_near_duplicate_savings(self, chunks_created: int) -> None:
+        """Save the near-duplicate index and estimate the embedding work it avoided."""
+        self.document_loader.near_duplicates.save()
+        
+        # Dropped text would have chunked and embedded at this run's rate per
+        # character (for streaming runs the stage time includes parsing)
+        report = self.document_loader.dedup_report
+        ratio = report["characters_dropped"] / report["characters_kept"] if report["characters_kept"] else 0.0
+        embedding_seconds = sum(
+            self.stats["pipeline_stages"][stage]["duration"]
+            for stage in ("embedding_generation", "embedding_and_storage", "streaming_ingestion")
+            if stage in self.stats["pipeline_stages"]
+        )
+        self.stats["near_duplicates"] = {
+            "sources_dropped": report["duplicate_sources"],
+            "documents_dropped": report["documents_dropped"],
+            "characters_dropped": report["characters_dropped"],
+            "estimated_chunks_saved": round(chunks_created * ratio),
+            "estimated_embedding_seconds_saved": embedding_seconds * ratio
+        }
+        
+    def _publish_snapshot(self) -> None:
+        """Point CURRENT at the finished snapshot and prune old ones."""
+        self.snapshot_manager.publish(self.snapshot_version)
+        print(f"📸 Published snapshot {self.snapshot_version}")
+        
+        removed = self.snapshot_manager.prune(keep=self.keep_snapshots)
+        if removed:
+            print(f"   Pruned old snapshots: {', '.join(removed)}")
+        self.stats["snapshot_version"] = self.snapshot_version
+        print()
+    
+    def _discard_snapshot(self) -> None:
+        """Remove the unpublished snapshot of a failed build, if any."""
+        if self.snapshot_manager is None or self.snapshot_version is None:
+            return
+        if self.snapshot_manager.current_version() == self.snapshot_version:
+            return
+        self.snapshot_manager.discard(self.snapshot_version)
+        print(f"📸 Discarded unpublished snapshot {self.snapshot_version}")
+    
     def _load_documents(self) -> List:
         """Load all supported documents from the data directory."""
         print(f"Loading documents from: {self.data_directory}")
@@ -265,7 +583,10 @@ class EnterpriseIngestionPipeline:
         """Chunk documents into optimal sizes for embeddings."""
         print(f"Chunking {len(documents)} documents...")
         
-        chunks = self.text_chunker.chunk_documents(documents)
+        if self.text_store is not None:
+            chunks = self.text_chunker.chunk_documents_with_parents(documents, self.text_store)
+        else:
+            chunks = self.text_chunker.chunk_documents(documents)
         
         if not chunks:
             raise IngestionPipelineError("No chunks created from documents")
@@ -300,10 +621,11 @@ class EnterpriseIngestionPipeline:
         if not embedded_docs:
             raise IngestionPipelineError("No embeddings generated")
         
+        if self.pca_dims and self.embedding_generator.projector is None:
+            self._fit_projection(embedded_docs)
+        
         # Validate embeddings
-        embeddings_array = [doc["embedding_array"] for doc in embedded_docs]
-        import numpy as np
-        embeddings_np = np.array([emb for emb in embeddings_array])
+        embeddings_np = np.stack([doc["embedding_array"] for doc in embedded_docs])
         
         validation_result = self.embedding_generator.validate_embeddings(embeddings_np)
         if not validation_result["is_valid"]:
@@ -325,6 +647,73 @@ class EnterpriseIngestionPipeline:
         
         return embedded_docs
     
+    def _embed_and_store(
+        self,
+        chunks: Iterable,
+        writer_threads: Optional[int] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Embed chunks slice by slice while background threads store finished slices.
+        
+        chunks may be a list or a lazy iterator; only one slice is held at a time.
+        """
+        writer_threads = writer_threads or self.writer_threads
+        chunk_count = f"{len(chunks)} chunks" if isinstance(chunks, list) else "chunks"
+        print(f"Embedding {chunk_count} in slices of {self.embedding_slice_size} "
+              f"with {writer_threads} background writer(s)...")
+        
+        chunk_iterator = iter(chunks)
+        embeddings_generated = 0
+        with BackgroundVectorWriter(self.vector_storage, num_threads=writer_threads) as writer:
+            while True:
+                slice_size = self.embedding_slice_size
+                if self.pca_dims and self.embedding_generator.projector is None:
+                    # The projection is fitted on a larger first slice
+                    slice_size = max(slice_size, self.PCA_FIT_SAMPLES)
+                chunk_slice = list(islice(chunk_iterator, slice_size))
+                if not chunk_slice:
+                    break
+                
+                embedded_docs = self.embedding_generator.embed_documents(chunk_slice, show_progress=False)
+                if self.pca_dims and self.embedding_generator.projector is None:
+                    self._fit_projection(embedded_docs)
+                
+                validation_result = self.embedding_generator.validate_embeddings(
+                    np.stack([doc["embedding_array"] for doc in embedded_docs])
+                )
+                if not validation_result["is_valid"]:
+                    print(f"⚠️ Embedding validation issues: {validation_result['issues']}")
+                
+                writer.submit(embedded_docs)
+                embeddings_generated += len(embedded_docs)
+        
+        if embeddings_generated == 0:
+            raise IngestionPipelineError("No embeddings generated")
+        
+        return embeddings_generated, writer.result
+    
+    def _fit_projection(self, embedded_docs: List[Dict[str, Any]]) -> None:
+        """
+        Fit the PCA projection on freshly embedded chunks, save it beside the
+        collection, and project those chunks in place.
+        """
+        embeddings = np.stack([doc["embedding_array"] for doc in embedded_docs])
+        print(f"Fitting PCA projection to {self.pca_dims} dimensions on {len(embeddings)} embeddings...")
+        
+        projector = PCAProjector.fit(embeddings, self.pca_dims)
+        projector.save(self.pca_path)
+        self.embedding_generator.set_projector(projector)
+        
+        for doc, embedding in zip(embedded_docs, projector.transform(embeddings)):
+            doc["embedding"] = embedding
+            doc["embedding_array"] = embedding
+            doc["metadata"]["embedding_dimensions"] = len(embedding)
+        
+        info = projector.get_projection_info()
+        self.stats["pca_projection"] = info
+        print(f"   ✅ PCA projection saved: {self.pca_path} "
+              f"(explained variance {info['explained_variance']:.1%})")
+    
     def _store_vectors(self, embedded_docs: List) -> Dict[str, Any]:
         """Store embeddings in the vector database."""
         print(f"Storing {len(embedded_docs)} embedded documents in vector database...")
@@ -351,6 +740,14 @@ class EnterpriseIngestionPipeline:
         print(f"💾 Documents Stored: {self.stats['documents_stored']}")
         print(f"❌ Errors Encountered: {self.stats['errors_encountered']}")
         
+        if "near_duplicates" in self.stats:
+            saved = self.stats["near_duplicates"]
+            print(f"\n🧬 NEAR-DUPLICATES SKIPPED:")
+            print(f"  Sources Dropped: {saved['sources_dropped']} ({saved['documents_dropped']} documents, "
+                  f"{saved['characters_dropped']} characters)")
+            print(f"  Embedding Compute Saved: ~{saved['estimated_chunks_saved']} chunks, "
+                  f"~{saved['estimated_embedding_seconds_saved']:.2f}s")
+        
         print(f"\n⏱️ STAGE TIMING BREAKDOWN:")
         for stage, info in self.stats["pipeline_stages"].items():
             print(f"  {stage.replace('_', ' ').title()}: {info['duration']:.2f}s")
@@ -383,6 +780,15 @@ Examples:
   python ingest.py                           # Use default settings
   python ingest.py --data-dir ./documents    # Custom data directory  
   python ingest.py --collection-name legal_docs --chunk-size 500
+  python ingest.py --chunk-size 300 --parent-chunk-size 2000
+  python ingest.py --data-dir msft_data --partition-by fiscal_year
+  python ingest.py --storage-path ./chroma_sharded --num-shards 4
+  python ingest.py --publish-snapshot        # Re-ingest while queries keep running
+  python ingest.py --writer-threads 1        # Overlap embedding with vector writes
+  python ingest.py --stream-documents        # Chunk and embed while files are still parsing
+  python ingest.py --isolate-parsing --parse-timeout 120  # Kill and quarantine stuck parses
+  python ingest.py --parse-cache --chunk-size 500  # Re-chunk without re-parsing unchanged files
+  python ingest.py --deduplicate             # Embed one version of filings stored in several formats
         """
     )
     
@@ -425,6 +831,119 @@ Examples:
         help="Batch size for processing (default: 32)"
     )
     
+    parser.add_argument(
+        "--parent-chunk-size",
+        type=int,
+        default=0,
+        help="Parent window size for small-to-big retrieval; 0 disables (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--parent-chunk-overlap",
+        type=int,
+        default=0,
+        help="Character overlap between parent windows (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--external-content",
+        action="store_true",
+        help="Keep chunk text in a compressed content store instead of ChromaDB"
+    )
+    
+    parser.add_argument(
+        "--partition-by",
+        choices=["fiscal_year", "filing_year", "form_type"],
+        default=None,
+        help="Split the collection into one partition per metadata value (default: off)"
+    )
+    
+    parser.add_argument(
+        "--num-shards",
+        type=int,
+        default=0,
+        help="Spread chunks over N shard processes by chunk ID hash; 0 disables (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--publish-snapshot",
+        action="store_true",
+        help="Build into a new versioned snapshot and publish it atomically when done"
+    )
+    
+    parser.add_argument(
+        "--keep-snapshots",
+        type=int,
+        default=3,
+        help="Snapshots to keep after publishing (default: 3)"
+    )
+    
+    parser.add_argument(
+        "--writer-threads",
+        type=int,
+        default=0,
+        help="Background vector writer threads overlapping with embedding; 0 disables (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--vector-quantization",
+        choices=["float16", "int8"],
+        default=None,
+        help="Keep a compact vector copy for exhaustive searches, re-scored exactly in float32 (default: off)"
+    )
+    
+    parser.add_argument(
+        "--pca-dims",
+        type=int,
+        default=0,
+        help="Reduce embeddings to N dimensions with a PCA projection fitted on the corpus; 0 disables (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--stream-documents",
+        action="store_true",
+        help="Load, chunk, embed and store in one streaming pass with bounded memory"
+    )
+    
+    parser.add_argument(
+        "--isolate-parsing",
+        action="store_true",
+        help="Parse files in a worker process with timeout/memory limits and a quarantine list"
+    )
+    
+    parser.add_argument(
+        "--parse-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds allowed per file with --isolate-parsing (default: 300)"
+    )
+    
+    parser.add_argument(
+        "--max-parse-memory-mb",
+        type=float,
+        default=4096,
+        help="Parse worker memory ceiling in MB with --isolate-parsing (default: 4096)"
+    )
+    
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="Reuse parsed documents of unchanged files from <storage-path>/parse_cache"
+    )
+    
+    parser.add_argument(
+        "--deduplicate",
+        action="store_true",
+        help="Skip sources whose content is already in another loaded or stored source"
+    )
+    
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=0.9,
+        help="Share of a source's content that must occur elsewhere to drop it (default: 0.9)"
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -435,7 +954,24 @@ Examples:
             storage_path=args.storage_path,
             chunk_size=args.chunk_size,
             chunk_overlap=args.chunk_overlap,
-            batch_size=args.batch_size
+            batch_size=args.batch_size,
+            parent_chunk_size=args.parent_chunk_size or None,
+            parent_chunk_overlap=args.parent_chunk_overlap,
+            external_content=args.external_content,
+            partition_by=args.partition_by,
+            num_shards=args.num_shards,
+            publish_snapshot=args.publish_snapshot,
+            keep_snapshots=args.keep_snapshots,
+            writer_threads=args.writer_threads,
+            vector_quantization=args.vector_quantization,
+            pca_dims=args.pca_dims or None,
+            stream_documents=args.stream_documents,
+            isolate_parsing=args.isolate_parsing,
+            parse_timeout=args.parse_timeout,
+            max_parse_memory_mb=args.max_parse_memory_mb,
+            parse_cache=args.parse_cache,
+            deduplicate=args.deduplicate,
+            dedup_threshold=args.dedup_threshold
         )
         
         # Execute full pipeline
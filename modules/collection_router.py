@@ -0,0 +1,379 @@
+"""
+Enterprise-Grade Partitioned Collection Router Module
+
+Splits one logical ChromaDB collection into per-partition collections (for
+example one per fiscal year) behind a Collection-like facade. Writes only
+touch the partitions their documents belong to; searches fan out in parallel
+to the partitions a metadata filter can match and merge the top-k results.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import re
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Set
+
+from chromadb.api.models.Collection import Collection
+
+
+class CollectionRouterError(Exception):
+    """Custom exception for partitioned collection errors"""
+    pass
+
+
+class PartitionedCollection:
+    """
+    Collection-like router over per-partition ChromaDB collections.
+
+    Naming:
+    - <base>__<key>_<value>: documents whose metadata[key] == value
+    - <base>__<key>_none: documents without the partition key
+
+    Supports the subset of the ChromaDB Collection API used by
+    EnterpriseVectorStorage: add, query, get, delete, count, name, metadata.
+    Query results keep ChromaDB's nested-list format for a single query.
+    """
+
+    UNPARTITIONED = "none"
+    QUERY_FIELDS = ("ids", "documents", "metadatas", "distances", "embeddings")
+
+    def __init__(
+        self,
+        client,
+        base_name: str,
+        partition_key: str,
+        metadata_factory: Callable[[], Dict[str, Any]],
+        max_parallel_queries: int = 8
+    ):
+        """
+        Initialize the router and discover existing partitions.
+
+        Args:
+            client: ChromaDB client owning the partition collections
+            base_name: Logical collection name
+            partition_key: Metadata key to partition on (e.g. "fiscal_year")
+            metadata_factory: Returns collection metadata for new partitions
+            max_parallel_queries: Maximum partitions searched concurrently
+        """
+        self.client = client
+        self.name = base_name
+        self.partition_key = partition_key
+        self.metadata_factory = metadata_factory
+        self.max_parallel_queries = max_parallel_queries
+
+        self._prefix = f"{base_name}__{partition_key}_"
+        self._partitions: Dict[str, Collection] = {}
+        self._refresh_partitions()
+
+    @staticmethod
+    def _collection_names(client) -> List[str]:
+        """List collection names across ChromaDB client versions."""
+        return [c if isinstance(c, str) else c.name for c in client.list_collections()]
+
+    @classmethod
+    def discover_partition_key(cls, client, base_name: str) -> Optional[str]:
+        """
+        Detect whether a logical collection was stored partitioned.
+
+        Returns:
+            The partition key if partitions exist for base_name, else None
+        """
+        pattern = re.compile(rf"^{re.escape(base_name)}__(.+)_[^_]+$")
+        for name in cls._collection_names(client):
+            match = pattern.match(name)
+            if match:
+                return match.group(1)
+        return None
+
+    def _refresh_partitions(self) -> None:
+        """Load handles for all existing partition collections."""
+        for name in self._collection_names(self.client):
+            if name.startswith(self._prefix):
+                value = name[len(self._prefix):]
+                if value not in self._partitions:
+                    self._partitions[value] = self.client.get_collection(name=name)
+
+    @staticmethod
+    def _sanitize(value: Any) -> str:
+        """Map a metadata value to its partition name part."""
+        # Collection names only allow [a-zA-Z0-9._-]
+        return re.sub(r"[^A-Za-z0-9.-]", "-", str(value))
+
+    def _partition_value(self, metadata: Optional[Dict[str, Any]]) -> str:
+        """Get the partition a document belongs to."""
+        value = (metadata or {}).get(self.partition_key)
+        if value is None or value == "":
+            return self.UNPARTITIONED
+        return self._sanitize(value)
+
+    def _get_or_create_partition(self, value: str) -> Collection:
+        """Get a partition collection, creating it on first write."""
+        if value not in self._partitions:
+            self._partitions[value] = self.client.get_or_create_collection(
+                name=f"{self._prefix}{value}",
+                metadata={
+                    **self.metadata_factory(),
+                    "partition_key": self.partition_key,
+                    "partition_value": value
+                }
+            )
+        return self._partitions[value]
+
+    # ------------------------------------------------------------------ #
+    # Routing
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _as_number(value: Any) -> Optional[float]:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _matches(self, value: str, condition: Any) -> bool:
+        """
+        Check whether a partition value can satisfy a where condition on the key.
+
+        Operands are sanitized like partition values, so "10-K/A" routes to
+        the 10-K-A partition. Sanitizing is lossy (several raw values can
+        share a partition), so $ne and $nin never rule a partition out; the
+        filter itself still runs inside every partition searched.
+        """
+        if value == self.UNPARTITIONED:
+            return False  # Documents without the key never satisfy a condition on it
+
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+
+        number = self._as_number(value)
+        for op, operand in condition.items():
+            if op == "$eq" and self._sanitize(operand) != value:
+                return False
+            if op == "$in" and value not in {self._sanitize(v) for v in operand}:
+                return False
+            if op in ("$gt", "$gte", "$lt", "$lte"):
+                bound = self._as_number(operand)
+                if number is None or bound is None:
+                    continue
+                if op == "$gt" and not number > bound:
+                    return False
+                if op == "$gte" and not number >= bound:
+                    return False
+                if op == "$lt" and not number < bound:
+                    return False
+                if op == "$lte" and not number <= bound:
+                    return False
+        return True
+
+    def _route(self, where: Optional[Dict[str, Any]], values: Set[str]) -> Set[str]:
+        """Narrow the candidate partitions using a ChromaDB where clause."""
+        if not where:
+            return values
+
+        if "$and" in where:
+            for clause in where["$and"]:
+                values = self._route(clause, values)
+            return values
+
+        if "$or" in where:
+            routed: Set[str] = set()
+            for clause in where["$or"]:
+                routed |= self._route(clause, values)
+            return routed
+
+        if self.partition_key in where:
+            return {v for v in values if self._matches(v, where[self.partition_key])}
+
+        return values
+
+    def route(self, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Get the partitions a query with the given filter must search.
+
+        Args:
+            where: Optional ChromaDB metadata filter
+
+        Returns:
+            Sorted list of partition values
+        """
+        self._refresh_partitions()
+        return sorted(self._route(where, set(self._partitions.keys())))
+
+    # ------------------------------------------------------------------ #
+    # Collection API
+    # ------------------------------------------------------------------ #
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Collection metadata (taken from an existing partition when present)."""
+        for collection in self._partitions.values():
+            return {**(collection.metadata or {}), "partitioned_by": self.partition_key}
+        return {**self.metadata_factory(), "partitioned_by": self.partition_key}
+
+    def partitions(self) -> Dict[str, Collection]:
+        """Get the partition collections keyed by partition value."""
+        self._refresh_partitions()
+        return dict(self._partitions)
+
+    def add(self, ids: List[str], embeddings=None, metadatas=None, documents=None, **kwargs) -> None:
+        """Add records, writing each only to its own partition."""
+        groups: Dict[str, List[int]] = {}
+        for i in range(len(ids)):
+            metadata = metadatas[i] if metadatas is not None else None
+            groups.setdefault(self._partition_value(metadata), []).append(i)
+
+        for value, indices in groups.items():
+            params = {"ids": [ids[i] for i in indices]}
+            if embeddings is not None:
+                params["embeddings"] = [embeddings[i] for i in indices]
+            if metadatas is not None:
+                params["metadatas"] = [metadatas[i] for i in indices]
+            if documents is not None:
+                params["documents"] = [documents[i] for i in indices]
+            self._get_or_create_partition(value).add(**params, **kwargs)
+
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Search routed partitions in parallel and merge the global top-k.
+
+        Only a single query embedding is supported.
+        """
+        if len(query_embeddings) != 1:
+            raise CollectionRouterError("Partitioned search supports one query embedding at a time")
+
+        include = list(include or ["metadatas", "documents", "distances"])
+        internal_include = include if "distances" in include else include + ["distances"]
+        targets = [self._partitions[v] for v in self.route(where)]
+
+        def search(collection: Collection) -> Dict[str, Any]:
+            params = {
+                "query_embeddings": query_embeddings,
+                "n_results": n_results,
+                "include": internal_include
+            }
+            if where:
+                params["where"] = where
+            return collection.query(**params, **kwargs)
+
+        partial_results = []
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(len(targets), self.max_parallel_queries)) as pool:
+                partial_results = list(pool.map(search, targets))
+
+        return self.merge_query_results(partial_results, n_results, include)
+
+    @classmethod
+    def merge_query_results(
+        cls,
+        partial_results: List[Dict[str, Any]],
+        n_results: int,
+        include: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Merge single-query results from several collections by distance.
+
+        Args:
+            partial_results: ChromaDB query results, each including distances
+            n_results: Number of results to keep
+            include: Fields requested by the caller
+
+        Returns:
+            Merged result in ChromaDB's single-query nested-list format
+        """
+        candidates = []
+        for p, result in enumerate(partial_results):
+            if not result or not result.get("ids") or not result["ids"][0]:
+                continue
+            for i, distance in enumerate(result["distances"][0]):
+                candidates.append((distance, p, i))
+
+        best = heapq.nsmallest(n_results, candidates)
+
+        merged: Dict[str, Any] = {"ids": [[partial_results[p]["ids"][0][i] for _, p, i in best]]}
+        for field in cls.QUERY_FIELDS[1:]:
+            if field in include:
+                merged[field] = [[partial_results[p][field][0][i] for _, p, i in best]]
+            else:
+                merged[field] = None
+        return merged
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Get records from the routed partitions, in partition order.
+
+        Paging is pushed down: partitions wholly before offset are skipped
+        by their size (an ID-only get when ids or where narrow them), and
+        each remaining partition is asked only for the rows still missing
+        from the page, so paged scans stay linear.
+        """
+        include = list(include or ["metadatas", "documents"])
+        merged: Dict[str, Any] = {"ids": []}
+        for field in ("documents", "metadatas", "embeddings"):
+            merged[field] = [] if field in include else None
+
+        filters: Dict[str, Any] = {}
+        if ids is not None:
+            filters["ids"] = ids
+        if where:
+            filters["where"] = where
+
+        skip = offset or 0
+        remaining = limit
+        for value in self.route(where):
+            if remaining is not None and remaining <= 0:
+                break
+            collection = self._partitions[value]
+
+            if skip:
+                size = len(collection.get(**filters, include=[])["ids"]) if filters else collection.count()
+                if size <= skip:
+                    skip -= size
+                    continue
+
+            params = {"include": include, **filters}
+            if skip:
+                params["offset"] = skip
+            if remaining is not None:
+                params["limit"] = remaining
+            result = collection.get(**params, **kwargs)
+            skip = 0
+
+            merged["ids"].extend(result["ids"])
+            for field in ("documents", "metadatas", "embeddings"):
+                if merged[field] is not None and result.get(field) is not None:
+                    merged[field].extend(list(result[field]))
+            if remaining is not None:
+                remaining -= len(result["ids"])
+
+        return merged
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None, **kwargs) -> None:
+        """Delete records from every routed partition."""
+        for value in self.route(where):
+            params = {}
+            if ids is not None:
+                params["ids"] = ids
+            if where:
+                params["where"] = where
+            self._partitions[value].delete(**params, **kwargs)
+
+    def count(self) -> int:
+        """Total record count across partitions."""
+        self._refresh_partitions()
+        return sum(collection.count() for collection in self._partitions.values())
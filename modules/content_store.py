@@ -0,0 +1,412 @@
+"""
+Enterprise-Grade Compressed Content Store Module
+
+Append-only, block-compressed text store keyed by chunk ID. Lets the vector
+database hold only vectors and slim metadata while chunk text lives in a
+compact file that is hydrated with one batched read per query.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+import json
+import zlib
+import shutil
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: fall back to zlib
+    zstandard = None
+
+
+# Directory name used for the content store inside a vector storage path
+DEFAULT_CONTENT_DIRNAME = "content_store"
+
+
+class ContentStoreError(Exception):
+    """Custom exception for content store errors"""
+    pass
+
+
+class CompressedContentStore:
+    """
+    Append-only compressed content store for chunk text.
+
+    Storage layout:
+    - content.dat: Concatenated compressed blocks (never rewritten in place)
+    - content.idx: JSON-lines index, one record per block or tombstone
+    - generation: number of the live data/index pair once compact() has run;
+      generation N lives in content.N.dat / content.N.idx
+
+    Each block packs many chunk texts (up to block_size uncompressed bytes)
+    and is compressed as a unit with zstd (zlib when zstandard is missing).
+    The index maps chunk ID -> (block, start, end) inside the decompressed
+    block, so reading N chunks costs one decompression per distinct block.
+    """
+
+    DATA_FILENAME = "content.dat"
+    INDEX_FILENAME = "content.idx"
+    GENERATION_FILENAME = "generation"
+
+    def __init__(
+        self,
+        store_path: str = os.path.join("./chroma_db", DEFAULT_CONTENT_DIRNAME),
+        block_size: int = 64 * 1024,
+        compression_level: int = 3
+    ):
+        """
+        Initialize the content store and load its block index.
+
+        Args:
+            store_path: Directory holding the data and index files
+            block_size: Target uncompressed bytes per block (default: 64 KB)
+            compression_level: Compression level for new blocks (default: 3)
+        """
+        self.store_path = store_path
+        self.block_size = block_size
+        self.compression_level = compression_level
+        self.codec = "zstd" if zstandard is not None else "zlib"
+
+        os.makedirs(store_path, exist_ok=True)
+
+        self.generation = self._read_generation()
+        self.data_path = self._generation_path(self.DATA_FILENAME, self.generation)
+        self.index_path = self._generation_path(self.INDEX_FILENAME, self.generation)
+
+        # chunk ID -> (block number, start, end) in the decompressed block
+        self._locations: Dict[str, Tuple[int, int, int]] = {}
+        # block number -> (file offset, compressed length, codec)
+        self._blocks: Dict[int, Tuple[int, int, str]] = {}
+        self._next_block = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "blocks_written": 0,
+            "chunks_written": 0,
+            "uncompressed_bytes": 0,
+            "compressed_bytes": 0,
+            "blocks_read": 0
+        }
+
+        self._load_index()
+
+    def _generation_path(self, filename: str, generation: int) -> str:
+        if generation == 0:
+            return os.path.join(self.store_path, filename)
+        stem, extension = os.path.splitext(filename)
+        return os.path.join(self.store_path, f"{stem}.{generation}{extension}")
+
+    def _read_generation(self) -> int:
+        """Read the live generation number (0 before the first compaction)."""
+        path = os.path.join(self.store_path, self.GENERATION_FILENAME)
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return int(f.read().strip())
+        except (OSError, ValueError) as e:
+            raise ContentStoreError(f"Failed to read content store generation: {str(e)}")
+
+    def _write_generation(self, generation: int) -> None:
+        """Switch the live generation with one atomic rename."""
+        path = os.path.join(self.store_path, self.GENERATION_FILENAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(generation))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _load_index(self) -> None:
+        """Rebuild the in-memory index by replaying the index log."""
+        if not os.path.exists(self.index_path):
+            return
+
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn final line from an interrupted write
+
+                    if "delete" in record:
+                        for chunk_id in record["delete"]:
+                            self._locations.pop(chunk_id, None)
+                        continue
+
+                    block = record["block"]
+                    if record["offset"] + record["length"] > data_size:
+                        continue  # Index points past the data file; skip the block
+
+                    self._blocks[block] = (record["offset"], record["length"], record["codec"])
+                    self._next_block = max(self._next_block, block + 1)
+                    position = 0
+                    for chunk_id, length in zip(record["ids"], record["lengths"]):
+                        self._locations[chunk_id] = (block, position, position + length)
+                        position += length
+
+        except OSError as e:
+            raise ContentStoreError(f"Failed to load content index: {str(e)}")
+
+    def _compress(self, payload: bytes) -> bytes:
+        """Compress a block payload with the store's codec."""
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.compression_level).compress(payload)
+        return zlib.compress(payload, min(self.compression_level, 9))
+
+    @staticmethod
+    def _decompress(payload: bytes, codec: str) -> bytes:
+        """Decompress a block payload written with the given codec."""
+        if codec == "zstd":
+            if zstandard is None:
+                raise ContentStoreError("Block was written with zstd but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return zlib.decompress(payload)
+
+    def put_many(self, chunk_ids: List[str], texts: List[str]) -> int:
+        """
+        Append chunk texts to the store.
+
+        Re-putting an existing chunk ID appends a new copy; the index always
+        resolves to the latest one.
+
+        Args:
+            chunk_ids: Chunk IDs (same IDs as in the vector collection)
+            texts: Chunk texts aligned with chunk_ids
+
+        Returns:
+            Number of blocks written
+
+        Raises:
+            ContentStoreError: If inputs are inconsistent or the write fails
+        """
+        if len(chunk_ids) != len(texts):
+            raise ContentStoreError("chunk_ids and texts must have the same length")
+
+        if not chunk_ids:
+            return 0
+
+        # Pack encoded texts into blocks of roughly block_size bytes
+        blocks: List[Tuple[List[str], List[bytes]]] = []
+        current_ids: List[str] = []
+        current_payloads: List[bytes] = []
+        current_size = 0
+
+        for chunk_id, text in zip(chunk_ids, texts):
+            encoded = (text or "").encode("utf-8")
+            if current_ids and current_size + len(encoded) > self.block_size:
+                blocks.append((current_ids, current_payloads))
+                current_ids, current_payloads, current_size = [], [], 0
+            current_ids.append(chunk_id)
+            current_payloads.append(encoded)
+            current_size += len(encoded)
+
+        if current_ids:
+            blocks.append((current_ids, current_payloads))
+
+        with self._lock:
+            try:
+                with open(self.data_path, "ab") as data_file, \
+                        open(self.index_path, "a", encoding="utf-8") as index_file:
+                    offset = data_file.tell()
+                    records = []
+
+                    for ids, payloads in blocks:
+                        raw = b"".join(payloads)
+                        compressed = self._compress(raw)
+                        data_file.write(compressed)
+
+                        block = self._next_block
+                        self._next_block += 1
+
+                        record = {
+                            "block": block,
+                            "offset": offset,
+                            "length": len(compressed),
+                            "codec": self.codec,
+                            "ids": ids,
+                            "lengths": [len(p) for p in payloads]
+                        }
+                        records.append(record)
+                        self._blocks[block] = (offset, len(compressed), self.codec)
+                        offset += len(compressed)
+
+                        self.stats["blocks_written"] += 1
+                        self.stats["chunks_written"] += len(ids)
+                        self.stats["uncompressed_bytes"] += len(raw)
+                        self.stats["compressed_bytes"] += len(compressed)
+
+                    # Data must be durable before the index references it
+                    data_file.flush()
+                    os.fsync(data_file.fileno())
+
+                    for record in records:
+                        index_file.write(json.dumps(record) + "\n")
+                    index_file.flush()
+
+            except OSError as e:
+                raise ContentStoreError(f"Failed to write content blocks: {str(e)}")
+
+            for record in records:
+                position = 0
+                for chunk_id, length in zip(record["ids"], record["lengths"]):
+                    self._locations[chunk_id] = (record["block"], position, position + length)
+                    position += length
+
+        return len(blocks)
+
+    def get_many(self, chunk_ids: List[str]) -> List[Optional[str]]:
+        """
+        Read chunk texts with one decompression per distinct block.
+
+        Args:
+            chunk_ids: Chunk IDs to hydrate
+
+        Returns:
+            Texts aligned with chunk_ids (None for unknown IDs)
+
+        Raises:
+            ContentStoreError: If the data file cannot be read
+        """
+        results: List[Optional[str]] = [None] * len(chunk_ids)
+
+        by_block: Dict[int, List[int]] = {}
+        for i, chunk_id in enumerate(chunk_ids):
+            location = self._locations.get(chunk_id)
+            if location is not None:
+                by_block.setdefault(location[0], []).append(i)
+
+        if not by_block:
+            return results
+
+        try:
+            with open(self.data_path, "rb") as data_file:
+                # Visit blocks in file order to keep reads sequential
+                for block in sorted(by_block, key=lambda b: self._blocks[b][0]):
+                    offset, length, codec = self._blocks[block]
+                    data_file.seek(offset)
+                    raw = self._decompress(data_file.read(length), codec)
+                    self.stats["blocks_read"] += 1
+
+                    for i in by_block[block]:
+                        _, start, end = self._locations[chunk_ids[i]]
+                        results[i] = raw[start:end].decode("utf-8")
+
+        except OSError as e:
+            raise ContentStoreError(f"Failed to read content blocks: {str(e)}")
+
+        return results
+
+    def delete_many(self, chunk_ids: List[str]) -> int:
+        """
+        Tombstone chunk IDs; their bytes are reclaimed by compact().
+
+        Args:
+            chunk_ids: Chunk IDs to delete
+
+        Returns:
+            Number of IDs that were present
+        """
+        present = [chunk_id for chunk_id in chunk_ids if chunk_id in self._locations]
+        if not present:
+            return 0
+
+        with self._lock:
+            try:
+                with open(self.index_path, "a", encoding="utf-8") as index_file:
+                    index_file.write(json.dumps({"delete": present}) + "\n")
+            except OSError as e:
+                raise ContentStoreError(f"Failed to record deletions: {str(e)}")
+
+            for chunk_id in present:
+                self._locations.pop(chunk_id, None)
+
+        return len(present)
+
+    def compact(self) -> Dict[str, Any]:
+        """
+        Rewrite the store keeping only live chunks.
+
+        Returns:
+            Dictionary with bytes before and after compaction
+        """
+        size_before = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        live_ids = list(self._locations.keys())
+        live_texts = self.get_many(live_ids)
+
+        # Build the compacted store beside the live one and move its files in
+        # as the next generation; the generation pointer then switches data
+        # and index together, so a crash leaves one complete pair live
+        compact_path = f"{self.store_path}.compact"
+        shutil.rmtree(compact_path, ignore_errors=True)
+        compacted = CompressedContentStore(compact_path, self.block_size, self.compression_level)
+        compacted.put_many(live_ids, [text or "" for text in live_texts])
+
+        generation = self.generation + 1
+        data_path = self._generation_path(self.DATA_FILENAME, generation)
+        index_path = self._generation_path(self.INDEX_FILENAME, generation)
+
+        try:
+            for source, target in ((compacted.data_path, data_path), (compacted.index_path, index_path)):
+                # An empty store writes no files; its generation is an empty pair
+                with open(source, "ab") as f:
+                    os.fsync(f.fileno())
+                os.replace(source, target)
+
+            with self._lock:
+                self._write_generation(generation)
+                previous_paths = (self.data_path, self.index_path)
+                self.generation = generation
+                self.data_path = data_path
+                self.index_path = index_path
+                self._locations = compacted._locations
+                self._blocks = compacted._blocks
+                self._next_block = compacted._next_block
+
+        except OSError as e:
+            raise ContentStoreError(f"Failed to compact content store: {str(e)}")
+        finally:
+            shutil.rmtree(compact_path, ignore_errors=True)
+
+        for path in previous_paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+        size_after = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        return {
+            "live_chunks": len(live_ids),
+            "size_before_mb": size_before / (1024 * 1024),
+            "size_after_mb": size_after / (1024 * 1024)
+        }
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._locations
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def get_store_info(self) -> Dict[str, Any]:
+        """Get information about the content store."""
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        ratio = (
+            self.stats["uncompressed_bytes"] / self.stats["compressed_bytes"]
+            if self.stats["compressed_bytes"] else 0.0
+        )
+        return {
+            "store_path": self.store_path,
+            "generation": self.generation,
+            "codec": self.codec,
+            "chunk_count": len(self._locations),
+            "block_count": len(self._blocks),
+            "data_size_mb": data_size / (1024 * 1024),
+            "compression_ratio": round(ratio, 2),
+            **self.stats
+        }
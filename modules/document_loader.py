@@ -8,17 +8,21 @@ Author: Enterprise RAG Pipeline
 """
 
 import os
+import time
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
 from langchain_core.documents import Document
-from langchain_community.document_loaders import (
-    UnstructuredPDFLoader,
-    UnstructuredWordDocumentLoader,
-    UnstructuredPowerPointLoader,
-    TextLoader,
-    CSVLoader, 
-    UnstructuredEmailLoader
-)
+
+from modules.metadata_extractor import FilingMetadataExtractor
+from modules.edgar_loader import EdgarFilingLoader
+from modules.table_loader import TableCSVLoader, TableXLSXLoader
+from modules.archive_loader import ZipArchiveLoader
+from modules.pdf_loader import TieredPDFLoader
+from modules.office_loader import DocxXMLLoader, PptxXMLLoader
+from modules.email_loader import EmailMessageLoader
+from modules.parse_worker import IsolatedParser, ParseQuarantine, ParseLimitError
+from modules.parse_cache import ParsedDocumentCache, loader_fingerprint
+from modules.near_duplicate import NearDuplicateDetector
 
 
 class DocumentLoaderError(Exception):
@@ -31,27 +35,103 @@ class EnterpriseDocumentLoader:
     Production-grade document loader supporting all common SMB file formats.
     
     Supported formats:
-    - PDF (.pdf): Reports, contracts, technical documents
-    - Word (.docx): Policies, proposals, meeting minutes
-    - PowerPoint (.pptx): Training materials, presentations  
-    - Text (.txt): Memos, notes, plain documentation
-    - CSV (.csv): Customer data, inventory, financial records
-    - Email (.eml): Communications, decisions, project updates
+    - PDF (.pdf): Reports, contracts, technical documents; one document per
+      page, read from the text layer with Unstructured/OCR only for pages
+      that have none
+    - Word (.docx): Policies, proposals, meeting minutes; read straight
+      from the document XML and split into one document per heading or
+      transcript speaker turn
+    - PowerPoint (.pptx): Training materials, presentations; one document
+      per slide with its tables and speaker notes
+    - Text (.txt): Memos, notes, plain documentation; EDGAR full-submission
+      filings are split into one document per filing section (binary
+      exhibits skipped, HTML stripped)
+    - CSV (.csv): Customer data, inventory, financial records; rows are
+      grouped into token-bounded blocks that each repeat the table header
+    - Excel (.xlsx): KPI and metrics workbooks; each sheet is read in one
+      streaming pass and emitted as header-prefixed blocks like CSV
+    - Email (.eml, .mbox): Communications, decisions, project updates;
+      single messages or whole mailbox exports, one document per message
+      body plus the documents of each supported attachment (parsed in
+      parallel, tagged with the parent message's headers)
+    - ZIP (.zip): Earnings packages and filing bundles; members are read
+      straight from the archive and dispatched by their own extension
+      (HTML members are reduced to text), no extraction to disk
+    
+    Every document is tagged with filterable filing metadata derived from its
+    path (fiscal_year, fiscal_quarter, form_type, filing_date, filing_year).
+    
+    With isolate_parsing, loaders run in a worker process with a per-file
+    timeout and memory ceiling; files that breach them are skipped and, if
+    a quarantine list is configured, skipped instantly on later runs.
+    
+    With a parse cache, loader output is stored per file content hash and
+    loader version, and unchanged files are not parsed again.
+    
+    With deduplicate, sources carrying the same content as another source
+    (the same filing as DOCX, PDF or EDGAR bundle, backup copies) are
+    dropped from load_directory output in favour of one canonical version.
     """
     
     # File type mapping to appropriate loaders
     LOADER_MAPPING = {
-        '.pdf': UnstructuredPDFLoader,
-        '.docx': UnstructuredWordDocumentLoader,
-        '.pptx': UnstructuredPowerPointLoader,
-        '.txt': TextLoader,
-        '.csv': CSVLoader,
-        '.eml': UnstructuredEmailLoader
+        '.pdf': TieredPDFLoader,
+        '.docx': DocxXMLLoader,
+        '.pptx': PptxXMLLoader,
+        '.txt': EdgarFilingLoader,
+        '.csv': TableCSVLoader,
+        '.xlsx': TableXLSXLoader,
+        '.eml': EmailMessageLoader,
+        '.mbox': EmailMessageLoader,
+        '.zip': ZipArchiveLoader
     }
     
-    def __init__(self):
-        """Initialize the document loader with supported file types."""
+    def __init__(
+        self,
+        isolate_parsing: bool = False,
+        parse_timeout: float = 300.0,
+        max_parse_memory_mb: Optional[float] = 4096,
+        quarantine_path: Optional[str] = None,
+        parse_cache_path: Optional[str] = None,
+        deduplicate: bool = False,
+        dedup_threshold: float = 0.9,
+        dedup_index_path: Optional[str] = None
+    ):
+        """
+        Initialize the document loader with supported file types.
+        
+        Args:
+            isolate_parsing: Parse files in a worker process that is killed on
+                timeout or memory breach (default: False)
+            parse_timeout: Seconds allowed per file when isolated (default: 300)
+            max_parse_memory_mb: Worker resident memory ceiling in MB when
+                isolated; None disables (default: 4096)
+            quarantine_path: JSON list of files that breached a limit; listed
+                files are skipped until they change (default: None)
+            parse_cache_path: Directory caching parsed documents by file
+                content hash and loader version (default: None, no cache)
+            deduplicate: Drop near-duplicate sources in load_directory
+                (default: False)
+            dedup_threshold: Share of a source's content that must occur in
+                the canonical source for it to be dropped (default: 0.9)
+            dedup_index_path: JSON index of already stored sources, so new
+                copies of them are dropped too. Loading never writes it;
+                call near_duplicates.save() once the documents are stored
+                (default: None)
+        """
         self.supported_extensions = set(self.LOADER_MAPPING.keys())
+        self.metadata_extractor = FilingMetadataExtractor()
+        # Per-file load time, document count and extraction tier (if reported)
+        self.file_reports: List[Dict[str, Any]] = []
+        self.parser = IsolatedParser(parse_timeout, max_parse_memory_mb) if isolate_parsing else None
+        self.quarantine = ParseQuarantine(quarantine_path) if quarantine_path else None
+        self.parse_cache = ParsedDocumentCache(parse_cache_path) if parse_cache_path else None
+        self.near_duplicates = NearDuplicateDetector(
+            threshold=dedup_threshold,
+            index_path=dedup_index_path
+        ) if deduplicate else None
+        # Outcome of the last near-duplicate pass (see _drop_near_duplicates)
+        self.dedup_report: Optional[Dict[str, Any]] = None
         
     def is_supported_file(self, file_path: str) -> bool:
         """Check if file type is supported."""
@@ -62,6 +142,13 @@ class EnterpriseDocumentLoader:
         """Get the file extension/type."""
         return Path(file_path).suffix.lower()
         
+    def _loader_fingerprint(self, loader_class) -> str:
+        """Parse cache identity of the code that parses a file type."""
+        if loader_class in (ZipArchiveLoader, EmailMessageLoader):
+            # Archive/mailbox output depends on every loader a member can be dispatched to
+            return loader_fingerprint(list(set(self.LOADER_MAPPING.values())))
+        return loader_fingerprint([loader_class])
+        
     def load_single_document(self, file_path: str) -> List[Document]:
         """
         Load a single document using the appropriate loader.
@@ -72,6 +159,29 @@ class EnterpriseDocumentLoader:
         Returns:
             List of LangChain Document objects
             
+        Raises:
+            DocumentLoaderError: If file type not supported or loading fails
+        """
+        return list(self.lazy_load_single_document(file_path))
+        
+    def lazy_load_single_document(self, file_path: str) -> Iterator[Document]:
+        """
+        Yield a file's documents as its loader produces them.
+        
+        Page- and section-level loaders (PDF pages, EDGAR sections, Word
+        sections, slides, table blocks, archive members) hand over each
+        document as soon as it is parsed, so callers can chunk and embed
+        page 1 while later pages are still being read and never hold a
+        whole filing in memory. With a parse cache, each document is
+        written to the file's cache entry as it passes through, and cache
+        hits are read back the same way.
+        
+        Args:
+            file_path: Path to the document file
+            
+        Yields:
+            LangChain Document objects with file type and filing metadata
+            
         Raises:
             DocumentLoaderError: If file type not supported or loading fails
         """
@@ -88,22 +198,85 @@ class EnterpriseDocumentLoader:
             
         loader_class = self.LOADER_MAPPING[extension]
         
+        if self.quarantine is not None:
+            reason = self.quarantine.get_reason(file_path)
+            if reason:
+                raise DocumentLoaderError(f"Quarantined: {reason}")
+        
+        document_count = 0
+        cache_writer = None
         try:
-            loader = loader_class(file_path)
-            documents = loader.load()
+            start_time = time.time()
+            cache_key = None
+            cached_documents = None
+            if self.parse_cache is not None:
+                cache_key = self.parse_cache.cache_key(file_path, self._loader_fingerprint(loader_class))
+                cached_documents = self.parse_cache.get(cache_key, file_path)
             
-            if not documents:
-                raise DocumentLoaderError(f"No content loaded from {file_path}")
-                
-            # Add file type metadata
-            for doc in documents:
-                doc.metadata['file_type'] = extension
-                doc.metadata['original_filename'] = Path(file_path).name
+            if cached_documents is not None:
+                loader = None
+                documents = cached_documents
+            elif self.parser is not None:
+                loader = self.parser
+                documents = self.parser.parse(file_path, loader_class)
+            else:
+                loader = loader_class(file_path)
+                documents = loader.lazy_load()
+            # Raw loader output goes to the cache entry as it is parsed, before
+            # metadata is added below; the entry is published once the file is done
+            if cache_key is not None and cached_documents is None:
+                cache_writer = self.parse_cache.open_entry(cache_key, file_path)
+            # Only time spent inside the loader counts, not the caller's work between documents
+            load_seconds = time.time() - start_time
+            
+            # Add file type and filing metadata; archive members and email
+            # attachments are described by their own name, with the
+            # container path as parent directory
+            filing_metadata_by_source = {}
+            while True:
+                start_time = time.time()
+                doc = next(documents, None)
+                load_seconds += time.time() - start_time
+                if doc is None:
+                    break
+                if cache_writer is not None:
+                    cache_writer.add(doc)
                 
-            return documents
+                member = doc.metadata.get('archive_member') or doc.metadata.get('attachment_filename')
+                member_path = os.path.join(file_path, member) if member else file_path
+                if member_path not in filing_metadata_by_source:
+                    filing_metadata_by_source[member_path] = self.metadata_extractor.extract(member_path)
+                doc.metadata['file_type'] = self.get_file_type(member_path)
+                doc.metadata['original_filename'] = Path(member_path).name
+                for key, value in filing_metadata_by_source[member_path].items():
+                    doc.metadata.setdefault(key, value)
+                document_count += 1
+                yield doc
             
+            if cache_writer is not None and document_count:
+                cache_writer.commit()
+            
+            self.file_reports.append({
+                "file": file_path,
+                "seconds": load_seconds,
+                "documents": document_count,
+                "tier": "cached" if cached_documents is not None else getattr(loader, "stats", {}).get("tier")
+            })
+        except ParseLimitError as e:
+            if self.quarantine is not None:
+                self.quarantine.add(file_path, str(e))
+            partial = f" after {document_count} documents" if document_count else ""
+            raise DocumentLoaderError(f"Parse of {file_path} killed{partial}: {str(e)}")
         except Exception as e:
-            raise DocumentLoaderError(f"Failed to load {file_path}: {str(e)}")
+            partial = f" after {document_count} documents" if document_count else ""
+            raise DocumentLoaderError(f"Failed to load {file_path}{partial}: {str(e)}")
+        finally:
+            # Failed, empty or abandoned parses leave no entry behind
+            if cache_writer is not None:
+                cache_writer.abort()
+        
+        if not document_count:
+            raise DocumentLoaderError(f"No content loaded from {file_path}")
             
     def load_directory(self, directory_path: str) -> List[Document]:
         """
@@ -115,33 +288,131 @@ class EnterpriseDocumentLoader:
         Returns:
             List of all loaded LangChain Document objects
         """
+        return list(self.lazy_load_directory(directory_path))
+        
+    def lazy_load_directory(self, directory_path: str) -> Iterator[Document]:
+        """
+        Yield the documents of every supported file in a directory, file by file.
+        
+        The loading summary is printed once the iterator is exhausted. A file
+        that fails part-way is reported as skipped; documents it already
+        yielded are not taken back.
+        
+        With deduplicate, every source must be compared before the first
+        document is released, so the directory's documents are held in
+        memory and yielded after the last file has been loaded.
+        
+        Args:
+            directory_path: Path to directory containing documents
+            
+        Yields:
+            Loaded LangChain Document objects
+        """
         if not os.path.exists(directory_path):
             raise DocumentLoaderError(f"Directory not found: {directory_path}")
             
-        all_documents = []
+        document_count = 0
         loaded_files = []
         skipped_files = []
+        self.file_reports = []
+        buffered_documents = []
         
         for file_path in Path(directory_path).iterdir():
             if file_path.is_file() and self.is_supported_file(str(file_path)):
                 try:
-                    documents = self.load_single_document(str(file_path))
-                    all_documents.extend(documents)
+                    for document in self.lazy_load_single_document(str(file_path)):
+                        if self.near_duplicates is not None:
+                            buffered_documents.append(document)
+                            continue
+                        document_count += 1
+                        yield document
                     loaded_files.append(str(file_path))
                 except DocumentLoaderError as e:
                     skipped_files.append(f"{file_path}: {str(e)}")
+        
+        if self.near_duplicates is not None:
+            for document in self._drop_near_duplicates(buffered_documents):
+                document_count += 1
+                yield document
                     
         print(f"Document loading summary:")
         print(f"  ✅ Successfully loaded: {len(loaded_files)} files")
         print(f"  ❌ Skipped/Failed: {len(skipped_files)} files")
-        print(f"  📄 Total documents: {len(all_documents)}")
+        print(f"  📄 Total documents: {document_count}")
+        
+        if self.file_reports:
+            print(f"  ⏱️  Per-file load time:")
+            for report in self.file_reports:
+                tier = f" [{report['tier']}]" if report['tier'] else ""
+                print(f"    - {Path(report['file']).name}: {report['seconds']:.2f}s, "
+                      f"{report['documents']} documents{tier}")
+        
+        if self.parse_cache is not None:
+            print(f"  🗃️  Parse cache: {self.parse_cache.stats['hits']} hits, "
+                  f"{self.parse_cache.stats['misses']} misses")
+        
+        if self.dedup_report is not None:
+            report = self.dedup_report
+            print(f"  🧬 Near-duplicates: {report['duplicate_sources']} of {report['sources_checked']} sources dropped "
+                  f"({report['documents_dropped']} documents, {report['characters_dropped']} characters "
+                  f"≈ {report['characters_dropped'] // 4} tokens not embedded)")
+            for duplicate, (canonical, containment) in report["duplicates"].items():
+                print(f"    - {os.path.relpath(duplicate)} -> {os.path.relpath(canonical)} ({containment:.0%})")
         
         if skipped_files:
             print(f"  Errors:")
             for error in skipped_files:
                 print(f"    - {error}")
-                
-        return all_documents
+        
+    def _drop_near_duplicates(self, documents: List[Document]) -> List[Document]:
+        """
+        Remove the documents of sources that duplicate another source.
+        
+        Sources (files, archive members, attachments) are compared on their
+        concatenated text and against the index of already stored sources.
+        
+        Args:
+            documents: Documents of one load_directory pass
+            
+        Returns:
+            Documents of canonical and unique sources, in load order
+        """
+        # Absolute keys, so the index still matches when run from elsewhere
+        units: Dict[str, Dict[str, Any]] = {}
+        for doc in documents:
+            key = os.path.abspath(doc.metadata.get('source', ''))
+            unit = units.setdefault(key, {"key": key, "texts": [], "file_type": doc.metadata.get('file_type', '')})
+            unit["texts"].append(doc.page_content)
+        
+        duplicates = self.near_duplicates.deduplicate([
+            {"key": unit["key"], "text": "\n".join(unit["texts"]), "file_type": unit["file_type"]}
+            for unit in units.values()
+        ])
+        
+        kept = []
+        documents_dropped = 0
+        characters_dropped = 0
+        for doc in documents:
+            if os.path.abspath(doc.metadata.get('source', '')) in duplicates:
+                documents_dropped += 1
+                characters_dropped += len(doc.page_content)
+            else:
+                kept.append(doc)
+        
+        self.dedup_report = {
+            "sources_checked": len(units),
+            "duplicate_sources": len(duplicates),
+            "documents_dropped": documents_dropped,
+            "characters_dropped": characters_dropped,
+            "characters_kept": sum(len(doc.page_content) for doc in kept),
+            "duplicates": duplicates
+        }
+        return kept
+        
+    def close(self) -> None:
+        """Stop the parse worker, if one is running."""
+        if self.parser is not None:
+            self.parser.close()
         
     def get_document_summary(self, documents: List[Document]) -> Dict[str, Any]:
         """
@@ -0,0 +1,162 @@
+"""
+Enterprise-Grade Document Text Store Module
+
+Keeps the full text of every loaded document on disk so retrieval can expand
+small child chunks back to their larger parent windows (small-to-big retrieval).
+Spans are addressed by UTF-8 byte offsets and read lazily with a single seek.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+import hashlib
+from typing import List, Dict, Any, Tuple
+
+
+# Directory name used for the text store inside a vector storage path
+DEFAULT_STORE_DIRNAME = "document_text"
+
+
+class DocumentStoreError(Exception):
+    """Custom exception for document text store errors"""
+    pass
+
+
+class DocumentTextStore:
+    """
+    Per-document text store addressed by byte offsets.
+
+    Each document is written once as a UTF-8 file named by the hash of its
+    content, so re-ingesting an unchanged document is a no-op and identical
+    documents share storage. Chunks keep only (doc_key, byte_start, byte_end)
+    in their metadata; the text itself is read back on demand.
+
+    Layout:
+    - <store_path>/<doc_key[:2]>/<doc_key>.txt
+    """
+
+    def __init__(self, store_path: str = os.path.join("./chroma_db", DEFAULT_STORE_DIRNAME)):
+        """
+        Initialize the text store.
+
+        Args:
+            store_path: Directory holding the per-document text files
+        """
+        self.store_path = store_path
+        os.makedirs(store_path, exist_ok=True)
+
+        # Statistics tracking
+        self.stats = {
+            "documents_written": 0,
+            "documents_reused": 0,
+            "spans_read": 0,
+            "bytes_read": 0
+        }
+
+    @staticmethod
+    def document_key(text: str) -> str:
+        """Get the content-addressed key for a document's text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+
+    def _document_path(self, doc_key: str) -> str:
+        """Get the on-disk path for a document key."""
+        return os.path.join(self.store_path, doc_key[:2], f"{doc_key}.txt")
+
+    def put_document(self, text: str) -> str:
+        """
+        Store a document's full text.
+
+        Args:
+            text: Full document text
+
+        Returns:
+            Document key to reference the stored text
+
+        Raises:
+            DocumentStoreError: If the text cannot be written
+        """
+        doc_key = self.document_key(text)
+        path = self._document_path(doc_key)
+
+        if os.path.exists(path):
+            self.stats["documents_reused"] += 1
+            return doc_key
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Write to a temp file first so readers never see partial documents
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(text.encode("utf-8"))
+            os.replace(tmp_path, path)
+
+            self.stats["documents_written"] += 1
+            return doc_key
+
+        except OSError as e:
+            raise DocumentStoreError(f"Failed to store document {doc_key}: {str(e)}")
+
+    def has_document(self, doc_key: str) -> bool:
+        """Check if a document is present in the store."""
+        return os.path.exists(self._document_path(doc_key))
+
+    def read_span(self, doc_key: str, byte_start: int, byte_end: int) -> str:
+        """
+        Read a byte span of a stored document.
+
+        Args:
+            doc_key: Key returned by put_document()
+            byte_start: Start offset (inclusive) in UTF-8 bytes
+            byte_end: End offset (exclusive) in UTF-8 bytes
+
+        Returns:
+            Decoded text of the span
+
+        Raises:
+            DocumentStoreError: If the document is missing or unreadable
+        """
+        return self.read_spans([(doc_key, byte_start, byte_end)])[0]
+
+    def read_spans(self, spans: List[Tuple[str, int, int]]) -> List[str]:
+        """
+        Read several spans, opening each document file only once.
+
+        Args:
+            spans: List of (doc_key, byte_start, byte_end) tuples
+
+        Returns:
+            Decoded span texts in the same order as requested
+
+        Raises:
+            DocumentStoreError: If a document is missing or unreadable
+        """
+        results: List[str] = [""] * len(spans)
+
+        # Group requests by document so each file is opened once
+        by_document: Dict[str, List[int]] = {}
+        for i, (doc_key, _, _) in enumerate(spans):
+            by_document.setdefault(doc_key, []).append(i)
+
+        for doc_key, indices in by_document.items():
+            path = self._document_path(doc_key)
+            try:
+                with open(path, "rb") as f:
+                    for i in sorted(indices, key=lambda idx: spans[idx][1]):
+                        _, byte_start, byte_end = spans[i]
+                        f.seek(byte_start)
+                        raw = f.read(max(0, byte_end - byte_start))
+                        results[i] = raw.decode("utf-8", errors="ignore")
+                        self.stats["spans_read"] += 1
+                        self.stats["bytes_read"] += len(raw)
+            except OSError as e:
+                raise DocumentStoreError(f"Failed to read document {doc_key}: {str(e)}")
+
+        return results
+
+    def get_store_info(self) -> Dict[str, Any]:
+        """Get information about the text store."""
+        return {
+            "store_path": self.store_path,
+            **self.stats
+        }
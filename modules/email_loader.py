@@ -0,0 +1,337 @@
+"""
+Enterprise-Grade Email Loader Module
+
+Loads single messages (.eml) and mailbox exports (.mbox) in one streaming
+pass. Each message yields a document for its body, and every attachment
+with a supported extension (PDF decks, spreadsheets, Word files, zipped
+filing bundles) is parsed from an in-memory buffer by the loader for its
+file type, in parallel, with the parent message's headers attached.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import io
+import os
+import re
+import shutil
+import tempfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor, Future
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
+from email.utils import parsedate_to_datetime
+from pathlib import Path, PurePosixPath
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union, IO, Type
+
+from langchain_core.documents import Document
+from langchain_core.document_loaders import BaseLoader
+
+from modules.edgar_loader import EdgarFilingLoader
+
+
+# A message's body document, or an attachment still being parsed:
+# (future, attachment source, parent message metadata, attachment bytes)
+PendingItem = Union[Document, Tuple[Future, str, Dict[str, Any], int]]
+
+
+class EmailLoaderError(Exception):
+    """Custom exception for email loading errors"""
+    pass
+
+
+def _load_attachment(
+    loader_mapping: Dict[str, Type[BaseLoader]],
+    payload: bytes,
+    extension: str,
+    attachment_source: str
+) -> List[Document]:
+    """
+    Parse one attachment buffer with the loader for its extension.
+
+    Module level so it can run on a process pool as well as a thread pool.
+    """
+    if extension in EmailMessageLoader.HTML_EXTENSIONS:
+        text = EdgarFilingLoader.html_to_text(payload.decode("utf-8", errors="replace"))
+        return [Document(page_content=text, metadata={})] if text else []
+
+    loader_class = loader_mapping[extension]
+    if loader_class is EmailMessageLoader:
+        # Attached mailbox: expand in this worker, without another pool
+        return list(EmailMessageLoader(
+            attachment_source,
+            loader_mapping=loader_mapping,
+            max_workers=1,
+            file_obj=io.BytesIO(payload)
+        ).lazy_load())
+
+    if getattr(loader_class, "accepts_file_obj", False):
+        return list(loader_class(attachment_source, file_obj=io.BytesIO(payload)).lazy_load())
+
+    # Path-only loader: spool this one attachment to a temporary file
+    tmp_dir = tempfile.mkdtemp(prefix="email_attachment_")
+    try:
+        tmp_path = os.path.join(tmp_dir, Path(attachment_source).name)
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        return list(loader_class(tmp_path).lazy_load())
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class EmailMessageLoader(BaseLoader):
+    """
+    Loader for .eml messages and .mbox mailboxes with attachment fan-out.
+
+    Mailboxes are split on their "From " separator lines while reading, so
+    only the messages currently in flight are held in memory. For every
+    message:
+    - the plain-text body (or the HTML body reduced to text) is yielded as
+      one document, prefixed with its Subject/From/To/Date headers
+    - attachments are decoded into memory buffers and dispatched by
+      extension to the loaders of loader_mapping on a worker pool; their
+      documents are yielded after the body, in attachment order
+    - attached messages (message/rfc822 or .eml files) are expanded the
+      same way, up to MAX_NESTING_DEPTH levels
+
+    Added metadata:
+    - source: the file path, "<mbox path>/<message index>" for mailbox
+      messages, and "<message source>/<attachment filename>" for attachments
+    - message_index, message_id, email_subject, email_from, email_to,
+      email_date (ISO 8601) on bodies and attachments
+    - attachment_filename and parent_source on attachment documents
+    """
+
+    # Can read from a file object instead of a path (zip members, attachments)
+    accepts_file_obj = True
+
+    # Bump whenever the loader's output changes (invalidates parse cache entries)
+    LOADER_VERSION = 1
+
+    MAILBOX_EXTENSIONS = {".mbox"}
+    MESSAGE_EXTENSIONS = {".eml"}
+    HTML_EXTENSIONS = {".htm", ".html"}
+
+    DEFAULT_MAX_WORKERS = 4
+    DEFAULT_MAX_ATTACHMENT_BYTES = 512 * 1024 * 1024
+    MAX_NESTING_DEPTH = 2
+
+    # mboxrd escapes body lines starting with "From " as ">From "
+    ESCAPED_FROM_PATTERN = re.compile(rb"^>(>*From )")
+
+    def __init__(
+        self,
+        file_path: str,
+        loader_mapping: Optional[Dict[str, Type[BaseLoader]]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_attachment_bytes: int = DEFAULT_MAX_ATTACHMENT_BYTES,
+        use_processes: bool = False,
+        file_obj: Optional[IO[bytes]] = None
+    ):
+        """
+        Initialize the loader.
+
+        Args:
+            file_path: Path to the .eml or .mbox file
+            loader_mapping: Extension -> loader class used for attachments
+                (default: EnterpriseDocumentLoader.LOADER_MAPPING)
+            max_workers: Attachment parsing workers; also the number of
+                messages whose attachments may be in flight (default: 4)
+            max_attachment_bytes: Attachments larger than this (decoded) are skipped
+            use_processes: Parse attachments on a process pool instead of
+                threads. The bundled loaders are pure Python, so threads
+                mostly overlap decompression and I/O; processes scale with
+                cores but pay a start-up cost per worker (default: False)
+            file_obj: Binary stream to read instead of file_path
+        """
+        self.file_path = str(file_path)
+        self.loader_mapping = loader_mapping
+        self.max_workers = max(1, max_workers)
+        self.max_attachment_bytes = max_attachment_bytes
+        self.use_processes = use_processes
+        self.file_obj = file_obj
+        self._parser = BytesParser(policy=policy.default)
+        self.stats = {
+            "messages": 0,
+            "attachments_loaded": 0,
+            "attachments_skipped": 0,
+            "attachments_failed": 0,
+            "attachment_bytes": 0
+        }
+
+    def _get_loader_mapping(self) -> Dict[str, Type[BaseLoader]]:
+        if self.loader_mapping is None:
+            # Imported here: document_loader registers this class for .eml/.mbox
+            from modules.document_loader import EnterpriseDocumentLoader
+            self.loader_mapping = EnterpriseDocumentLoader.LOADER_MAPPING
+        return self.loader_mapping
+
+    def _iter_raw_messages(self, stream: IO[bytes], is_mailbox: bool) -> Iterator[bytes]:
+        """Yield the raw bytes of each message, one at a time."""
+        if not is_mailbox:
+            yield stream.read()
+            return
+
+        lines: List[bytes] = []
+        started = False
+        for line in stream:
+            if line.startswith(b"From "):
+                if started:
+                    yield b"".join(lines)
+                lines = []
+                started = True
+                continue
+            lines.append(self.ESCAPED_FROM_PATTERN.sub(rb"\1", line))
+        if started:
+            yield b"".join(lines)
+
+    def lazy_load(self) -> Iterator[Document]:
+        """Yield each message's body document followed by its attachment documents."""
+        is_mailbox = Path(self.file_path).suffix.lower() in self.MAILBOX_EXTENSIONS
+        try:
+            stream = self.file_obj if self.file_obj is not None else open(self.file_path, "rb")
+        except OSError as e:
+            raise EmailLoaderError(f"Failed to open {self.file_path}: {str(e)}")
+
+        pool = self._create_pool()
+        # Messages whose attachments are still being parsed, in mailbox order
+        pending = deque()
+        try:
+            for index, raw_message in enumerate(self._iter_raw_messages(stream, is_mailbox)):
+                message = self._parser.parsebytes(raw_message)
+                source = f"{self.file_path}/{index}" if is_mailbox else self.file_path
+                pending.append(self._message_items(pool, message, source, index, depth=0))
+                while len(pending) > self.max_workers:
+                    yield from self._resolve(pending.popleft())
+            while pending:
+                yield from self._resolve(pending.popleft())
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            if self.file_obj is None:
+                stream.close()
+
+    def _create_pool(self) -> Executor:
+        # Daemonic processes (e.g. the isolated parse worker) cannot start children
+        if self.use_processes and not multiprocessing.current_process().daemon:
+            return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="email-attachment")
+
+    def _resolve(self, items: List[PendingItem]) -> Iterator[Document]:
+        """Yield a message's documents, waiting for each attachment in turn."""
+        for item in items:
+            if isinstance(item, Document):
+                yield item
+                continue
+
+            future, attachment_source, attachment_metadata, size = item
+            try:
+                documents = future.result()
+            except Exception as e:
+                # One unreadable attachment must not drop the rest of the mailbox
+                print(f"⚠️  Failed to load {attachment_source}: {str(e)}")
+                self.stats["attachments_failed"] += 1
+                continue
+
+            self.stats["attachments_loaded"] += 1
+            self.stats["attachment_bytes"] += size
+            for doc in documents:
+                # Nested archive members keep the more specific source they were given
+                if not doc.metadata.get("archive_member"):
+                    doc.metadata["source"] = attachment_source
+                for key, value in attachment_metadata.items():
+                    doc.metadata.setdefault(key, value)
+                yield doc
+
+    @staticmethod
+    def _header_metadata(message: EmailMessage, index: int) -> Dict[str, Any]:
+        metadata = {
+            "message_index": index,
+            "message_id": str(message.get("message-id", "")).strip(),
+            "email_subject": str(message.get("subject", "")).strip(),
+            "email_from": str(message.get("from", "")).strip(),
+            "email_to": str(message.get("to", "")).strip(),
+            "email_date": ""
+        }
+        if message.get("date"):
+            try:
+                metadata["email_date"] = parsedate_to_datetime(str(message["date"])).isoformat()
+            except (TypeError, ValueError):
+                metadata["email_date"] = str(message["date"])
+        return metadata
+
+    @staticmethod
+    def _part_text(part: EmailMessage) -> str:
+        try:
+            text = part.get_content()
+        except (LookupError, UnicodeDecodeError):
+            # Unknown or wrong charset declaration
+            text = (part.get_payload(decode=True) or b"").decode("utf-8", errors="replace")
+        if part.get_content_type() == "text/html":
+            text = EdgarFilingLoader.html_to_text(text)
+        return text.strip()
+
+    def _message_items(
+        self,
+        pool: Executor,
+        message: EmailMessage,
+        source: str,
+        index: int,
+        depth: int
+    ) -> List[PendingItem]:
+        """Body document and attachment futures of one message, in order."""
+        self.stats["messages"] += 1
+        header_metadata = self._header_metadata(message, index)
+        items: List[PendingItem] = []
+
+        body = message.get_body(preferencelist=("plain", "html"))
+        body_text = self._part_text(body) if body is not None else ""
+        if body_text:
+            headers = "\n".join(
+                f"{label}: {header_metadata[key]}"
+                for label, key in [("Subject", "email_subject"), ("From", "email_from"),
+                                   ("To", "email_to"), ("Date", "email_date")]
+                if header_metadata[key]
+            )
+            items.append(Document(
+                page_content=f"{headers}\n\n{body_text}",
+                metadata={"source": source, **header_metadata}
+            ))
+
+        for position, part in enumerate(message.iter_attachments()):
+            filename = part.get_filename() or ""
+            extension = PurePosixPath(filename).suffix.lower()
+            attachment_source = f"{source}/{filename or f'attachment-{position}'}"
+
+            if part.get_content_type() == "message/rfc822" or extension in self.MESSAGE_EXTENSIONS:
+                if depth >= self.MAX_NESTING_DEPTH:
+                    print(f"⚠️  Skipping {attachment_source}: messages nested deeper than "
+                          f"{self.MAX_NESTING_DEPTH} levels")
+                    self.stats["attachments_skipped"] += 1
+                    continue
+                if part.get_content_type() == "message/rfc822":
+                    nested = part.get_content()
+                else:
+                    nested = self._parser.parsebytes(part.get_payload(decode=True) or b"")
+                self.stats["attachments_loaded"] += 1
+                items.extend(self._message_items(pool, nested, attachment_source, index, depth + 1))
+                continue
+
+            if extension not in self.HTML_EXTENSIONS and extension not in self._get_loader_mapping():
+                self.stats["attachments_skipped"] += 1
+                continue
+            payload = part.get_payload(decode=True) or b""
+            if len(payload) > self.max_attachment_bytes:
+                print(f"⚠️  Skipping {attachment_source}: "
+                      f"{len(payload) / 1024 / 1024:.0f} MB exceeds attachment size limit")
+                self.stats["attachments_skipped"] += 1
+                continue
+
+            attachment_metadata = {
+                **header_metadata,
+                "attachment_filename": filename,
+                "parent_source": source
+            }
+            future = pool.submit(_load_attachment, self._get_loader_mapping(), payload, extension, attachment_source)
+            items.append((future, attachment_source, attachment_metadata, len(payload)))
+        return items
@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 from langchain_core.documents import Document
 from sentence_transformers import SentenceTransformer
 
+from modules.pca_projector import PCAProjector
+
 
 class EmbeddingGenerationError(Exception):
     """Custom exception for embedding generation errors"""
@@ -34,6 +36,7 @@ class EnterpriseEmbeddingGenerator:
     - Comprehensive error handling
     - Performance monitoring and statistics
     - Memory-efficient processing
+    - Optional PCA projection applied to document and query embeddings alike
     """
     
     def __init__(
@@ -56,6 +59,9 @@ class EnterpriseEmbeddingGenerator:
         self.normalize_embeddings = normalize_embeddings
         self.batch_size = batch_size
         
+        # Dimensionality reduction fitted on the corpus; see set_projector()
+        self.projector: Optional[PCAProjector] = None
+        
         try:
             print(f"Loading embedding model: {model_name}")
             self.model = SentenceTransformer(model_name, device=device)
@@ -114,6 +120,8 @@ class EnterpriseEmbeddingGenerator:
                 normalize_embeddings=self.normalize_embeddings,
                 convert_to_numpy=True
             )
+            if self.projector is not None:
+                embeddings = self.projector.transform(embeddings)
             
             processing_time = time.time() - start_time
             
@@ -170,8 +178,8 @@ class EnterpriseEmbeddingGenerator:
                         "embedding_normalized": self.normalize_embeddings,
                         "document_index": i
                     },
-                    "embedding": embedding.tolist(),  # Convert to list for JSON serialization
-                    "embedding_array": embedding  # Keep as numpy array for calculations
+                    "embedding": embedding,  # float32 row, passed to storage without boxing
+                    "embedding_array": embedding  # Same array, kept for existing callers
                 }
                 embedded_docs.append(embedded_doc)
             
@@ -204,11 +212,35 @@ class EnterpriseEmbeddingGenerator:
                 convert_to_numpy=True
             )[0]  # Extract single embedding from batch
             
+            # Queries must live in the same space as the stored vectors
+            if self.projector is not None:
+                embedding = self.projector.transform(embedding)
+            
             return embedding
             
         except Exception as e:
             raise EmbeddingGenerationError(f"Failed to generate query embedding: {str(e)}")
     
+    def set_projector(self, projector: Optional[PCAProjector]) -> None:
+        """
+        Project all further document and query embeddings with a PCA projection.
+        
+        Args:
+            projector: Fitted projection for the target collection, or None
+                to produce full-size model embeddings again
+            
+        Raises:
+            EmbeddingGenerationError: If the projection does not fit the model
+        """
+        if projector is not None and projector.input_dim != self.model.get_sentence_embedding_dimension():
+            raise EmbeddingGenerationError(
+                f"Projection expects {projector.input_dim}-dim input, "
+                f"model produces {self.model.get_sentence_embedding_dimension()}"
+            )
+        self.projector = projector
+        if projector is not None:
+            print(f"   PCA projection: {projector.input_dim} -> {projector.output_dim} dimensions")
+    
     def calculate_similarity(
         self, 
         embedding1: np.ndarray, 
@@ -399,6 +431,7 @@ class EnterpriseEmbeddingGenerator:
                 "max_seq_length": self.model.max_seq_length,
                 "device": str(self.model.device),
                 "normalize_embeddings": self.normalize_embeddings,
+                "projected_dimensions": self.projector.output_dim if self.projector is not None else None,
                 "batch_size": self.batch_size,
                 "model_architecture": str(type(self.model._modules['0']).__name__) if hasattr(self.model, '_modules') else "Unknown"
             }
@@ -0,0 +1,224 @@
+"""
+Enterprise-Grade Filing Metadata Extraction Module
+
+Derives typed, filterable metadata (fiscal year, fiscal quarter, form type,
+filing date) from document paths at ingestion time, and detects the same
+constraints in user questions so retrieval can pre-filter the collection.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+class FilingMetadataExtractor:
+    """
+    Extracts Microsoft filing metadata from file paths and questions.
+
+    Path conventions handled:
+    - Fiscal period labels: FY22Q1-zip, MSFT_FY16Q4_10K.docx, TranscriptFY16Q3.docx
+    - EDGAR downloads: 10-Q_2015-04-23.txt, 8-K_2019-10-23.zip
+    - Financial report exports: microsoft-10-K-2024-07-30-Financial_Report_...csv
+
+    Microsoft's fiscal year ends June 30, so FY22 runs July 2021 - June 2022.
+    10-K/10-Q filings are mapped to the quarter they report on (the quarter
+    ending just before the filing date); other dated documents are mapped to
+    the fiscal quarter containing their date.
+
+    Metadata keys produced (only when detected):
+    - fiscal_year (int), fiscal_quarter (int 1-4)
+    - form_type (str: "10-K", "10-Q", "8-K", "DEF 14A")
+    - filing_date (str, ISO), filing_year (int)
+    """
+
+    FISCAL_PERIOD_PATTERN = re.compile(r"FY[\s_-]?(\d{4}|\d{2})(?!\d)(?:[\s_-]?Q([1-4]))?", re.IGNORECASE)
+    FORM_TYPE_PATTERN = re.compile(r"(?<![A-Za-z0-9])(10-?K|10-?Q|8-?K|DEF[\s_-]?14A)(?![A-Za-z0-9])", re.IGNORECASE)
+    DATE_PATTERN = re.compile(r"(?<!\d)((?:19|20)\d{2})-(\d{2})-(\d{2})(?!\d)")
+
+    # Question patterns
+    QUERY_FISCAL_YEAR_PATTERN = re.compile(
+        r"\b(?:FY[\s'-]?|fiscal(?:\s+year)?\s+)(\d{4}|\d{2})(?!\d)", re.IGNORECASE
+    )
+    QUERY_FISCAL_PERIOD_PATTERN = re.compile(r"\bFY[\s'-]?(\d{4}|\d{2})[\s_-]?Q([1-4])\b", re.IGNORECASE)
+    QUERY_CALENDAR_YEAR_PATTERN = re.compile(r"(?<![\w-])((?:19|20)\d{2})(?![\w-])")
+    QUERY_QUARTER_PATTERN = re.compile(
+        r"\bQ([1-4])\b|\b(first|second|third|fourth)\s+(?:fiscal\s+)?quarter\b", re.IGNORECASE
+    )
+    QUERY_FORM_TYPES = [
+        (re.compile(r"\b10-?K\b|\bannual\s+reports?\b", re.IGNORECASE), "10-K"),
+        (re.compile(r"\b10-?Q\b|\bquarterly\s+reports?\b", re.IGNORECASE), "10-Q"),
+        (re.compile(r"\b8-?K\b|\bcurrent\s+reports?\b", re.IGNORECASE), "8-K"),
+        (re.compile(r"\bDEF\s?14A\b|\bproxy\s+statements?\b", re.IGNORECASE), "DEF 14A"),
+    ]
+    # Each pattern maps to every file type that can hold what it names
+    QUERY_FILE_TYPES = [
+        (re.compile(r"\bpdfs?\b", re.IGNORECASE), [".pdf"]),
+        (re.compile(r"\bcsvs?\b", re.IGNORECASE), [".csv"]),
+        (re.compile(r"\bspreadsheets?\b|\bworkbooks?\b|\bexcel\b", re.IGNORECASE), [".csv", ".xlsx"]),
+        (re.compile(r"\bpowerpoints?\b|\bslides?\b|\bslide\s+decks?\b", re.IGNORECASE), [".pptx"]),
+        (re.compile(r"\bemails?\b", re.IGNORECASE), [".eml", ".mbox"]),
+    ]
+    ORDINAL_QUARTERS = {"first": 1, "second": 2, "third": 3, "fourth": 4}
+
+    @staticmethod
+    def _normalize_year(year: str) -> int:
+        """Expand two-digit years (FY22 -> 2022)."""
+        value = int(year)
+        return value + 2000 if value < 100 else value
+
+    @staticmethod
+    def _normalize_form_type(form_type: str) -> str:
+        """Normalize form type spellings (10K, 10-k -> 10-K)."""
+        compact = re.sub(r"[\s_-]", "", form_type.upper())
+        if compact == "DEF14A":
+            return "DEF 14A"
+        return f"{compact[:-1]}-{compact[-1]}"
+
+    @staticmethod
+    def fiscal_period_for_date(year: int, month: int) -> Dict[str, int]:
+        """Get the Microsoft fiscal year/quarter containing a calendar month."""
+        if month >= 7:
+            return {"fiscal_year": year + 1, "fiscal_quarter": 1 if month <= 9 else 2}
+        return {"fiscal_year": year, "fiscal_quarter": 3 if month <= 3 else 4}
+
+    @classmethod
+    def reported_period_for_filing(cls, year: int, month: int) -> Dict[str, int]:
+        """Get the fiscal year/quarter a periodic report filed in a month covers."""
+        # Step back one quarter: a filing reports the quarter that just ended
+        month -= 3
+        if month <= 0:
+            month += 12
+            year -= 1
+        return cls.fiscal_period_for_date(year, month)
+
+    def extract(self, file_path: str) -> Dict[str, Any]:
+        """
+        Extract filing metadata from a file path.
+
+        The filename is checked first, then parent directories (e.g. files
+        inside FY22Q1-zip inherit FY2022 Q1).
+
+        Args:
+            file_path: Path to the document
+
+        Returns:
+            Dictionary of detected metadata (empty if nothing was found)
+        """
+        metadata: Dict[str, Any] = {}
+        path = Path(file_path)
+        candidates = [path.name] + [part for part in reversed(path.parent.parts)]
+
+        for part in candidates:
+            if "form_type" not in metadata:
+                form_match = self.FORM_TYPE_PATTERN.search(part)
+                if form_match:
+                    metadata["form_type"] = self._normalize_form_type(form_match.group(1))
+
+            if "fiscal_year" not in metadata:
+                period_match = self.FISCAL_PERIOD_PATTERN.search(part)
+                if period_match:
+                    metadata["fiscal_year"] = self._normalize_year(period_match.group(1))
+                    if period_match.group(2):
+                        metadata["fiscal_quarter"] = int(period_match.group(2))
+
+            if "filing_date" not in metadata:
+                date_match = self.DATE_PATTERN.search(part)
+                if date_match:
+                    year, month, day = (int(g) for g in date_match.groups())
+                    if 1 <= month <= 12:
+                        metadata["filing_date"] = f"{year:04d}-{month:02d}-{day:02d}"
+                        metadata["filing_year"] = year
+
+        # Derive the fiscal period from the filing date when no FY label exists
+        if "fiscal_year" not in metadata and "filing_date" in metadata:
+            year, month = metadata["filing_year"], int(metadata["filing_date"][5:7])
+            if metadata.get("form_type") in ("10-K", "10-Q"):
+                metadata.update(self.reported_period_for_filing(year, month))
+            else:
+                metadata.update(self.fiscal_period_for_date(year, month))
+
+        return metadata
+
+    def detect_query_constraints(self, query: str) -> Dict[str, List[Any]]:
+        """
+        Detect fiscal period, form type and file type constraints in a question.
+
+        Bare calendar years ("in 2020") overlap two Microsoft fiscal years, so
+        they expand to both (FY2020 and FY2021).
+
+        Args:
+            query: User question
+
+        Returns:
+            Dictionary mapping metadata keys to lists of allowed values
+        """
+        constraints: Dict[str, List[Any]] = {}
+
+        def add(key: str, value: Any) -> None:
+            values = constraints.setdefault(key, [])
+            if value not in values:
+                values.append(value)
+
+        for match in self.QUERY_FISCAL_PERIOD_PATTERN.finditer(query):
+            add("fiscal_year", self._normalize_year(match.group(1)))
+            add("fiscal_quarter", int(match.group(2)))
+
+        for match in self.QUERY_FISCAL_YEAR_PATTERN.finditer(query):
+            add("fiscal_year", self._normalize_year(match.group(1)))
+
+        if "fiscal_year" not in constraints:
+            for match in self.QUERY_CALENDAR_YEAR_PATTERN.finditer(query):
+                year = int(match.group(1))
+                add("fiscal_year", year)
+                add("fiscal_year", year + 1)
+
+        if "fiscal_quarter" not in constraints:
+            for match in self.QUERY_QUARTER_PATTERN.finditer(query):
+                if match.group(1):
+                    add("fiscal_quarter", int(match.group(1)))
+                else:
+                    add("fiscal_quarter", self.ORDINAL_QUARTERS[match.group(2).lower()])
+
+        for pattern, form_type in self.QUERY_FORM_TYPES:
+            if pattern.search(query):
+                add("form_type", form_type)
+
+        for pattern, file_types in self.QUERY_FILE_TYPES:
+            if pattern.search(query):
+                for file_type in file_types:
+                    add("file_type", file_type)
+
+        return constraints
+
+    @staticmethod
+    def build_metadata_filter(
+        constraints: Dict[str, List[Any]],
+        base_filter: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Convert detected constraints into a ChromaDB where clause.
+
+        Args:
+            constraints: Output of detect_query_constraints()
+            base_filter: Optional existing filter to combine with
+
+        Returns:
+            ChromaDB where clause, or None if there is nothing to filter on
+        """
+        conditions = []
+        if base_filter:
+            conditions.append(base_filter)
+
+        for key, values in constraints.items():
+            if len(values) == 1:
+                conditions.append({key: values[0]})
+            elif values:
+                conditions.append({key: {"$in": values}})
+
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
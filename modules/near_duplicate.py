@@ -0,0 +1,371 @@
+"""
+Enterprise-Grade Near-Duplicate Detection Module
+
+Finds documents that carry the same content in different files, such as a
+10-K as DOCX, as PDF and inside an EDGAR filing bundle, or backup copies
+of a filing folder. Documents are compared by MinHash signatures of their
+word shingles and of the numbers they contain, and candidate pairs come
+from locality-sensitive hashing (LSH) bands, so a corpus is checked in one
+pass without comparing every pair. One canonical version is kept.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+import re
+import json
+import zlib
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+# Suffix of the index file holding the signatures of a collection's stored sources
+NEAR_DUPLICATE_INDEX_SUFFIX = "_near_duplicates.json"
+
+
+def near_duplicate_index_path(storage_path: str, collection_name: str) -> str:
+    """Path of the near-duplicate index belonging to a collection."""
+    return os.path.join(storage_path, f"{collection_name}{NEAR_DUPLICATE_INDEX_SUFFIX}")
+
+
+class NearDuplicateError(Exception):
+    """Custom exception for near-duplicate detection errors"""
+    pass
+
+
+class NearDuplicateDetector:
+    """
+    MinHash/LSH near-duplicate detector over document sources.
+
+    Text is lower-cased and split into alphanumeric words, so markup, table
+    separators and whitespace do not matter. A source is a duplicate of
+    another when both hold:
+    - text: at least `threshold` of its word shingles occur in the other
+      (containment, so a filing is still matched by a copy that also
+      carries its exhibits)
+    - numbers: at least `numeric_threshold` of its distinct numbers occur
+      in the other. Consecutive 10-Qs share most of their prose but few
+      of their figures; this keeps them apart. Skipped when either side
+      has fewer than MIN_NUMBERS distinct numbers.
+
+    Containment is estimated from the MinHash Jaccard similarity and the
+    shingle counts. LSH candidates need a Jaccard similarity of roughly
+    (1 / bands) ** (1 / rows), about 0.4 with the defaults. A short text
+    buried in a much longer one is therefore not flagged.
+
+    Sources are grouped transitively. The canonical version must cover
+    the other members, so no content is lost. It is chosen in this order:
+    1. a source already in the index (stored by an earlier run)
+    2. the format ranked first in format_preference
+    3. the longest text (the most complete copy)
+    4. the smallest source key, so the choice is deterministic
+    Members the canonical version does not cover are kept.
+
+    With index_path, the signatures of kept sources are saved and later
+    runs drop new copies of content that is already stored.
+    """
+
+    # Sectioned and tabular formats chunk better than page-based ones
+    DEFAULT_FORMAT_PREFERENCE = (".docx", ".txt", ".xlsx", ".csv", ".pdf", ".pptx", ".eml", ".mbox", ".zip")
+
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+    NUMBER_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?")
+    MIN_NUMBERS = 20
+
+    SHINGLE_MULTIPLIER = np.uint64(1000003)
+    # Shingles hashed per block, bounding the num_perm x block work array
+    HASH_BLOCK_SIZE = 8192
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        numeric_threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 5,
+        format_preference: Optional[List[str]] = None,
+        index_path: Optional[str] = None,
+        seed: int = 1
+    ):
+        """
+        Initialize the detector.
+
+        Args:
+            threshold: Share of a source's word shingles that must occur in
+                the canonical source (default: 0.9)
+            numeric_threshold: Share of a source's distinct numbers that
+                must occur in the canonical source (default: 0.8)
+            num_perm: MinHash signature length (default: 128)
+            bands: LSH bands; num_perm must divide evenly (default: 32)
+            shingle_size: Words per shingle (default: 5)
+            format_preference: File extensions in order of preference for
+                the canonical version (default: DEFAULT_FORMAT_PREFERENCE)
+            index_path: JSON file persisting the signatures of kept sources
+                across runs (default: None, in memory only)
+            seed: Seed of the MinHash permutations (default: 1)
+
+        Raises:
+            NearDuplicateError: If num_perm is not a multiple of bands
+        """
+        if num_perm % bands:
+            raise NearDuplicateError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+
+        self.threshold = threshold
+        self.numeric_threshold = numeric_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.format_preference = list(format_preference or self.DEFAULT_FORMAT_PREFERENCE)
+        self.index_path = index_path
+        self.seed = seed
+
+        rng = np.random.default_rng(seed)
+        # Random odd multipliers and offsets of the multiply-add-shift hash family
+        self._a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+        self._b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False)
+
+        # Kept sources: key -> fingerprint (see fingerprint()) plus file_type and characters
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[str]] = {}
+
+        if index_path and os.path.exists(index_path):
+            self._load_index()
+
+    def _parameters(self) -> Dict[str, Any]:
+        return {
+            "num_perm": self.num_perm,
+            "shingle_size": self.shingle_size,
+            "seed": self.seed
+        }
+
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise NearDuplicateError(f"Failed to read near-duplicate index {self.index_path}: {str(e)}")
+
+        if data.get("parameters") != self._parameters():
+            # Signatures from other parameters are not comparable
+            print(f"⚠️  Ignoring near-duplicate index {self.index_path}: built with {data.get('parameters')}")
+            return
+        for key, entry in data.get("entries", {}).items():
+            entry["text_signature"] = np.array(entry["text_signature"], dtype=np.uint64)
+            if entry["number_signature"] is not None:
+                entry["number_signature"] = np.array(entry["number_signature"], dtype=np.uint64)
+            self._add(key, entry)
+
+    def save(self) -> None:
+        """Write the index atomically (no-op without index_path)."""
+        if not self.index_path:
+            return
+        data = {
+            "parameters": self._parameters(),
+            "entries": {
+                key: {
+                    **entry,
+                    "text_signature": entry["text_signature"].tolist(),
+                    "number_signature": (entry["number_signature"].tolist()
+                                         if entry["number_signature"] is not None else None)
+                }
+                for key, entry in self.entries.items()
+            }
+        }
+        tmp_path = f"{self.index_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            raise NearDuplicateError(f"Failed to write near-duplicate index {self.index_path}: {str(e)}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _minhash(self, features: np.ndarray) -> np.ndarray:
+        """MinHash signature of a set of 32-bit feature hashes."""
+        # h(x) = ((a * x + b) mod 2^64) >> 32; uint64 arithmetic wraps mod 2^64
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(features), self.HASH_BLOCK_SIZE):
+            block = features[start:start + self.HASH_BLOCK_SIZE]
+            hashed = (np.outer(self._a, block) + self._b[:, None]) >> np.uint64(32)
+            signature = np.minimum(signature, hashed.min(axis=1))
+        return signature
+
+    @staticmethod
+    def _hashes(tokens: List[str]) -> np.ndarray:
+        # Stable hashes (Python's hash() is salted per process)
+        return np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens),
+                           dtype=np.uint64, count=len(tokens))
+
+    def fingerprint(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        MinHash signatures and set sizes of a text.
+
+        Returns:
+            Dict with text_signature, shingles, number_signature (None below
+            MIN_NUMBERS distinct numbers) and numbers; None if the text has
+            no words
+        """
+        tokens = self.TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            return None
+
+        token_hashes = self._hashes(tokens)
+        size = min(self.shingle_size, len(tokens))
+        count = len(tokens) - size + 1
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            # Polynomial rolling combination; uint64 overflow wraps deterministically
+            shingles = shingles * self.SHINGLE_MULTIPLIER + token_hashes[offset:offset + count]
+        shingles = np.unique(shingles & np.uint64(0xFFFFFFFF))
+
+        numbers = sorted({number.replace(",", "") for number in self.NUMBER_PATTERN.findall(text)})
+        return {
+            "text_signature": self._minhash(shingles),
+            "shingles": int(len(shingles)),
+            "number_signature": self._minhash(self._hashes(numbers)) if len(numbers) >= self.MIN_NUMBERS else None,
+            "numbers": len(numbers)
+        }
+
+    @staticmethod
+    def similarity(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.mean(signature_a == signature_b))
+
+    @staticmethod
+    def _containment(jaccard: float, size: int, other_size: int) -> float:
+        # |A ∩ B| = J / (1 + J) * (|A| + |B|)
+        return min(1.0, jaccard / (1 + jaccard) * (size + other_size) / size) if size else 0.0
+
+    def covered_by(self, fingerprint: Dict[str, Any], other: Dict[str, Any]) -> Optional[float]:
+        """
+        Check whether a source's content occurs in another source.
+
+        Returns:
+            Estimated text containment if both tests pass, else None
+        """
+        text_containment = self._containment(
+            self.similarity(fingerprint["text_signature"], other["text_signature"]),
+            fingerprint["shingles"], other["shingles"]
+        )
+        if text_containment < self.threshold:
+            return None
+        if fingerprint["number_signature"] is not None and other["number_signature"] is not None:
+            numeric_containment = self._containment(
+                self.similarity(fingerprint["number_signature"], other["number_signature"]),
+                fingerprint["numbers"], other["numbers"]
+            )
+            if numeric_containment < self.numeric_threshold:
+                return None
+        return text_containment
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _add(self, key: str, entry: Dict[str, Any]) -> None:
+        self.entries[key] = entry
+        for band_key in self._band_keys(entry["text_signature"]):
+            self._buckets.setdefault(band_key, []).append(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        for band_key in self._band_keys(entry["text_signature"]):
+            self._buckets[band_key].remove(key)
+
+    def _rank(self, entry: Dict[str, Any]) -> Tuple[int, int, str]:
+        file_type = entry["file_type"]
+        preference = (self.format_preference.index(file_type)
+                      if file_type in self.format_preference else len(self.format_preference))
+        return preference, -entry["characters"], entry["key"]
+
+    def deduplicate(self, units: List[Dict[str, Any]]) -> Dict[str, Tuple[str, float]]:
+        """
+        Group a batch of sources with each other and with the index.
+
+        Kept sources of the batch are added to the index; duplicates are not.
+
+        Args:
+            units: Dicts with key (source), text and file_type (extension)
+
+        Returns:
+            Mapping of each duplicate key to (canonical key, estimated containment)
+        """
+        # A source seen again (re-ingested file) replaces its old entry
+        for unit in units:
+            if unit["key"] in self.entries:
+                self._remove(unit["key"])
+
+        fingerprints = {key: dict(entry, key=key) for key, entry in self.entries.items()}
+        batch = set()
+        parent: Dict[str, str] = {}
+
+        def find(key: str) -> str:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for unit in units:
+            fingerprint = self.fingerprint(unit["text"])
+            if fingerprint is None:
+                continue
+            key = unit["key"]
+            fingerprint.update(key=key, file_type=unit["file_type"], characters=len(unit["text"]))
+            fingerprints[key] = fingerprint
+            batch.add(key)
+            parent.setdefault(key, key)
+
+            candidates = set()
+            for band_key in self._band_keys(fingerprint["text_signature"]):
+                candidates.update(self._buckets.get(band_key, ()))
+                # Batch sources become candidates for the rest of the batch
+                self._buckets.setdefault(band_key, []).append(key)
+            for other in candidates:
+                if (self.covered_by(fingerprint, fingerprints[other]) is not None or
+                        self.covered_by(fingerprints[other], fingerprint) is not None):
+                    parent.setdefault(other, other)
+                    parent[find(other)] = find(key)
+
+        # Take the batch back out of the buckets; kept sources are re-added below
+        for key in batch:
+            for band_key in self._band_keys(fingerprints[key]["text_signature"]):
+                self._buckets[band_key].remove(key)
+
+        groups: Dict[str, List[str]] = {}
+        for key in parent:
+            groups.setdefault(find(key), []).append(key)
+
+        duplicates = {}
+        for members in groups.values():
+            new_members = [key for key in members if key in batch]
+            canonical = self._choose_canonical(members, fingerprints)
+            for key in new_members:
+                containment = self.covered_by(fingerprints[key], fingerprints[canonical]) if key != canonical else None
+                if containment is not None:
+                    duplicates[key] = (canonical, containment)
+                else:
+                    entry = dict(fingerprints[key])
+                    del entry["key"]
+                    self._add(key, entry)
+        return duplicates
+
+    def _choose_canonical(self, members: List[str], fingerprints: Dict[str, Dict[str, Any]]) -> str:
+        def covers_all(key: str) -> bool:
+            return all(other == key or self.covered_by(fingerprints[other], fingerprints[key]) is not None
+                       for other in members)
+
+        stored = sorted(key for key in members if key in self.entries and covers_all(key))
+        if stored:
+            return stored[0]
+        covering = [fingerprints[key] for key in members if covers_all(key)]
+        if covering:
+            return min(covering, key=self._rank)["key"]
+        # No member covers the whole group: keep the most complete one
+        return max(members, key=lambda key: (fingerprints[key]["characters"], key))
@@ -0,0 +1,418 @@
+"""
+Enterprise-Grade Office Document Loader Module
+
+Extracts text from .docx and .pptx files by reading their XML parts
+directly from the OOXML zip container, instead of building Unstructured
+element trees. Word documents are streamed paragraph by paragraph and
+split into sections at headings; presentations yield one document per
+slide with its title, tables and speaker notes.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import re
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, Iterator, List, Optional, Tuple, IO
+
+from langchain_core.documents import Document
+from langchain_core.document_loaders import BaseLoader
+
+
+# OOXML namespaces
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+CELL_SEPARATOR = " | "
+
+
+class OfficeLoaderError(Exception):
+    """Custom exception for Office document loading errors"""
+    pass
+
+
+def _open_package(file_path: str, file_obj: Optional[IO[bytes]]) -> zipfile.ZipFile:
+    try:
+        return zipfile.ZipFile(file_obj if file_obj is not None else file_path)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise OfficeLoaderError(f"Failed to open {file_path}: {str(e)}")
+
+
+def _table_lines(table: ET.Element, row_tag: str, cell_tag: str, paragraph_tag: str, text_tag: str) -> List[str]:
+    """Render table rows as cell texts joined by CELL_SEPARATOR, skipping empty cells and rows."""
+    lines = []
+    for row in table.iter(row_tag):
+        cells = []
+        for cell in row.findall(cell_tag):
+            text = " ".join(
+                "".join(t.text or "" for t in paragraph.iter(text_tag)).strip()
+                for paragraph in cell.iter(paragraph_tag)
+            ).strip()
+            if text:
+                cells.append(text)
+        if cells:
+            lines.append(CELL_SEPARATOR.join(cells))
+    return lines
+
+
+class DocxXMLLoader(BaseLoader):
+    """
+    Word (.docx) loader yielding one Document per section.
+
+    word/document.xml is parsed incrementally; each body paragraph or table
+    is released as soon as it has been read. A new section starts at:
+    - a paragraph whose style (or a style it is based on) is a heading,
+      title or has an outline level, or that sets an outline level itself
+    - a short paragraph that is bold throughout
+    - a bold run-in label such as "AMY HOOD, CHIEF FINANCIAL OFFICER:"
+      (speaker turns in transcripts and prepared remarks)
+
+    Tables are rendered row by row with cells joined by " | ".
+
+    Section metadata: section_index, section_title, section_level
+    (0 = top level; bold/speaker headings sit below all styled levels),
+    and speaker for speaker turns.
+    """
+
+    # Can read from a file object instead of a path (see ZipArchiveLoader)
+    accepts_file_obj = True
+
+    # Bump whenever the loader's output changes (invalidates parse cache entries)
+    LOADER_VERSION = 1
+
+    MAX_BOLD_HEADING_CHARS = 120
+    BOLD_HEADING_LEVEL = 9
+    HEADING_STYLE_PATTERN = re.compile(r"^(?:heading\s*(\d)|title|subtitle)$", re.IGNORECASE)
+    SPEAKER_PATTERN = re.compile(r"^([A-Z][A-Z.'\- ]{2,}(?:,[^:]{0,80})?):")
+
+    def __init__(self, file_path: str, file_obj: Optional[IO[bytes]] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            file_path: Path to the .docx file
+            file_obj: Seekable binary stream to read instead of file_path
+        """
+        self.file_path = str(file_path)
+        self.file_obj = file_obj
+        self.stats = {
+            "paragraphs": 0,
+            "tables": 0,
+            "sections": 0
+        }
+
+    def _load_heading_levels(self, package: zipfile.ZipFile) -> Dict[str, int]:
+        """Map style IDs to outline levels, following basedOn inheritance."""
+        try:
+            root = ET.fromstring(package.read("word/styles.xml"))
+        except KeyError:
+            return {}
+
+        own_level: Dict[str, Optional[int]] = {}
+        based_on: Dict[str, str] = {}
+        for style in root.iter(f"{W_NS}style"):
+            style_id = style.get(f"{W_NS}styleId")
+            if not style_id:
+                continue
+            level = None
+            outline = style.find(f"{W_NS}pPr/{W_NS}outlineLvl")
+            if outline is not None:
+                level = int(outline.get(f"{W_NS}val", "9"))
+            name = style.find(f"{W_NS}name")
+            match = self.HEADING_STYLE_PATTERN.match(name.get(f"{W_NS}val", "")) if name is not None else None
+            if match and level is None:
+                level = int(match.group(1)) - 1 if match.group(1) else 0
+            own_level[style_id] = level
+            parent = style.find(f"{W_NS}basedOn")
+            if parent is not None:
+                based_on[style_id] = parent.get(f"{W_NS}val")
+
+        levels = {}
+        for style_id in own_level:
+            seen = set()
+            current = style_id
+            while current is not None and current not in seen:
+                seen.add(current)
+                if own_level.get(current) is not None:
+                    # Outline level 9 means "body text" in Word
+                    if own_level[current] < 9:
+                        levels[style_id] = own_level[current]
+                    break
+                current = based_on.get(current)
+        return levels
+
+    @staticmethod
+    def _paragraph_runs(paragraph: ET.Element) -> List[Tuple[str, bool]]:
+        """Text and boldness of each run, with tabs and breaks as whitespace."""
+        runs = []
+        for run in paragraph.iter(f"{W_NS}r"):
+            parts = []
+            for child in run:
+                if child.tag == f"{W_NS}t":
+                    parts.append(child.text or "")
+                elif child.tag == f"{W_NS}tab":
+                    parts.append("\t")
+                elif child.tag in (f"{W_NS}br", f"{W_NS}cr"):
+                    parts.append("\n")
+                elif child.tag == f"{W_NS}noBreakHyphen":
+                    parts.append("-")
+            text = "".join(parts)
+            if text:
+                bold = run.find(f"{W_NS}rPr/{W_NS}b")
+                is_bold = bold is not None and bold.get(f"{W_NS}val", "true") not in ("0", "false")
+                runs.append((text, is_bold))
+        return runs
+
+    def _heading_level(
+        self,
+        paragraph: ET.Element,
+        runs: List[Tuple[str, bool]],
+        text: str,
+        style_levels: Dict[str, int]
+    ) -> Optional[int]:
+        properties = paragraph.find(f"{W_NS}pPr")
+        if properties is not None:
+            outline = properties.find(f"{W_NS}outlineLvl")
+            if outline is not None and int(outline.get(f"{W_NS}val", "9")) < 9:
+                return int(outline.get(f"{W_NS}val"))
+            style = properties.find(f"{W_NS}pStyle")
+            if style is not None and style.get(f"{W_NS}val") in style_levels:
+                return style_levels[style.get(f"{W_NS}val")]
+        if len(text) <= self.MAX_BOLD_HEADING_CHARS and all(bold for run_text, bold in runs if run_text.strip()):
+            return self.BOLD_HEADING_LEVEL
+        return None
+
+    def _speaker(self, runs: List[Tuple[str, bool]]) -> Optional[str]:
+        """Speaker label from a bold lead-in such as "SATYA NADELLA:"."""
+        lead = ""
+        for run_text, bold in runs:
+            if not bold:
+                break
+            lead += run_text
+        match = self.SPEAKER_PATTERN.match(lead.strip())
+        return match.group(1).strip() if match else None
+
+    def lazy_load(self) -> Iterator[Document]:
+        with _open_package(self.file_path, self.file_obj) as package:
+            style_levels = self._load_heading_levels(package)
+            try:
+                stream = package.open("word/document.xml")
+            except KeyError:
+                raise OfficeLoaderError(f"{self.file_path} has no word/document.xml")
+
+            section: Dict[str, Any] = {"title": "", "level": 0, "speaker": None}
+            lines: List[str] = []
+            has_body = False
+            depth = 0
+            body = None
+
+            with stream:
+                for event, element in ET.iterparse(stream, events=("start", "end")):
+                    if event == "start":
+                        depth += 1
+                        if element.tag == f"{W_NS}body":
+                            body = element
+                        continue
+                    depth -= 1
+                    # Only whole body-level blocks (document > body > block) are processed
+                    if depth != 2 or body is None:
+                        continue
+
+                    if element.tag == f"{W_NS}tbl":
+                        self.stats["tables"] += 1
+                        rows = _table_lines(element, f"{W_NS}tr", f"{W_NS}tc", f"{W_NS}p", f"{W_NS}t")
+                        has_body = has_body or bool(rows)
+                        lines.extend(rows)
+                    else:
+                        paragraphs = [element] if element.tag == f"{W_NS}p" else list(element.iter(f"{W_NS}p"))
+                        for paragraph in paragraphs:
+                            runs = self._paragraph_runs(paragraph)
+                            text = "".join(run_text for run_text, _ in runs).strip()
+                            if not text:
+                                continue
+                            self.stats["paragraphs"] += 1
+
+                            speaker = self._speaker(runs)
+                            level = self._heading_level(paragraph, runs, text, style_levels)
+                            if speaker or (level is not None and has_body):
+                                document = self._build_document(section, lines)
+                                if document is not None:
+                                    yield document
+                                lines = []
+                                has_body = False
+                                section = {
+                                    "title": speaker or text,
+                                    "level": self.BOLD_HEADING_LEVEL if speaker else level,
+                                    "speaker": speaker
+                                }
+                            elif level is not None and not lines:
+                                section = {"title": text, "level": level, "speaker": None}
+                            # Consecutive headings stay together with the text that follows them
+                            has_body = has_body or speaker is not None or level is None
+                            lines.append(text)
+
+                    # Release the block once read
+                    body.remove(element)
+
+            document = self._build_document(section, lines)
+            if document is not None:
+                yield document
+
+    def _build_document(self, section: Dict[str, Any], lines: List[str]) -> Optional[Document]:
+        text = "\n".join(lines).strip()
+        if not text:
+            return None
+        metadata = {
+            "source": self.file_path,
+            "section_index": self.stats["sections"],
+            "section_title": section["title"][:200],
+            "section_level": section["level"]
+        }
+        if section["speaker"]:
+            metadata["speaker"] = section["speaker"]
+        self.stats["sections"] += 1
+        return Document(page_content=text, metadata=metadata)
+
+
+class PptxXMLLoader(BaseLoader):
+    """
+    PowerPoint (.pptx) loader yielding one Document per slide.
+
+    Slides are read in presentation order. Text frames are kept in shape
+    order, tables are rendered row by row with cells joined by " | ", and
+    speaker notes are appended after a "Notes:" line. Hidden slides are
+    skipped.
+
+    Slide metadata: page (slide number), slide_title, has_notes.
+    """
+
+    # Can read from a file object instead of a path (see ZipArchiveLoader)
+    accepts_file_obj = True
+
+    # Bump whenever the loader's output changes (invalidates parse cache entries)
+    LOADER_VERSION = 1
+
+    TITLE_PLACEHOLDERS = {"title", "ctrTitle"}
+
+    def __init__(self, file_path: str, include_notes: bool = True, file_obj: Optional[IO[bytes]] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            file_path: Path to the .pptx file
+            include_notes: Append speaker notes to each slide (default: True)
+            file_obj: Seekable binary stream to read instead of file_path
+        """
+        self.file_path = str(file_path)
+        self.include_notes = include_notes
+        self.file_obj = file_obj
+        self.stats = {
+            "slides": 0,
+            "hidden_slides": 0,
+            "empty_slides": 0
+        }
+
+    @staticmethod
+    def _relationships(package: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+        """Relationship ID -> (type, absolute part name) for a package part."""
+        directory, name = posixpath.split(part)
+        try:
+            root = ET.fromstring(package.read(posixpath.join(directory, "_rels", f"{name}.rels")))
+        except KeyError:
+            return {}
+        return {
+            rel.get("Id"): (rel.get("Type", ""), posixpath.normpath(posixpath.join(directory, rel.get("Target", ""))))
+            for rel in root.iter(f"{REL_NS}Relationship")
+        }
+
+    def _slide_parts(self, package: zipfile.ZipFile) -> List[str]:
+        """Slide part names in presentation order."""
+        try:
+            root = ET.fromstring(package.read("ppt/presentation.xml"))
+        except KeyError:
+            raise OfficeLoaderError(f"{self.file_path} has no ppt/presentation.xml")
+        relationships = self._relationships(package, "ppt/presentation.xml")
+        return [
+            relationships[slide_id.get(f"{R_NS}id")][1]
+            for slide_id in root.iter(f"{P_NS}sldId")
+            if slide_id.get(f"{R_NS}id") in relationships
+        ]
+
+    @staticmethod
+    def _shape_paragraphs(shape: ET.Element) -> List[str]:
+        paragraphs = []
+        for paragraph in shape.iter(f"{A_NS}p"):
+            text = "".join(
+                (node.text or "") if node.tag == f"{A_NS}t" else "\n"
+                for node in paragraph.iter()
+                if node.tag in (f"{A_NS}t", f"{A_NS}br")
+            ).strip()
+            if text:
+                paragraphs.append(text)
+        return paragraphs
+
+    def _slide_text(self, root: ET.Element) -> Tuple[str, List[str]]:
+        """Title and content lines of a slide (or notes slide) tree."""
+        title = ""
+        lines: List[str] = []
+        for element in root.iter():
+            if element.tag == f"{P_NS}sp":
+                placeholder = element.find(f"{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph")
+                paragraphs = self._shape_paragraphs(element)
+                if placeholder is not None and placeholder.get("type") in self.TITLE_PLACEHOLDERS and not title:
+                    title = " ".join(" ".join(paragraphs).split())
+                lines.extend(paragraphs)
+            elif element.tag == f"{A_NS}tbl":
+                lines.extend(_table_lines(element, f"{A_NS}tr", f"{A_NS}tc", f"{A_NS}p", f"{A_NS}t"))
+        return title, lines
+
+    def _notes_text(self, package: zipfile.ZipFile, slide_part: str) -> List[str]:
+        for rel_type, target in self._relationships(package, slide_part).values():
+            if rel_type.endswith("/notesSlide"):
+                try:
+                    root = ET.fromstring(package.read(target))
+                except KeyError:
+                    return []
+                lines = []
+                for shape in root.iter(f"{P_NS}sp"):
+                    placeholder = shape.find(f"{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph")
+                    # Only the notes body; skip slide image, number and header placeholders
+                    if placeholder is not None and placeholder.get("type") == "body":
+                        lines.extend(self._shape_paragraphs(shape))
+                return lines
+        return []
+
+    def lazy_load(self) -> Iterator[Document]:
+        with _open_package(self.file_path, self.file_obj) as package:
+            for slide_number, slide_part in enumerate(self._slide_parts(package), start=1):
+                try:
+                    root = ET.fromstring(package.read(slide_part))
+                except KeyError:
+                    continue
+                if root.get("show") in ("0", "false"):
+                    self.stats["hidden_slides"] += 1
+                    continue
+
+                title, lines = self._slide_text(root)
+                notes = self._notes_text(package, slide_part) if self.include_notes else []
+                if notes:
+                    lines += ["", "Notes:", *notes]
+                text = "\n".join(lines).strip()
+                if not text:
+                    self.stats["empty_slides"] += 1
+                    continue
+
+                self.stats["slides"] += 1
+                yield Document(
+                    page_content=text,
+                    metadata={
+                        "source": self.file_path,
+                        "page": slide_number,
+                        "slide_title": title[:200],
+                        "has_notes": bool(notes)
+                    }
+                )
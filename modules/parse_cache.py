@@ -0,0 +1,293 @@
+"""
+Enterprise-Grade Parsed Document Cache Module
+
+Persists the documents a loader produced for a file, keyed by the file's
+content hash and the loader's version, so re-ingesting unchanged files
+(e.g. re-chunking experiments with a different --chunk-size) skips the
+parsing stage entirely.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+import sys
+import json
+import zlib
+import hashlib
+import itertools
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Type
+
+from langchain_core.documents import Document
+from langchain_core.document_loaders import BaseLoader
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency: fall back to zlib
+    zstandard = None
+
+
+# Directory name used for the parse cache inside a storage path
+DEFAULT_PARSE_CACHE_DIRNAME = "parse_cache"
+
+
+class ParseCacheError(Exception):
+    """Custom exception for parse cache errors"""
+    pass
+
+
+def loader_fingerprint(loader_classes: List[Type[BaseLoader]]) -> str:
+    """
+    Identify the parsing code behind a cache entry.
+
+    Combines each loader's qualified name, its LOADER_VERSION class
+    attribute (bumped whenever its output changes) and the version of the
+    package it comes from, so upgrading e.g. langchain-community also
+    invalidates entries produced by its loaders.
+    """
+    parts = []
+    for loader_class in loader_classes:
+        package = sys.modules.get(loader_class.__module__.split(".")[0])
+        parts.append(
+            f"{loader_class.__module__}.{loader_class.__qualname__}"
+            f":{getattr(loader_class, 'LOADER_VERSION', 0)}"
+            f":{getattr(package, '__version__', '')}"
+        )
+    return ";".join(sorted(parts))
+
+
+class CacheEntryWriter:
+    """
+    Writes one cache entry document by document.
+
+    Each document is serialized and compressed as soon as it is added, so
+    a file's loader output is never held in memory as a whole. The entry
+    becomes visible only on commit(); an aborted or abandoned entry leaves
+    nothing behind.
+    """
+
+    def __init__(self, cache: "ParsedDocumentCache", key: str, file_path: str):
+        self.cache = cache
+        self.file_path = file_path
+        self.entry_path = cache._entry_path(key, cache.codec)
+        self.tmp_path = f"{self.entry_path}.tmp"
+        self.documents = 0
+        self.bytes_written = 0
+        if cache.codec == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=cache.compression_level).compressobj()
+        else:
+            self._compressor = zlib.compressobj(min(cache.compression_level, 9))
+        try:
+            os.makedirs(os.path.dirname(self.entry_path), exist_ok=True)
+            self._file = open(self.tmp_path, "wb")
+        except OSError as e:
+            raise ParseCacheError(f"Failed to write parse cache entry {self.entry_path}: {str(e)}")
+
+    def _write(self, data: bytes) -> None:
+        if data:
+            self._file.write(data)
+            self.bytes_written += len(data)
+
+    def add(self, document: Document) -> None:
+        """Append one document (as the loader yielded it, before enrichment)."""
+        record = {
+            "page_content": document.page_content,
+            "metadata": self.cache._relocate(document.metadata, self.file_path, self.cache.PATH_PLACEHOLDER)
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        try:
+            self._write(self._compressor.compress(line))
+        except OSError as e:
+            self.abort()
+            raise ParseCacheError(f"Failed to write parse cache entry {self.entry_path}: {str(e)}")
+        self.documents += 1
+
+    def commit(self) -> None:
+        """Finish the entry and publish it atomically."""
+        if self._file is None:
+            return
+        try:
+            self._write(self._compressor.flush())
+            self._file.close()
+            self._file = None
+            os.replace(self.tmp_path, self.entry_path)
+        except OSError as e:
+            self.abort()
+            raise ParseCacheError(f"Failed to write parse cache entry {self.entry_path}: {str(e)}")
+
+        self.cache.stats["entries_written"] += 1
+        self.cache.stats["bytes_written"] += self.bytes_written
+
+    def abort(self) -> None:
+        """Discard the entry (no-op once committed)."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class ParsedDocumentCache:
+    """
+    Content-addressed cache of loader output.
+
+    Each entry holds the page_content and metadata of every document a
+    loader yielded for one file, as compressed JSON lines (zstd, or zlib
+    when zstandard is missing). Entries are written and read one document
+    at a time, so caching keeps the per-file memory bound of streaming
+    loaders. Entries are written once and never modified; a changed file
+    or loader simply produces a new key.
+    Metadata values holding the parsed file's path (source, archive_path)
+    are stored relative to it, so a moved or copied file still hits.
+
+    Layout:
+    - <cache_path>/<key[:2]>/<key>.jsonl.zst (or .jsonl.zlib)
+    """
+
+    HASH_BLOCK_SIZE = 1024 * 1024
+    # Compressed bytes read at a time from an entry
+    READ_BLOCK_SIZE = 256 * 1024
+    # Stands in for the parsed file's path inside cached metadata
+    PATH_PLACEHOLDER = "{file}"
+
+    def __init__(self, cache_path: str, compression_level: int = 3):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_path: Directory holding the cache entries
+            compression_level: Compression level for new entries (default: 3)
+        """
+        self.cache_path = cache_path
+        self.compression_level = compression_level
+        self.codec = "zstd" if zstandard is not None else "zlib"
+        os.makedirs(cache_path, exist_ok=True)
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "entries_written": 0,
+            "bytes_written": 0
+        }
+
+    def cache_key(self, file_path: str, fingerprint: str) -> str:
+        """Hash the file's bytes together with the loader fingerprint."""
+        digest = hashlib.sha256(fingerprint.encode("utf-8"))
+        try:
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b""):
+                    digest.update(block)
+        except OSError as e:
+            raise ParseCacheError(f"Failed to hash {file_path}: {str(e)}")
+        return digest.hexdigest()[:32]
+
+    def _entry_path(self, key: str, codec: str) -> str:
+        suffix = "zst" if codec == "zstd" else "zlib"
+        return os.path.join(self.cache_path, key[:2], f"{key}.jsonl.{suffix}")
+
+    def get(self, key: str, file_path: str) -> Optional[Iterator[Document]]:
+        """
+        Get the cached documents for a key.
+
+        The first record is read eagerly, so an unreadable entry counts as
+        a miss; later records are decompressed as the caller iterates.
+
+        Args:
+            key: Cache key from cache_key()
+            file_path: Path of the file being loaded (re-anchors path metadata)
+
+        Returns:
+            Iterator over the documents in loader order, or None on a miss
+            (or unreadable entry)
+        """
+        for codec in ("zstd", "zlib"):
+            entry_path = self._entry_path(key, codec)
+            if not os.path.exists(entry_path) or (codec == "zstd" and zstandard is None):
+                continue
+            documents = self._read_entry(entry_path, codec, file_path)
+            try:
+                first = next(documents)
+            except (StopIteration, ParseCacheError) as e:
+                print(f"⚠️  Ignoring unreadable parse cache entry {entry_path}: {str(e) or 'empty'}")
+                continue
+
+            self.stats["hits"] += 1
+            return itertools.chain([first], documents)
+
+        self.stats["misses"] += 1
+        return None
+
+    def _read_entry(self, entry_path: str, codec: str, file_path: str) -> Iterator[Document]:
+        """Decompress an entry block by block and yield its documents."""
+        decompressor = zstandard.ZstdDecompressor().decompressobj() if codec == "zstd" else zlib.decompressobj()
+        try:
+            with open(entry_path, "rb") as f:
+                pending = b""
+                for block in iter(lambda: f.read(self.READ_BLOCK_SIZE), b""):
+                    *lines, pending = (pending + decompressor.decompress(block)).split(b"\n")
+                    for line in lines:
+                        record = json.loads(line)
+                        yield Document(
+                            page_content=record["page_content"],
+                            metadata=self._relocate(record["metadata"], self.PATH_PLACEHOLDER, file_path)
+                        )
+                if pending:
+                    raise ValueError("truncated entry")
+        except (OSError, ValueError, KeyError, zlib.error, zstandard.ZstdError if zstandard else zlib.error) as e:
+            raise ParseCacheError(f"Corrupt parse cache entry {entry_path}: {str(e)}")
+
+    @staticmethod
+    def _relocate(metadata: Dict[str, Any], old_prefix: str, new_prefix: str) -> Dict[str, Any]:
+        # Only the path itself or paths below it (archive members) are rewritten
+        return {
+            key: new_prefix + value[len(old_prefix):]
+            if isinstance(value, str) and (value == old_prefix or value.startswith(old_prefix + "/")) else value
+            for key, value in metadata.items()
+        }
+
+    def open_entry(self, key: str, file_path: str) -> CacheEntryWriter:
+        """
+        Start writing the entry for a key, one document at a time.
+
+        Args:
+            key: Cache key from cache_key()
+            file_path: Path of the parsed file
+
+        Returns:
+            Writer to add() documents to and commit() (or abort())
+        """
+        return CacheEntryWriter(self, key, file_path)
+
+    def put(self, key: str, documents: Iterable[Document], file_path: str) -> None:
+        """
+        Write the documents for a key atomically.
+
+        Args:
+            key: Cache key from cache_key()
+            documents: Loader output for the file, before any enrichment
+            file_path: Path of the parsed file
+        """
+        writer = self.open_entry(key, file_path)
+        try:
+            for document in documents:
+                writer.add(document)
+            writer.commit()
+        finally:
+            writer.abort()
+
+    def get_cache_info(self) -> Dict[str, Any]:
+        """Get entry count and on-disk size of the cache."""
+        entries = 0
+        size_bytes = 0
+        for root, _, filenames in os.walk(self.cache_path):
+            for filename in filenames:
+                if filename.endswith((".jsonl.zst", ".jsonl.zlib")):
+                    entries += 1
+                    size_bytes += os.path.getsize(os.path.join(root, filename))
+        return {
+            "cache_path": self.cache_path,
+            "entries": entries,
+            "size_mb": size_bytes / (1024 * 1024),
+            "codec": self.codec,
+            **self.stats
+        }
@@ -0,0 +1,293 @@
+"""
+Enterprise-Grade Isolated Parsing Module
+
+Runs document loaders in a separate worker process so one pathological
+file cannot hang or exhaust the ingestion run. Each parse gets a
+wall-clock budget and a resident-memory ceiling; on breach the worker is
+killed, the file is reported, and a fresh worker takes the next file.
+Files that breached a limit are recorded in a quarantine list so later
+runs skip them until they change.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import multiprocessing
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional, Type
+
+from langchain_core.documents import Document
+from langchain_core.document_loaders import BaseLoader
+
+
+class ParseWorkerError(Exception):
+    """Custom exception for isolated parsing errors"""
+    pass
+
+
+class ParseLimitError(ParseWorkerError):
+    """Raised when a parse breaches a limit; the file is quarantined"""
+    pass
+
+
+class ParseTimeoutError(ParseLimitError):
+    """Raised when a parse exceeds its wall-clock budget"""
+    pass
+
+
+class ParseMemoryError(ParseLimitError):
+    """Raised when the worker exceeds its resident memory ceiling"""
+    pass
+
+
+class ParseCrashError(ParseLimitError):
+    """Raised when the worker process dies mid-parse"""
+    pass
+
+
+def _parse_worker(conn) -> None:
+    """
+    Worker process main loop: run loaders and stream their documents back.
+
+    Requests are (request_id, file_path, loader_class) tuples; replies are
+    (request_id, "document", Document) for each document followed by
+    (request_id, "done", loader_stats) or (request_id, "error", message).
+    """
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+
+        request_id, file_path, loader_class = request
+        try:
+            loader = loader_class(file_path)
+            for document in loader.lazy_load():
+                conn.send((request_id, "document", document))
+            conn.send((request_id, "done", getattr(loader, "stats", {})))
+        except Exception as e:
+            conn.send((request_id, "error", f"{type(e).__name__}: {str(e)}"))
+
+
+def _process_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux /proc; None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class IsolatedParser:
+    """
+    Runs loader classes in a reusable worker process with per-file limits.
+
+    Only time spent waiting on the worker counts against the timeout, so a
+    caller that chunks and embeds between documents is not charged for it.
+    Memory is sampled every RSS_POLL_INTERVAL seconds from /proc, so the
+    ceiling is enforced on Linux only.
+    """
+
+    RSS_POLL_INTERVAL = 0.5
+
+    def __init__(self, timeout: float = 300.0, max_rss_mb: Optional[float] = 4096):
+        """
+        Initialize the parser; the worker starts on first use.
+
+        Args:
+            timeout: Wall-clock seconds allowed per file (default: 300)
+            max_rss_mb: Worker resident memory ceiling in MB; None disables (default: 4096)
+        """
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.process = None
+        self._conn = None
+        self._next_request_id = 0
+        # Loader stats (e.g. PDF extraction tier) of the last completed parse
+        self.stats: Dict[str, Any] = {}
+        if max_rss_mb and not sys.platform.startswith("linux"):
+            print("⚠️  Parse worker memory ceiling is only enforced on Linux")
+        atexit.register(self.close)
+
+    def _start(self) -> None:
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_parse_worker, args=(child_conn,), name="parse-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def _kill(self) -> None:
+        if self.process is not None:
+            self.process.kill()
+            self.process.join(5)
+            self._conn.close()
+        self.process = None
+        self._conn = None
+
+    def parse(self, file_path: str, loader_class: Type[BaseLoader]) -> Iterator[Document]:
+        """
+        Yield the documents loader_class produces for file_path, parsed in the worker.
+
+        Args:
+            file_path: Path to the document file
+            loader_class: Loader class, constructed in the worker as loader_class(file_path)
+
+        Yields:
+            Documents in loader order
+
+        Raises:
+            ParseTimeoutError: If the parse exceeds the timeout (worker killed)
+            ParseMemoryError: If the worker exceeds max_rss_mb (worker killed)
+            ParseCrashError: If the worker dies while parsing
+            ParseWorkerError: If the loader raised an exception
+        """
+        if self.process is None or not self.process.is_alive():
+            self._start()
+
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        self._conn.send((request_id, file_path, loader_class))
+        self.stats = {}
+
+        try:
+            yield from self._receive(request_id)
+        except GeneratorExit:
+            # Abandoned mid-file: don't let the next file wait behind this one
+            self._kill()
+            raise
+
+    def _receive(self, request_id: int) -> Iterator[Document]:
+        elapsed = 0.0
+        next_rss_check = 0.0
+        while True:
+            if elapsed >= self.timeout:
+                self._kill()
+                raise ParseTimeoutError(f"Parsing exceeded {self.timeout:.0f}s")
+
+            wait_start = time.monotonic()
+            ready = self._conn.poll(min(self.timeout - elapsed, self.RSS_POLL_INTERVAL))
+            elapsed += time.monotonic() - wait_start
+
+            if self.max_rss_mb and elapsed >= next_rss_check:
+                next_rss_check = elapsed + self.RSS_POLL_INTERVAL
+                rss_mb = _process_rss_mb(self.process.pid)
+                if rss_mb is not None and rss_mb > self.max_rss_mb:
+                    self._kill()
+                    raise ParseMemoryError(f"Parser memory {rss_mb:.0f} MB exceeded {self.max_rss_mb:.0f} MB")
+
+            if not ready:
+                if not self.process.is_alive():
+                    exit_code = self.process.exitcode
+                    self._kill()
+                    raise ParseCrashError(f"Parse worker died (exit code {exit_code})")
+                continue
+
+            try:
+                reply_id, kind, payload = self._conn.recv()
+            except (EOFError, OSError):
+                self.process.join(1)
+                exit_code = self.process.exitcode
+                self._kill()
+                raise ParseCrashError(f"Parse worker died (exit code {exit_code})")
+            if reply_id != request_id:
+                # Stale reply from an earlier request the caller abandoned
+                continue
+
+            if kind == "document":
+                yield payload
+            elif kind == "done":
+                self.stats = payload
+                return
+            else:
+                # Loader failure; the worker itself is healthy and stays up
+                self.stats = {}
+                raise ParseWorkerError(payload)
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        if self.process is not None and self.process.is_alive():
+            try:
+                self._conn.send(None)
+            except OSError:
+                pass
+            self.process.join(5)
+        self._kill()
+
+
+class ParseQuarantine:
+    """
+    Persistent list of files that breached parse limits.
+
+    Entries are keyed by absolute path and remember the file's size and
+    modification time, so a file that has since changed is tried again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the quarantine list (a missing file means an empty list).
+
+        Args:
+            path: JSON file holding the quarantine entries
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                raise ParseWorkerError(f"Failed to read quarantine list {path}: {str(e)}")
+
+    @staticmethod
+    def _fingerprint(file_path: str) -> Dict[str, int]:
+        stat = os.stat(file_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def get_reason(self, file_path: str) -> Optional[str]:
+        """Quarantine reason for an unchanged quarantined file, else None."""
+        entry = self.entries.get(os.path.abspath(file_path))
+        if entry is None:
+            return None
+        try:
+            fingerprint = self._fingerprint(file_path)
+        except OSError:
+            return None
+        if fingerprint["size"] != entry["size"] or fingerprint["mtime_ns"] != entry["mtime_ns"]:
+            return None
+        return entry["reason"]
+
+    def add(self, file_path: str, reason: str) -> None:
+        """Quarantine a file and save the list."""
+        self.entries[os.path.abspath(file_path)] = {
+            **self._fingerprint(file_path),
+            "reason": reason,
+            "quarantined_at": datetime.now().isoformat(timespec="seconds")
+        }
+        self.save()
+
+    def remove(self, file_path: str) -> bool:
+        """Release a file from quarantine; returns whether it was listed."""
+        removed = self.entries.pop(os.path.abspath(file_path), None) is not None
+        if removed:
+            self.save()
+        return removed
+
+    def save(self) -> None:
+        """Write the list atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,194 @@
+"""
+Enterprise-Grade PCA Projection Module
+
+Reduces embedding dimensionality with a PCA projection fitted once on the
+ingested corpus. The projection is saved beside the collection it was
+fitted for, so documents and queries are always projected the same way.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+from typing import Dict, Any
+
+import numpy as np
+
+
+# Projection file name suffix: <storage_path>/<collection_name>_pca.npz
+PCA_FILENAME_SUFFIX = "_pca.npz"
+
+
+class PCAProjectionError(Exception):
+    """Custom exception for PCA projection errors"""
+    pass
+
+
+def pca_projection_path(storage_path: str, collection_name: str) -> str:
+    """Path of the projection file belonging to a collection."""
+    return os.path.join(storage_path, f"{collection_name}{PCA_FILENAME_SUFFIX}")
+
+
+class PCAProjector:
+    """
+    Linear projection of embeddings onto their top principal components.
+
+    Projected vectors are re-normalized (when normalize=True) so cosine
+    similarity keeps working on the reduced vectors.
+    """
+
+    # Rows used to fit the projection; larger corpora are sampled
+    MAX_FIT_SAMPLES = 100000
+
+    def __init__(
+        self,
+        mean: np.ndarray,
+        components: np.ndarray,
+        explained_variance_ratio: np.ndarray,
+        normalize: bool = True
+    ):
+        """
+        Initialize a fitted projection (see fit() and load()).
+
+        Args:
+            mean: Corpus mean, shape (input_dim,)
+            components: Principal axes, shape (output_dim, input_dim)
+            explained_variance_ratio: Variance share of each kept component
+            normalize: Re-normalize projected vectors to unit length
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.explained_variance_ratio = np.asarray(explained_variance_ratio, dtype=np.float32)
+        self.normalize = normalize
+
+    @property
+    def input_dim(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def output_dim(self) -> int:
+        return self.components.shape[0]
+
+    @classmethod
+    def fit(
+        cls,
+        embeddings: np.ndarray,
+        n_components: int,
+        normalize: bool = True,
+        seed: int = 0
+    ) -> "PCAProjector":
+        """
+        Fit a projection on a corpus of embeddings.
+
+        Uses an eigendecomposition of the (input_dim x input_dim) covariance
+        matrix, which is cheap for sentence-embedding widths.
+
+        Args:
+            embeddings: Corpus embeddings, shape (n, input_dim)
+            n_components: Output dimensionality
+            normalize: Re-normalize projected vectors to unit length
+            seed: Seed for sampling corpora larger than MAX_FIT_SAMPLES
+
+        Returns:
+            Fitted PCAProjector
+
+        Raises:
+            PCAProjectionError: If there are too few embeddings or dimensions
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2:
+            raise PCAProjectionError(f"Expected a matrix of embeddings, got shape {embeddings.shape}")
+        if not 0 < n_components <= embeddings.shape[1]:
+            raise PCAProjectionError(
+                f"n_components must be between 1 and {embeddings.shape[1]}, got {n_components}"
+            )
+        if len(embeddings) <= n_components:
+            raise PCAProjectionError(
+                f"Need more than {n_components} embeddings to fit {n_components} components, got {len(embeddings)}"
+            )
+
+        if len(embeddings) > cls.MAX_FIT_SAMPLES:
+            rows = np.random.default_rng(seed).choice(len(embeddings), cls.MAX_FIT_SAMPLES, replace=False)
+            embeddings = embeddings[rows]
+
+        sample = embeddings.astype(np.float64)
+        mean = sample.mean(axis=0)
+        centered = sample - mean
+        covariance = centered.T @ centered / (len(sample) - 1)
+
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:n_components]
+        total_variance = max(float(eigenvalues.sum()), 1e-12)
+
+        return cls(
+            mean=mean,
+            components=eigenvectors[:, order].T,
+            explained_variance_ratio=np.maximum(eigenvalues[order], 0.0) / total_variance,
+            normalize=normalize
+        )
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Project one embedding or a batch of embeddings.
+
+        Returns:
+            float32 array with output_dim columns (1-D for a single vector)
+
+        Raises:
+            PCAProjectionError: If the input width does not match the projection
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        single = embeddings.ndim == 1
+        matrix = embeddings.reshape(1, -1) if single else embeddings
+        if matrix.shape[1] != self.input_dim:
+            raise PCAProjectionError(
+                f"Embedding dimension {matrix.shape[1]} does not match projection input {self.input_dim}"
+            )
+
+        projected = (matrix - self.mean) @ self.components.T
+        if self.normalize:
+            projected /= np.maximum(np.linalg.norm(projected, axis=1, keepdims=True), 1e-12)
+        return projected[0] if single else projected
+
+    def save(self, path: str) -> None:
+        """Write the projection atomically to an .npz file."""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    mean=self.mean,
+                    components=self.components,
+                    explained_variance_ratio=self.explained_variance_ratio,
+                    normalize=np.array(self.normalize)
+                )
+            os.replace(tmp_path, path)
+        except OSError as e:
+            raise PCAProjectionError(f"Failed to save PCA projection to {path}: {str(e)}")
+
+    @classmethod
+    def load(cls, path: str) -> "PCAProjector":
+        """
+        Load a projection saved with save().
+
+        Raises:
+            PCAProjectionError: If the file is missing or malformed
+        """
+        try:
+            with np.load(path) as data:
+                return cls(
+                    mean=data["mean"],
+                    components=data["components"],
+                    explained_variance_ratio=data["explained_variance_ratio"],
+                    normalize=bool(data["normalize"])
+                )
+        except (OSError, KeyError, ValueError) as e:
+            raise PCAProjectionError(f"Failed to load PCA projection from {path}: {str(e)}")
+
+    def get_projection_info(self) -> Dict[str, Any]:
+        """Get information about the projection."""
+        return {
+            "input_dimensions": self.input_dim,
+            "output_dimensions": self.output_dim,
+            "explained_variance": float(self.explained_variance_ratio.sum()),
+            "normalize": self.normalize
+        }
@@ -0,0 +1,481 @@
+"""
+Enterprise-Grade Quantized Vector Index Module
+
+Compact float16 or int8 copies of the collection's vectors for exhaustive
+brute-force candidate scans. Candidates are re-scored exactly with the
+float32 vectors held by ChromaDB, so the compact form only has to get the
+right documents into a small candidate set.
+
+The index is kept in addition to ChromaDB's float32 vectors, which
+ChromaDB cannot drop: total memory and disk grow by the size of the
+compact copy (50% of the float32 vectors for float16, 25% for int8).
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+import json
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
+
+
+# Directory name prefix used for quantized indexes inside a vector storage path
+DEFAULT_QUANTIZED_DIRNAME = "quantized"
+
+SUPPORTED_QUANTIZATION = ("float16", "int8")
+
+
+class QuantizedIndexError(Exception):
+    """Custom exception for quantized index errors"""
+    pass
+
+
+class QuantizedVectorIndex:
+    """
+    Append-only scalar-quantized vector index.
+
+    Quantization modes:
+    - float16: 2 bytes per dimension
+    - int8: 1 byte per dimension with a per-dimension scale and
+      offset. The range is fitted on the first batch and widened whenever a
+      later batch falls outside it; stored rows are then re-encoded for the
+      new range, so values are never clipped
+
+    Storage layout (<index_path>/):
+    - quantization.json: mode, dimension, int8 scale/offset and the
+      generation of the codes file
+    - codes.bin (codes.<generation>.bin after a range change): quantized
+      vectors, appended row by row
+    - norms.bin: float32 norm of each original vector (for cosine scans)
+    - ids.jsonl: one JSON list of IDs per appended batch
+    - deleted.jsonl: one JSON list of deleted IDs per delete call
+    """
+
+    PARAMS_FILENAME = "quantization.json"
+    CODES_FILENAME = "codes.bin"
+    NORMS_FILENAME = "norms.bin"
+    IDS_FILENAME = "ids.jsonl"
+    DELETED_FILENAME = "deleted.jsonl"
+
+    # Rows converted to float32 at a time while scanning (sized to stay in cache)
+    SCAN_BLOCK_ROWS = 1024
+
+    # Headroom added when an int8 range is fitted or widened, so a range
+    # settles after a few batches instead of being re-encoded for each one
+    INT8_RANGE_MARGIN = 0.1
+
+    # Rows allocated up front; capacity then doubles as rows are appended
+    INITIAL_CAPACITY_ROWS = 1024
+
+    def __init__(self, index_path: str, mode: str = "int8"):
+        """
+        Open or create a quantized index.
+
+        Args:
+            index_path: Directory holding the index files
+            mode: "float16" or "int8" (ignored when the index already exists)
+
+        Raises:
+            QuantizedIndexError: If the mode is unsupported or the index is unreadable
+        """
+        self.index_path = index_path
+        os.makedirs(index_path, exist_ok=True)
+
+        self.mode = mode
+        self.dim: Optional[int] = None
+        self.scale: Optional[np.ndarray] = None
+        self.offset: Optional[np.ndarray] = None
+        self.generation = 0
+        self.range_refits = 0
+
+        # Row buffers have spare capacity; only the first _count rows are used
+        self._ids: List[str] = []
+        self._count = 0
+        self._codes: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+        self._live: Optional[np.ndarray] = None
+        self._row_of: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self._load()
+
+        if self.mode not in SUPPORTED_QUANTIZATION:
+            raise QuantizedIndexError(
+                f"Unsupported quantization {self.mode}; use one of {SUPPORTED_QUANTIZATION}"
+            )
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.index_path, filename)
+
+    def _codes_path(self, generation: Optional[int] = None) -> str:
+        generation = self.generation if generation is None else generation
+        if generation == 0:
+            return self._path(self.CODES_FILENAME)
+        stem, extension = os.path.splitext(self.CODES_FILENAME)
+        return self._path(f"{stem}.{generation}{extension}")
+
+    @property
+    def code_dtype(self):
+        return np.float16 if self.mode == "float16" else np.int8
+
+    # ------------------------------------------------------------------ #
+    # Persistence
+    # ------------------------------------------------------------------ #
+
+    def _load(self) -> None:
+        """Load an existing index from disk."""
+        params_path = self._path(self.PARAMS_FILENAME)
+        if not os.path.exists(params_path):
+            return
+
+        try:
+            with open(params_path, "r", encoding="utf-8") as f:
+                params = json.load(f)
+            self.mode = params["mode"]
+            self.dim = params["dim"]
+            self.generation = params.get("generation", 0)
+            if params.get("scale") is not None:
+                self.scale = np.asarray(params["scale"], dtype=np.float32)
+                self.offset = np.asarray(params["offset"], dtype=np.float32)
+
+            ids: List[str] = []
+            if os.path.exists(self._path(self.IDS_FILENAME)):
+                with open(self._path(self.IDS_FILENAME), "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            ids.extend(json.loads(line))
+
+            codes = np.fromfile(self._codes_path(), dtype=self.code_dtype) \
+                if os.path.exists(self._codes_path()) else np.empty(0, dtype=self.code_dtype)
+            norms = np.fromfile(self._path(self.NORMS_FILENAME), dtype=np.float32) \
+                if os.path.exists(self._path(self.NORMS_FILENAME)) else np.empty(0, dtype=np.float32)
+
+            # Trust only rows present in all three files (a torn append leaves extras)
+            rows = min(len(ids), len(codes) // self.dim, len(norms))
+            self._ids = ids[:rows]
+            self._reserve(rows)
+            self._codes[:rows] = codes[:rows * self.dim].reshape(rows, self.dim)
+            self._norms[:rows] = norms[:rows]
+            self._live[:rows] = True
+            self._count = rows
+            self._row_of = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+
+            if os.path.exists(self._path(self.DELETED_FILENAME)):
+                with open(self._path(self.DELETED_FILENAME), "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            self._mark_deleted(json.loads(line))
+
+        except (OSError, ValueError, KeyError) as e:
+            raise QuantizedIndexError(f"Failed to load quantized index at {self.index_path}: {str(e)}")
+
+    def _write_params(self) -> None:
+        params = {
+            "mode": self.mode,
+            "dim": self.dim,
+            "scale": self.scale.tolist() if self.scale is not None else None,
+            "offset": self.offset.tolist() if self.offset is not None else None,
+            "generation": self.generation
+        }
+        tmp_path = self._path(f"{self.PARAMS_FILENAME}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(params, f)
+        os.replace(tmp_path, self._path(self.PARAMS_FILENAME))
+
+    # ------------------------------------------------------------------ #
+    # Quantization
+    # ------------------------------------------------------------------ #
+
+    def _fit(self, vectors: np.ndarray) -> None:
+        """Fix the dimension (and initial int8 scale/offset) from the first batch."""
+        self.dim = vectors.shape[1]
+        if self.mode == "int8":
+            low = vectors.min(axis=0)
+            high = vectors.max(axis=0)
+            margin = (high - low) * self.INT8_RANGE_MARGIN
+            self._set_range(low - margin, high + margin)
+        self._write_params()
+
+    def _set_range(self, low: np.ndarray, high: np.ndarray) -> None:
+        # Codes -127..127 map linearly onto [low, high]
+        self.scale = np.maximum((high - low) / 254.0, 1e-12).astype(np.float32)
+        self.offset = ((high + low) / 2.0).astype(np.float32)
+
+    def _widen_range(self, vectors: np.ndarray) -> None:
+        """
+        Grow the int8 range to cover vectors and re-encode the stored rows.
+
+        Only dimensions that overflow change; their codes are re-derived from
+        the dequantized values, so stored rows keep one rounding step of
+        error per range change instead of being clipped. The re-encoded codes
+        go to a new generation file that the parameters switch to atomically.
+        """
+        low = vectors.min(axis=0)
+        high = vectors.max(axis=0)
+        current_low = self.offset - 127 * self.scale
+        current_high = self.offset + 127 * self.scale
+        below = low < current_low
+        above = high > current_high
+        if not (below.any() or above.any()):
+            return
+
+        margin = (np.maximum(high, current_high) - np.minimum(low, current_low)) * self.INT8_RANGE_MARGIN
+        new_low = np.where(below, low - margin, current_low)
+        new_high = np.where(above, high + margin, current_high)
+
+        values = self.dequantize(self._codes[:self._count])
+        self._set_range(new_low, new_high)
+        codes = np.empty_like(self._codes)
+        codes[:self._count] = self.quantize(values)
+
+        previous_path = self._codes_path()
+        self.generation += 1
+        try:
+            with open(self._codes_path(), "wb") as f:
+                f.write(codes[:self._count].tobytes())
+            self._write_params()
+        except OSError as e:
+            raise QuantizedIndexError(f"Failed to re-encode quantized index: {str(e)}")
+        if os.path.exists(previous_path):
+            os.remove(previous_path)
+
+        # A new array, so scans holding the previous one stay consistent
+        self._codes = codes
+        self.range_refits += 1
+
+    def quantize(self, vectors: np.ndarray) -> np.ndarray:
+        """Convert float32 vectors to the index's compact codes."""
+        if self.mode == "float16":
+            return vectors.astype(np.float16)
+        codes = np.rint((vectors - self.offset) / self.scale)
+        return np.clip(codes, -127, 127).astype(np.int8)
+
+    def dequantize(self, codes: np.ndarray) -> np.ndarray:
+        """Convert compact codes back to approximate float32 vectors."""
+        if self.mode == "float16":
+            return codes.astype(np.float32)
+        return codes.astype(np.float32) * self.scale + self.offset
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+
+    def _reserve(self, rows: int) -> None:
+        """Grow the row buffers (doubling) so they hold at least rows rows."""
+        capacity = len(self._norms) if self._norms is not None else 0
+        if rows <= capacity:
+            return
+        capacity = max(rows, 2 * capacity, self.INITIAL_CAPACITY_ROWS)
+        codes = np.empty((capacity, self.dim), dtype=self.code_dtype)
+        norms = np.empty(capacity, dtype=np.float32)
+        live = np.zeros(capacity, dtype=bool)
+        if self._count:
+            codes[:self._count] = self._codes[:self._count]
+            norms[:self._count] = self._norms[:self._count]
+            live[:self._count] = self._live[:self._count]
+        self._codes, self._norms, self._live = codes, norms, live
+
+    def add(self, chunk_ids: List[str], vectors: np.ndarray) -> None:
+        """
+        Append vectors to the index.
+
+        Args:
+            chunk_ids: Chunk IDs aligned with vectors
+            vectors: float32 matrix of shape (n, dim)
+
+        Raises:
+            QuantizedIndexError: If shapes are inconsistent or the write fails
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(chunk_ids) != len(vectors):
+            raise QuantizedIndexError("chunk_ids and vectors must describe the same number of rows")
+        if not chunk_ids:
+            return
+
+        with self._lock:
+            if self.dim is None:
+                self._fit(vectors)
+            elif vectors.shape[1] != self.dim:
+                raise QuantizedIndexError(f"Vector dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+            elif self.mode == "int8" and self._count:
+                self._widen_range(vectors)
+
+            codes = self.quantize(vectors)
+            norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+
+            try:
+                with open(self._codes_path(), "ab") as f:
+                    f.write(codes.tobytes())
+                with open(self._path(self.NORMS_FILENAME), "ab") as f:
+                    f.write(norms.tobytes())
+                # IDs last: a batch counts as written once its IDs are recorded
+                with open(self._path(self.IDS_FILENAME), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(list(chunk_ids)) + "\n")
+            except OSError as e:
+                raise QuantizedIndexError(f"Failed to append to quantized index: {str(e)}")
+
+            # Re-adding an ID supersedes its previous row
+            self._mark_deleted([chunk_id for chunk_id in chunk_ids if chunk_id in self._row_of])
+
+            start = self._count
+            self._reserve(start + len(chunk_ids))
+            self._codes[start:start + len(chunk_ids)] = codes
+            self._norms[start:start + len(chunk_ids)] = norms
+            self._live[start:start + len(chunk_ids)] = True
+            self._ids.extend(chunk_ids)
+            self._count = start + len(chunk_ids)
+            for i, chunk_id in enumerate(chunk_ids):
+                self._row_of[chunk_id] = start + i
+
+    def _mark_deleted(self, chunk_ids: List[str]) -> int:
+        removed = 0
+        for chunk_id in chunk_ids:
+            row = self._row_of.pop(chunk_id, None)
+            if row is not None:
+                self._live[row] = False
+                removed += 1
+        return removed
+
+    def delete(self, chunk_ids: List[str]) -> int:
+        """
+        Remove IDs from search results.
+
+        Returns:
+            Number of IDs that were present
+        """
+        present = [chunk_id for chunk_id in chunk_ids if chunk_id in self._row_of]
+        if not present:
+            return 0
+
+        with self._lock:
+            try:
+                with open(self._path(self.DELETED_FILENAME), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(present) + "\n")
+            except OSError as e:
+                raise QuantizedIndexError(f"Failed to record deletions: {str(e)}")
+            return self._mark_deleted(present)
+
+    def compact(self) -> Dict[str, Any]:
+        """Rewrite the index files without deleted rows."""
+        with self._lock:
+            if self._codes is None:
+                return {"live_vectors": 0, "removed_vectors": 0}
+
+            keep = np.flatnonzero(self._live[:self._count])
+            removed = self._count - len(keep)
+            ids = [self._ids[row] for row in keep]
+            codes = self._codes[keep]
+            norms = self._norms[keep]
+
+            for path, payload in (
+                (self._codes_path(), codes.tobytes()),
+                (self._path(self.NORMS_FILENAME), norms.tobytes()),
+                (self._path(self.IDS_FILENAME), (json.dumps(ids) + "\n").encode("utf-8") if ids else b"")
+            ):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            if os.path.exists(self._path(self.DELETED_FILENAME)):
+                os.remove(self._path(self.DELETED_FILENAME))
+
+            # Fresh buffers, so scans holding the previous ones stay consistent
+            self._ids = ids
+            self._count = 0
+            self._codes = self._norms = self._live = None
+            self._reserve(len(ids))
+            self._codes[:len(ids)] = codes
+            self._norms[:len(ids)] = norms
+            self._live[:len(ids)] = True
+            self._count = len(ids)
+            self._row_of = {chunk_id: row for row, chunk_id in enumerate(ids)}
+
+        return {"live_vectors": len(ids), "removed_vectors": removed}
+
+    # ------------------------------------------------------------------ #
+    # Search
+    # ------------------------------------------------------------------ #
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        num_candidates: int,
+        distance_metric: str = "cosine"
+    ) -> List[Tuple[str, float]]:
+        """
+        Scan the compact vectors for the best candidates.
+
+        Scores are approximate; callers re-score the candidates exactly.
+
+        Args:
+            query_embedding: Query vector
+            num_candidates: Number of candidates to return
+            distance_metric: "cosine", "ip" or "l2" (ChromaDB's metric names)
+
+        Returns:
+            List of (chunk_id, approximate distance), best first
+        """
+        # Writers append in place and swap buffers on growth, range changes
+        # and compaction; a consistent view of the first rows is enough here
+        with self._lock:
+            if self._codes is None or not self._row_of:
+                return []
+            count = self._count
+            ids = self._ids
+            codes = self._codes[:count]
+            norms = self._norms[:count]
+            live = self._live[:count].copy()
+            scale, offset = self.scale, self.offset
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dim:
+            raise QuantizedIndexError(f"Query dimension {query.shape[0]} does not match index dimension {self.dim}")
+
+        scores = np.empty(count, dtype=np.float32)
+
+        # int8: q . (c * scale + offset) = (q * scale) . c + q . offset
+        if self.mode == "int8":
+            scan_query = query * scale
+            bias = float(query @ offset)
+        else:
+            scan_query, bias = query, 0.0
+
+        for start in range(0, len(codes), self.SCAN_BLOCK_ROWS):
+            block = codes[start:start + self.SCAN_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + len(block)] = block @ scan_query + bias
+
+        if distance_metric == "cosine":
+            distances = 1.0 - scores / np.maximum(norms * float(np.linalg.norm(query)), 1e-12)
+        elif distance_metric == "ip":
+            distances = 1.0 - scores
+        else:  # Squared L2, as ChromaDB reports it
+            distances = norms ** 2 - 2.0 * scores + float(query @ query)
+
+        distances[~live] = np.inf
+        k = min(num_candidates, int(live.sum()))
+        if k <= 0:
+            return []
+        best = np.argpartition(distances, k - 1)[:k]
+        best = best[np.argsort(distances[best])]
+        return [(ids[row], float(distances[row])) for row in best]
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def get_index_info(self) -> Dict[str, Any]:
+        """Get information about the quantized index."""
+        code_bytes = self._count * (self.dim or 0) * np.dtype(self.code_dtype).itemsize
+        float32_bytes = self._count * (self.dim or 0) * 4
+        return {
+            "index_path": self.index_path,
+            "mode": self.mode,
+            "dimensions": self.dim,
+            "live_vectors": len(self._row_of),
+            "stored_vectors": self._count,
+            "range_refits": self.range_refits,
+            # Held in addition to ChromaDB's own float32 vectors
+            "memory_mb": (code_bytes + self._count * 4) / (1024 * 1024),
+            "compression_vs_float32": round(float32_bytes / code_bytes, 2) if code_bytes else 0.0
+        }
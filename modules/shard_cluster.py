@@ -0,0 +1,441 @@
+"""
+Enterprise-Grade Sharded Vector Search Module
+
+Runs N ChromaDB shards in separate processes and exposes them as one
+Collection-like object. Chunks are placed on shards by hashing their ID;
+queries scatter to every shard concurrently and gather with a heap merge of
+the per-shard top-k, with a per-shard timeout so one slow shard cannot stall
+a query.
+
+Author: Enterprise RAG Pipeline
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
+
+from modules.collection_router import PartitionedCollection
+
+
+# Layout file written at the root of a sharded storage path
+SHARD_LAYOUT_FILENAME = "shards.json"
+
+
+class ShardClusterError(Exception):
+    """Custom exception for sharded storage errors"""
+    pass
+
+
+class ShardTimeoutError(ShardClusterError):
+    """Raised when a shard does not answer within its timeout"""
+    pass
+
+
+def _shard_worker(conn, storage_path: str, collection_name: str, metadata: Dict[str, Any]) -> None:
+    """
+    Shard process main loop: own one ChromaDB collection and serve requests.
+
+    Requests are (request_id, method, kwargs) tuples; replies are
+    (request_id, success, payload) tuples.
+    """
+    import chromadb
+    from chromadb.config import Settings
+
+    client = chromadb.PersistentClient(
+        path=storage_path,
+        settings=Settings(anonymized_telemetry=False, allow_reset=False)
+    )
+    collection = client.get_or_create_collection(name=collection_name, metadata=metadata)
+
+    while True:
+        try:
+            request_id, method, kwargs = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        if method == "close":
+            conn.send((request_id, True, None))
+            break
+
+        try:
+            if method == "metadata":
+                payload = collection.metadata
+            else:
+                payload = getattr(collection, method)(**kwargs)
+                if payload is not None and not isinstance(payload, (int, dict)):
+                    payload = dict(payload)
+            conn.send((request_id, True, payload))
+        except Exception as e:
+            conn.send((request_id, False, f"{type(e).__name__}: {str(e)}"))
+
+
+class ShardClient:
+    """
+    Request/response channel to one shard process.
+
+    Requests to the same shard are serialized; a call's timeout counts the
+    wait for the shard's in-flight request as well. Every request carries an
+    ID so a late reply to a timed-out request is recognized and discarded.
+    """
+
+    def __init__(self, shard_id: int, storage_path: str, collection_name: str, metadata: Dict[str, Any]):
+        self.shard_id = shard_id
+        self.storage_path = storage_path
+
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_shard_worker,
+            args=(child_conn, storage_path, collection_name, metadata),
+            name=f"vector-shard-{shard_id}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+        self._lock = threading.Lock()
+        self._next_request_id = 0
+
+    def call(self, method: str, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Invoke a collection method on the shard.
+
+        Args:
+            method: Collection method name (add, query, get, delete, count, metadata)
+            timeout: Seconds to wait for the reply (None waits indefinitely)
+            **kwargs: Method arguments
+
+        Returns:
+            The method's return value
+
+        Raises:
+            ShardTimeoutError: If no reply arrives within the timeout
+            ShardClusterError: If the shard is down or the call failed
+        """
+        # The timeout covers waiting for the shard's earlier requests too
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise ShardTimeoutError(
+                f"Shard {self.shard_id} was busy and did not take {method} within {timeout}s"
+            )
+        try:
+            if not self.process.is_alive():
+                raise ShardClusterError(f"Shard {self.shard_id} is not running")
+
+            request_id = self._next_request_id
+            self._next_request_id += 1
+            self._conn.send((request_id, method, kwargs))
+
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self._conn.poll(remaining):
+                    raise ShardTimeoutError(
+                        f"Shard {self.shard_id} did not answer {method} within {timeout}s"
+                    )
+                reply_id, success, payload = self._conn.recv()
+                if reply_id == request_id:
+                    break
+                # Stale reply from an earlier timed-out request: drop it
+        finally:
+            self._lock.release()
+
+        if not success:
+            raise ShardClusterError(f"Shard {self.shard_id} {method} failed: {payload}")
+        return payload
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Stop the shard process."""
+        if self.process.is_alive():
+            try:
+                self.call("close", timeout=timeout)
+            except ShardClusterError:
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+        self._conn.close()
+
+
+class ShardedCollection:
+    """
+    Collection-like facade over N shard processes.
+
+    Placement: shard = md5(chunk_id) mod N, fixed for the life of the store
+    (recorded in shards.json so readers open the same layout).
+
+    Supports the subset of the ChromaDB Collection API used by
+    EnterpriseVectorStorage: add, query, get, delete, count, name, metadata.
+    """
+
+    def __init__(
+        self,
+        storage_path: str,
+        collection_name: str,
+        num_shards: int,
+        metadata_factory: Callable[[], Dict[str, Any]],
+        shard_timeout: float = 5.0
+    ):
+        """
+        Start the shard processes.
+
+        Args:
+            storage_path: Root directory; shard i lives in <storage_path>/shard_<i>
+            collection_name: Collection name used inside every shard
+            num_shards: Number of shard processes
+            metadata_factory: Returns collection metadata for new shards
+            shard_timeout: Per-shard timeout in seconds for queries
+        """
+        if num_shards < 1:
+            raise ShardClusterError("num_shards must be at least 1")
+
+        self.storage_path = storage_path
+        self.name = collection_name
+        self.num_shards = num_shards
+        self.shard_timeout = shard_timeout
+        self.last_query_stats: Dict[str, Any] = {}
+
+        self._write_layout()
+
+        metadata = metadata_factory()
+        self.shards = [
+            ShardClient(i, os.path.join(storage_path, f"shard_{i}"), collection_name, metadata)
+            for i in range(num_shards)
+        ]
+        self._pool = ThreadPoolExecutor(max_workers=num_shards, thread_name_prefix="shard-io")
+        atexit.register(self.close)
+
+    @staticmethod
+    def read_layout(storage_path: str) -> Optional[Dict[str, Any]]:
+        """Read the shard layout of a storage path, if it is sharded."""
+        layout_path = os.path.join(storage_path, SHARD_LAYOUT_FILENAME)
+        if not os.path.exists(layout_path):
+            return None
+        with open(layout_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_layout(self) -> None:
+        """Record the shard count; refuse to reopen with a different one."""
+        layout = self.read_layout(self.storage_path)
+        if layout is not None:
+            if layout.get("num_shards") != self.num_shards:
+                raise ShardClusterError(
+                    f"Storage at {self.storage_path} has {layout.get('num_shards')} shards; "
+                    f"cannot open it with {self.num_shards}"
+                )
+            return
+
+        os.makedirs(self.storage_path, exist_ok=True)
+        with open(os.path.join(self.storage_path, SHARD_LAYOUT_FILENAME), "w", encoding="utf-8") as f:
+            json.dump({"num_shards": self.num_shards, "placement": "md5(id) mod num_shards"}, f)
+
+    def shard_for(self, chunk_id: str) -> int:
+        """Get the shard index that owns a chunk ID."""
+        digest = hashlib.md5(chunk_id.encode("utf-8")).hexdigest()
+        return int(digest[:8], 16) % self.num_shards
+
+    def _group_by_shard(self, ids: List[str]) -> Dict[int, List[int]]:
+        """Group positions in ids by owning shard."""
+        groups: Dict[int, List[int]] = {}
+        for i, chunk_id in enumerate(ids):
+            groups.setdefault(self.shard_for(chunk_id), []).append(i)
+        return groups
+
+    def _call_many(self, calls: Dict[int, Dict[str, Any]], method: str, timeout: Optional[float]) -> Dict[int, Any]:
+        """Run one call per shard concurrently and wait for all of them."""
+        futures = {
+            shard: self._pool.submit(self.shards[shard].call, method, timeout, **kwargs)
+            for shard, kwargs in calls.items()
+        }
+        return {shard: future.result() for shard, future in futures.items()}
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Collection metadata (read from shard 0)."""
+        return {**(self.shards[0].call("metadata", timeout=None) or {}), "num_shards": self.num_shards}
+
+    def add(self, ids: List[str], embeddings=None, metadatas=None, documents=None, **kwargs) -> None:
+        """Write each record to the shard that owns its ID."""
+        calls = {}
+        for shard, indices in self._group_by_shard(ids).items():
+            params = {"ids": [ids[i] for i in indices], **kwargs}
+            if embeddings is not None:
+                params["embeddings"] = [embeddings[i] for i in indices]
+            if metadatas is not None:
+                params["metadatas"] = [metadatas[i] for i in indices]
+            if documents is not None:
+                params["documents"] = [documents[i] for i in indices]
+            calls[shard] = params
+
+        # Writes are never dropped, so they wait without a timeout
+        self._call_many(calls, "add", timeout=None)
+
+    def query(
+        self,
+        query_embeddings,
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Scatter the query to all shards and gather the global top-k.
+
+        Shards that miss shard_timeout are skipped; the merged result is then
+        partial and last_query_stats lists the shards that timed out.
+        """
+        if len(query_embeddings) != 1:
+            raise ShardClusterError("Sharded search supports one query embedding at a time")
+
+        include = list(include or ["metadatas", "documents", "distances"])
+        params = {
+            "query_embeddings": query_embeddings,
+            "n_results": n_results,
+            "include": include if "distances" in include else include + ["distances"],
+            **kwargs
+        }
+        if where:
+            params["where"] = where
+
+        futures = {
+            shard.shard_id: self._pool.submit(shard.call, "query", self.shard_timeout, **params)
+            for shard in self.shards
+        }
+
+        partial_results = []
+        timed_out = []
+        failed = []
+        for shard_id, future in futures.items():
+            try:
+                partial_results.append(future.result())
+            except ShardTimeoutError:
+                timed_out.append(shard_id)
+            except ShardClusterError:
+                failed.append(shard_id)
+
+        if not partial_results and (timed_out or failed):
+            raise ShardClusterError(f"No shard answered the query (timed out: {timed_out}, failed: {failed})")
+
+        self.last_query_stats = {
+            "shards_queried": self.num_shards,
+            "shards_responded": len(partial_results),
+            "shards_timed_out": timed_out,
+            "shards_failed": failed
+        }
+        if timed_out or failed:
+            print(f"⚠️ Partial results: shards timed out {timed_out}, failed {failed}")
+
+        return PartitionedCollection.merge_query_results(partial_results, n_results, include)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Get records from the owning shards, concatenated in shard order.
+
+        Shards are read concurrently and paging is pushed down: shard sizes
+        (count(), or an ID-only get when ids or where narrow them) place
+        limit/offset exactly, so each shard returns only its part of the
+        page. The first page of a narrowed get skips the size probe and asks
+        every shard for at most limit rows instead.
+        """
+        include = list(include or ["metadatas", "documents"])
+        base = {"include": include, **kwargs}
+        if where:
+            base["where"] = where
+
+        if ids is not None:
+            calls = {
+                shard: {**base, "ids": [ids[i] for i in indices]}
+                for shard, indices in self._group_by_shard(ids).items()
+            }
+        else:
+            calls = {shard: dict(base) for shard in range(self.num_shards)}
+        narrowed = ids is not None or bool(where)
+
+        skip = offset or 0
+        if limit is None and not skip:
+            windows = {shard: {} for shard in calls}
+        elif narrowed and not skip:
+            windows = {shard: {"limit": limit} for shard in calls}
+        else:
+            if narrowed:
+                probes = {shard: {**params, "include": []} for shard, params in calls.items()}
+                sizes = {shard: len(result["ids"]) for shard, result in self._call_many(probes, "get", timeout=None).items()}
+            else:
+                sizes = self._call_many({shard: {} for shard in calls}, "count", timeout=None)
+
+            windows = {}
+            remaining = limit
+            for shard in sorted(calls):
+                if remaining is not None and remaining <= 0:
+                    break
+                if sizes[shard] <= skip:
+                    skip -= sizes[shard]
+                    continue
+                window = {"offset": skip} if skip else {}
+                if remaining is not None:
+                    window["limit"] = remaining
+                    remaining -= min(remaining, sizes[shard] - skip)
+                windows[shard] = window
+                skip = 0
+
+        results = self._call_many(
+            {shard: {**calls[shard], **window} for shard, window in windows.items()}, "get", timeout=None
+        )
+
+        merged: Dict[str, Any] = {"ids": []}
+        for field in ("documents", "metadatas", "embeddings"):
+            merged[field] = [] if field in include else None
+
+        for shard in sorted(results):
+            result = results[shard]
+            merged["ids"].extend(result["ids"])
+            for field in ("documents", "metadatas", "embeddings"):
+                if merged[field] is not None and result.get(field) is not None:
+                    merged[field].extend(list(result[field]))
+
+        if limit is not None:
+            for field, values in merged.items():
+                if values is not None:
+                    merged[field] = values[:limit]
+        return merged
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None, **kwargs) -> None:
+        """Delete records from the owning shards (all shards for a where filter)."""
+        if ids is not None:
+            calls = {
+                shard: {"ids": [ids[i] for i in indices], **kwargs}
+                for shard, indices in self._group_by_shard(ids).items()
+            }
+            if where:
+                for params in calls.values():
+                    params["where"] = where
+        else:
+            calls = {shard: {"where": where, **kwargs} for shard in range(self.num_shards)}
+
+        self._call_many(calls, "delete", timeout=None)
+
+    def count(self) -> int:
+        """Total record count across shards."""
+        counts = self._call_many({shard: {} for shard in range(self.num_shards)}, "count", timeout=None)
+        return sum(counts.values())
+
+    def close(self) -> None:
+        """Stop all shard processes."""
+        for shard in getattr(self, "shards", []):
+            shard.close()
+        self.shards = []
+        if hasattr(self, "_pool"):
+            self._pool.shutdown(wait=False)
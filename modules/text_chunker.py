@@ -11,6 +11,8 @@ from typing import List, Dict, Any, Optional
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from modules.document_store import DocumentTextStore
+
 
 class TextChunkingError(Exception):
     """Custom exception for text chunking errors"""
@@ -31,6 +33,11 @@ class EnterpriseTextChunker:
     - Preserves metadata from original documents
     - Handles various document types intelligently
     - Provides comprehensive chunk validation
+    
+    Parent-document mode (parent_chunk_size set):
+    - Documents are first split into large parent windows
+    - Each parent is split again into small child chunks for embedding
+    - Children carry byte offsets of their parent in a DocumentTextStore
     """
     
     def __init__(
@@ -38,7 +45,9 @@ class EnterpriseTextChunker:
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
         separators: Optional[List[str]] = None,
-        keep_separator: bool = True
+        keep_separator: bool = True,
+        parent_chunk_size: Optional[int] = None,
+        parent_chunk_overlap: int = 0
     ):
         """
         Initialize the text chunker with production-optimized settings.
@@ -48,9 +57,19 @@ class EnterpriseTextChunker:
             chunk_overlap: Characters to overlap between chunks (default: 200) 
             separators: Custom separators list (default: intelligent hierarchy)
             keep_separator: Whether to preserve separators in chunks (default: True)
+            parent_chunk_size: Characters per parent window for small-to-big
+                retrieval (default: None, parent windows disabled)
+            parent_chunk_overlap: Characters to overlap between parent windows (default: 0)
         """
+        if parent_chunk_size is not None and parent_chunk_size <= chunk_size:
+            raise TextChunkingError(
+                f"parent_chunk_size ({parent_chunk_size}) must be larger than chunk_size ({chunk_size})"
+            )
+        
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.parent_chunk_size = parent_chunk_size
+        self.parent_chunk_overlap = parent_chunk_overlap
         
         # Use intelligent separator hierarchy if none provided
         if separators is None:
@@ -77,6 +96,18 @@ class EnterpriseTextChunker:
             length_function=len        # Use character count
         )
         
+        # Parent splitter for small-to-big retrieval (same separator hierarchy)
+        self.parent_splitter = None
+        if parent_chunk_size is not None:
+            self.parent_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=parent_chunk_size,
+                chunk_overlap=parent_chunk_overlap,
+                separators=separators,
+                keep_separator=keep_separator,
+                is_separator_regex=False,
+                length_function=len
+            )
+        
         # Statistics tracking
         self.stats = {
             "total_documents_processed": 0,
@@ -110,18 +141,7 @@ class EnterpriseTextChunker:
                 raise TextChunkingError("Text splitter produced no chunks")
             
             # Enhance metadata with chunk information
-            enhanced_chunks = []
-            for i, chunk in enumerate(chunked_docs):
-                # Add chunk-specific metadata
-                chunk.metadata = {
-                    **chunk.metadata,  # Preserve original metadata
-                    "chunk_id": i,
-                    "chunk_size": len(chunk.page_content),
-                    "chunking_method": "RecursiveCharacterTextSplitter",
-                    "chunk_overlap": self.chunk_overlap,
-                    "max_chunk_size": self.chunk_size
-                }
-                enhanced_chunks.append(chunk)
+            enhanced_chunks = self._enhance_chunks(chunked_docs)
             
             # Update statistics
             self._update_stats(documents, enhanced_chunks)
@@ -131,6 +151,118 @@ class EnterpriseTextChunker:
         except Exception as e:
             raise TextChunkingError(f"Failed to chunk documents: {str(e)}")
     
+    def chunk_documents_with_parents(
+        self,
+        documents: List[Document],
+        text_store: DocumentTextStore
+    ) -> List[Document]:
+        """
+        Split documents into small child chunks that reference larger parent windows.
+        
+        The full text of each document is written to the text store once. Every
+        child chunk records the byte span of its parent window in metadata
+        (parent_doc_key, parent_byte_start, parent_byte_end) so the query
+        pipeline can expand hits to the parent text without re-embedding it.
+        
+        Args:
+            documents: List of LangChain Document objects to chunk
+            text_store: Store that receives the full document text
+            
+        Returns:
+            List of child chunk Documents with parent span metadata
+            
+        Raises:
+            TextChunkingError: If parent mode is disabled or chunking fails
+        """
+        if self.parent_splitter is None:
+            raise TextChunkingError("Parent chunking requires parent_chunk_size to be set")
+        
+        if not documents:
+            raise TextChunkingError("No documents provided for chunking")
+        
+        try:
+            child_chunks = []
+            
+            for document in documents:
+                text = document.page_content
+                if not text or not text.strip():
+                    continue
+                
+                doc_key = text_store.put_document(text)
+                
+                for parent_index, (parent_text, byte_start, byte_end) in enumerate(
+                    self._locate_parents(text)
+                ):
+                    for child_text in self.text_splitter.split_text(parent_text):
+                        child_chunks.append(Document(
+                            page_content=child_text,
+                            metadata={
+                                **document.metadata,
+                                "parent_doc_key": doc_key,
+                                "parent_index": parent_index,
+                                "parent_byte_start": byte_start,
+                                "parent_byte_end": byte_end,
+                                "parent_chunk_size": self.parent_chunk_size
+                            }
+                        ))
+            
+            if not child_chunks:
+                raise TextChunkingError("Text splitter produced no chunks")
+            
+            enhanced_chunks = self._enhance_chunks(child_chunks)
+            self._update_stats(documents, enhanced_chunks)
+            
+            return enhanced_chunks
+            
+        except TextChunkingError:
+            raise
+        except Exception as e:
+            raise TextChunkingError(f"Failed to chunk documents with parents: {str(e)}")
+    
+    def _locate_parents(self, text: str) -> List[tuple]:
+        """
+        Split text into parent windows and locate their UTF-8 byte offsets.
+        
+        Byte offsets are tracked incrementally from the previous parent so
+        only the text between consecutive parents is re-encoded.
+        
+        Returns:
+            List of (parent_text, byte_start, byte_end) tuples
+        """
+        parents = []
+        char_cursor = 0
+        byte_cursor = 0
+        
+        for parent_text in self.parent_splitter.split_text(text):
+            char_start = text.find(parent_text, char_cursor)
+            if char_start == -1:
+                # Splitter normalised the text; anchor at the cursor instead
+                char_start = char_cursor
+            
+            byte_start = byte_cursor + len(text[char_cursor:char_start].encode("utf-8"))
+            byte_end = byte_start + len(parent_text.encode("utf-8"))
+            parents.append((parent_text, byte_start, byte_end))
+            
+            char_cursor = char_start
+            byte_cursor = byte_start
+        
+        return parents
+    
+    def _enhance_chunks(self, chunks: List[Document]) -> List[Document]:
+        """Add chunk-specific metadata to split chunks."""
+        enhanced_chunks = []
+        for i, chunk in enumerate(chunks):
+            chunk.metadata = {
+                **chunk.metadata,  # Preserve original metadata
+                "chunk_id": i,
+                "chunk_size": len(chunk.page_content),
+                "chunking_method": "RecursiveCharacterTextSplitter",
+                "chunk_overlap": self.chunk_overlap,
+                "max_chunk_size": self.chunk_size
+            }
+            enhanced_chunks.append(chunk)
+        return enhanced_chunks
+    
     def chunk_text(self, text: str, metadata: Optional[Dict[str, Any]] = None) -> List[Document]:
         """
         Split raw text into Document chunks.
@@ -240,6 +372,7 @@ class EnterpriseTextChunker:
             "chunking_config": {
                 "chunk_size": self.chunk_size,
                 "chunk_overlap": self.chunk_overlap,
+                "parent_chunk_size": self.parent_chunk_size,
                 "separator_count": len(self.separators)
             }
         }
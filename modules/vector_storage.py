@@ -8,8 +8,14 @@ Author: Enterprise RAG Pipeline
 """
 
 import os
+import re
 import json
+import shutil
+import time
 import uuid
+import queue
+import sqlite3
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import numpy as np
@@ -17,12 +23,76 @@ import chromadb
 from chromadb.config import Settings
 from chromadb.api.models.Collection import Collection
 
+from modules.content_store import CompressedContentStore, DEFAULT_CONTENT_DIRNAME
+from modules.collection_router import PartitionedCollection
+from modules.shard_cluster import ShardedCollection
+from modules.backup_manager import IncrementalBackupManager
+from modules.quantized_index import QuantizedVectorIndex, DEFAULT_QUANTIZED_DIRNAME, SUPPORTED_QUANTIZATION
+
 
 class VectorStorageError(Exception):
     """Custom exception for vector storage errors"""
     pass
 
 
+def maximal_marginal_relevance(
+    query_embedding: np.ndarray,
+    candidate_embeddings: np.ndarray,
+    top_k: int = 5,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """
+    Select a relevant yet diverse subset of candidates with MMR.
+    
+    Scoring is fully vectorized: query relevance and the candidate pairwise
+    similarity matrix are computed once, then each of the k selection steps
+    is a single O(n) pass that updates every candidate's maximum similarity
+    to the already-selected set.
+    
+    Args:
+        query_embedding: Query vector, shape (d,)
+        candidate_embeddings: Candidate vectors, shape (n, d)
+        top_k: Number of candidates to select
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+        
+    Returns:
+        Indices into candidate_embeddings in selection order
+    """
+    candidates = np.asarray(candidate_embeddings, dtype=np.float32)
+    if candidates.ndim != 2 or candidates.shape[0] == 0:
+        return []
+    
+    query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+    
+    # Cosine similarity on unit vectors (guard against zero norms)
+    candidates = candidates / np.maximum(np.linalg.norm(candidates, axis=1, keepdims=True), 1e-12)
+    query = query / max(float(np.linalg.norm(query)), 1e-12)
+    
+    relevance = candidates @ query                     # (n,)
+    pairwise = candidates @ candidates.T               # (n, n), precomputed once
+    
+    n = candidates.shape[0]
+    k = min(top_k, n)
+    selected: List[int] = []
+    max_similarity = np.full(n, -np.inf, dtype=np.float32)
+    available = np.ones(n, dtype=bool)
+    
+    for step in range(k):
+        if step == 0:
+            # Nothing selected yet: pure relevance
+            scores = relevance.copy()
+        else:
+            scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_similarity
+        scores[~available] = -np.inf
+        
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, pairwise[best], out=max_similarity)
+    
+    return selected
+
+
 class EnterpriseVectorStorage:
     """
     Production-grade vector storage using ChromaDB for SMB RAG applications.
@@ -39,14 +109,70 @@ class EnterpriseVectorStorage:
     - Distance metric: cosine (optimal for normalized embeddings)
     - Storage: DuckDB + Parquet (production-ready backend)
     - Persistence: Local file system with configurable path
+    
+    External content mode (external_content=True):
+    - Chunk text lives in a CompressedContentStore beside the database
+    - ChromaDB holds only vectors and slim metadata
+    - Search results are hydrated with one batched content read
+    
+    Partitioned mode (partition_by="fiscal_year"):
+    - One ChromaDB collection per partition value behind a router
+    - Writes touch only the partitions of the documents being added
+    - Searches fan out in parallel to partitions the filter can match
+    
+    Sharded mode (num_shards=N):
+    - N shard processes, each owning a ChromaDB store at <storage_path>/shard_<i>
+    - Chunks are placed by hashing their ID
+    - Searches scatter to all shards and merge the top-k, skipping shards
+      that miss shard_timeout
+    
+    Quantized search (vector_quantization="float16" or "int8"):
+    - A compact copy of every vector is kept in a QuantizedVectorIndex
+      beside the database. ChromaDB still stores its float32 vectors, so
+      the copy adds 50% or 25% to their memory and disk footprint
+    - similarity_search(exhaustive=True) scans every compact vector for
+      rescore_candidates candidates and re-scores them exactly with
+      ChromaDB's float32 vectors, instead of searching the approximate
+      HNSW index
+    - Default and filtered searches use ChromaDB's HNSW index
     """
     
+    # Per-chunk metadata that is constant across a collection; dropped from
+    # ChromaDB records in external content mode to keep metadata slim
+    SLIM_METADATA_EXCLUDED_KEYS = (
+        "embedding_model",
+        "embedding_dimensions",
+        "embedding_normalized",
+        "chunking_method",
+        "chunk_overlap",
+        "max_chunk_size"
+    )
+    
+    # Bounds for adaptive write batching
+    MIN_WRITE_BATCH_SIZE = 16
+    DEFAULT_MAX_WRITE_BATCH_SIZE = 5000
+    
+    # Name prefix of the temporary collection built by compact()
+    REBUILD_PREFIX = "rebuild-"
+    
+    # ChromaDB names each HNSW segment directory by its segment UUID
+    SEGMENT_DIR_PATTERN = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+    
     def __init__(
         self,
         storage_path: str = "./chroma_db",
         collection_name: str = "smb_documents",
         distance_metric: str = "cosine",
-        batch_size: int = 100
+        batch_size: int = 100,
+        external_content: bool = False,
+        partition_by: Optional[str] = None,
+        num_shards: int = 0,
+        shard_timeout: float = 5.0,
+        stats_refresh_interval: float = 30.0,
+        target_write_seconds: float = 0.5,
+        max_write_batch_size: Optional[int] = None,
+        vector_quantization: Optional[str] = None,
+        rescore_candidates: int = 64
     ):
         """
         Initialize the vector storage with production settings.
@@ -56,34 +182,139 @@ class EnterpriseVectorStorage:
             collection_name: Name of the collection to use (default: "smb_documents")
             distance_metric: Distance metric for similarity search (default: "cosine")
             batch_size: Batch size for operations (default: 100)
+            external_content: Keep chunk text in a compressed content store
+                instead of ChromaDB (default: False). Existing collections keep
+                the mode they were created with.
+            partition_by: Metadata key to split the collection on, e.g.
+                "fiscal_year" (default: None). Existing partitioned collections
+                are detected automatically.
+            num_shards: Number of shard processes (default: 0, unsharded).
+                Existing sharded stores are detected automatically.
+            shard_timeout: Per-shard search timeout in seconds (default: 5.0)
+            stats_refresh_interval: Seconds between full recounts of the
+                document count and on-disk size; in between, both are kept
+                up to date incrementally (default: 30.0)
+            target_write_seconds: Wall time per write batch that adaptive
+                batching aims for (default: 0.5)
+            max_write_batch_size: Upper bound for adaptive write batches
+                (default: the ChromaDB client's maximum batch size)
+            vector_quantization: Keep a "float16" or "int8" copy of the
+                vectors for exhaustive searches (default: None). An existing
+                quantized index is detected automatically.
+            rescore_candidates: Candidates taken from the quantized scan and
+                re-scored exactly in float32 (default: 64)
         """
         self.storage_path = storage_path
         self.collection_name = collection_name
         self.distance_metric = distance_metric
         self.batch_size = batch_size
+        self.external_content = external_content
+        self.partition_by = partition_by
+        self.num_shards = num_shards
+        self.shard_timeout = shard_timeout
+        self.stats_refresh_interval = stats_refresh_interval
+        self.target_write_seconds = target_write_seconds
+        self.max_write_batch_size = max_write_batch_size
+        self.vector_quantization = vector_quantization
+        self.rescore_candidates = rescore_candidates
+        self.content_store = None
+        self.quantized_index = None
+        
+        # Cached bookkeeping, recomputed at most every stats_refresh_interval
+        self._cached_count: Optional[int] = None
+        self._cached_size_mb = 0.0
+        self._pending_size_bytes = 0
+        self._stats_refreshed_at = 0.0
+        
+        # Vector width, learned from the first batch added or queried
+        self.embedding_dim: Optional[int] = None
+        
+        # Adaptive write batching starts from batch_size and tunes itself per write
+        self._write_batch_size = batch_size
+        self._stats_lock = threading.Lock()
         
         # Ensure storage directory exists
         os.makedirs(storage_path, exist_ok=True)
         
+        # Sharded stores record their layout; reopen them with the same shard count
+        shard_layout = ShardedCollection.read_layout(storage_path)
+        if shard_layout is not None and not self.num_shards:
+            self.num_shards = shard_layout["num_shards"]
+        
+        if vector_quantization is not None and vector_quantization not in SUPPORTED_QUANTIZATION:
+            raise VectorStorageError(
+                f"Unsupported vector_quantization {vector_quantization}; use one of {SUPPORTED_QUANTIZATION}"
+            )
+        if self.num_shards and self.partition_by:
+            raise VectorStorageError("Sharded storage cannot be combined with partition_by")
+        if self.num_shards and shard_layout is None and os.path.exists(os.path.join(storage_path, "chroma.sqlite3")):
+            raise VectorStorageError(
+                f"{storage_path} already holds an unsharded database; use a new storage path for sharded storage"
+            )
+        
         try:
-            # Initialize ChromaDB client with persistent storage
-            print(f"Initializing ChromaDB at: {storage_path}")
-            self.client = chromadb.PersistentClient(
-                path=storage_path,
-                settings=Settings(
-                    anonymized_telemetry=False,  # Disable telemetry for production
-                    allow_reset=False  # Prevent accidental data loss
+            if self.num_shards:
+                # Shard processes own their ChromaDB clients
+                print(f"Starting {self.num_shards} ChromaDB shards at: {storage_path}")
+                self.client = None
+                self.collection = ShardedCollection(
+                    storage_path=storage_path,
+                    collection_name=collection_name,
+                    num_shards=self.num_shards,
+                    metadata_factory=self._collection_metadata,
+                    shard_timeout=shard_timeout
+                )
+            else:
+                # Initialize ChromaDB client with persistent storage
+                print(f"Initializing ChromaDB at: {storage_path}")
+                self.client = chromadb.PersistentClient(
+                    path=storage_path,
+                    settings=Settings(
+                        anonymized_telemetry=False,  # Disable telemetry for production
+                        allow_reset=False  # Prevent accidental data loss
+                    )
+                )
+                
+                # Get or create collection with optimized settings
+                self.collection = self._get_or_create_collection()
+            
+            # Adaptive write batches never exceed what one ChromaDB call accepts
+            if self.max_write_batch_size is None:
+                self.max_write_batch_size = (
+                    self.client.get_max_batch_size() if hasattr(self.client, "get_max_batch_size")
+                    else self.DEFAULT_MAX_WRITE_BATCH_SIZE
+                )
+            
+            # The collection records where its text lives; honour that over the argument
+            collection_metadata = self.collection.metadata or {}
+            if collection_metadata.get("content_storage") == "external":
+                self.external_content = True
+            
+            if self.external_content:
+                self.content_store = CompressedContentStore(
+                    os.path.join(storage_path, DEFAULT_CONTENT_DIRNAME)
                 )
-            )
             
-            # Get or create collection with optimized settings
-            self.collection = self._get_or_create_collection()
+            # A quantized index on disk is kept in sync even if not requested
+            quantized_path = os.path.join(storage_path, f"{DEFAULT_QUANTIZED_DIRNAME}_{collection_name}")
+            if self.vector_quantization or os.path.isdir(quantized_path):
+                self.quantized_index = QuantizedVectorIndex(quantized_path, mode=self.vector_quantization or "int8")
+                self.vector_quantization = self.quantized_index.mode
+                if len(self.quantized_index) == 0 and self.collection.count() > 0:
+                    self._build_quantized_index()
             
             print(f"✅ Vector storage initialized successfully")
             print(f"   Collection: {self.collection_name}")
             print(f"   Storage path: {storage_path}")
             print(f"   Distance metric: {distance_metric}")
-            print(f"   Document count: {self.collection.count()}")
+            print(f"   Content storage: {'external' if self.external_content else 'chromadb'}")
+            if self.partition_by:
+                print(f"   Partitioned by: {self.partition_by} ({len(self.collection.partitions())} partitions)")
+            if self.num_shards:
+                print(f"   Shards: {self.num_shards} (timeout {shard_timeout}s)")
+            if self.quantized_index is not None:
+                print(f"   Vector quantization: {self.vector_quantization} ({self.rescore_candidates} candidates re-scored)")
+            print(f"   Document count: {self._document_count()}")
             
         except Exception as e:
             raise VectorStorageError(f"Failed to initialize vector storage: {str(e)}")
@@ -100,27 +331,83 @@ class EnterpriseVectorStorage:
         # Update initial stats
         self._update_stats()
     
-    def _get_or_create_collection(self) -> Collection:
+    def _collection_metadata(self) -> Dict[str, Any]:
+        """Metadata for newly created collections (production HNSW settings)."""
+        return {
+            "hnsw:space": self.distance_metric,  # Cosine distance for normalized embeddings
+            "hnsw:batch_size": self.batch_size,  # Batch size for indexing
+            "hnsw:sync_threshold": 1000,  # Sync threshold for performance
+            "description": "Enterprise SMB document embeddings",
+            "created_at": datetime.now().isoformat(),
+            "version": "1.0",
+            "content_storage": "external" if self.external_content else "chromadb"
+        }
+    
+    def _recover_interrupted_rebuilds(self) -> None:
+        """
+        Finish compactions that died between dropping and renaming.
+
+        Covers the base collection and every partition (<name>__<key>_<value>).
+        A rebuild copy whose original still exists was interrupted before the
+        swap; it is incomplete and is dropped.
+        """
+        names = set(PartitionedCollection._collection_names(self.client))
+        for rebuild_name in sorted(names):
+            if not rebuild_name.startswith(self.REBUILD_PREFIX):
+                continue
+            name = rebuild_name[len(self.REBUILD_PREFIX):]
+            if name != self.collection_name and not name.startswith(f"{self.collection_name}__"):
+                continue
+            
+            if name in names:
+                self.client.delete_collection(name=rebuild_name)
+                continue
+            self.client.get_collection(name=rebuild_name).modify(name=name)
+            print(f"   Recovered compacted collection: {name}")
+    
+    def _get_or_create_collection(self):
         """Get existing collection or create new one with optimized settings."""
+        # A compaction interrupted after dropping an original leaves only the finished copy
+        self._recover_interrupted_rebuilds()
+        
         try:
             # Try to get existing collection
             collection = self.client.get_collection(name=self.collection_name)
+            
+            if self.partition_by:
+                raise VectorStorageError(
+                    f"Collection {self.collection_name} already exists unpartitioned; "
+                    f"ingest into a new collection name to partition by {self.partition_by}"
+                )
             print(f"   Using existing collection: {self.collection_name}")
+            return collection
             
+        except VectorStorageError:
+            raise
         except Exception:
-            # Create new collection with production settings
-            collection = self.client.create_collection(
-                name=self.collection_name,
-                metadata={
-                    "hnsw:space": self.distance_metric,  # Cosine distance for normalized embeddings
-                    "hnsw:batch_size": self.batch_size,  # Batch size for indexing
-                    "hnsw:sync_threshold": 1000,  # Sync threshold for performance
-                    "description": "Enterprise SMB document embeddings",
-                    "created_at": datetime.now().isoformat(),
-                    "version": "1.0"
-                }
+            pass
+        
+        # Partitioned collections have no base collection, only <name>__<key>_<value>
+        partition_key = self.partition_by or PartitionedCollection.discover_partition_key(
+            self.client, self.collection_name
+        )
+        if partition_key:
+            self.partition_by = partition_key
+            collection = PartitionedCollection(
+                client=self.client,
+                base_name=self.collection_name,
+                partition_key=partition_key,
+                metadata_factory=self._collection_metadata
             )
-            print(f"   Created new collection: {self.collection_name}")
+            print(f"   Using partitioned collection: {self.collection_name} (by {partition_key})")
+            return collection
+        
+        # Create new collection with production settings
+        collection = self.client.create_collection(
+            name=self.collection_name,
+            metadata=self._collection_metadata()
+        )
+        print(f"   Created new collection: {self.collection_name}")
         
         return collection
     
@@ -132,9 +419,14 @@ class EnterpriseVectorStorage:
         """
         Add embedded documents to the vector storage.
         
+        Without an explicit batch_size, write batches are sized adaptively:
+        each write is timed and the next batch is scaled toward
+        target_write_seconds, so per-transaction overhead is amortized
+        without single writes growing unbounded.
+        
         Args:
             embedded_docs: List of documents with embeddings from EmbeddingGenerator
-            batch_size: Override default batch size for this operation
+            batch_size: Fixed batch size for this operation (disables adaptive sizing)
             
         Returns:
             Dictionary with operation results and statistics
@@ -145,23 +437,26 @@ class EnterpriseVectorStorage:
         if not embedded_docs:
             raise VectorStorageError("No documents provided for storage")
         
-        batch_size = batch_size or self.batch_size
+        adaptive = batch_size is None
         
         try:
             total_docs = len(embedded_docs)
             added_count = 0
+            added_bytes = 0
+            batch_count = 0
+            next_report = 0.1
             
             print(f"Adding {total_docs} documents to vector storage...")
             
             # Process documents in batches for performance
-            for i in range(0, total_docs, batch_size):
-                batch = embedded_docs[i:i + batch_size]
-                batch_end = min(i + batch_size, total_docs)
+            i = 0
+            while i < total_docs:
+                size = self._write_batch_size if adaptive else batch_size
+                batch = embedded_docs[i:i + size]
                 
                 # Prepare batch data
                 ids = []
                 documents = []
-                embeddings = []
                 metadatas = []
                 
                 for doc in batch:
@@ -170,34 +465,69 @@ class EnterpriseVectorStorage:
                     ids.append(doc_id)
                     
                     documents.append(doc['content'])
-                    embeddings.append(doc['embedding'])  # Use list form for ChromaDB
                     
                     # Prepare metadata (ChromaDB has some restrictions)
                     metadata = self._prepare_metadata(doc['metadata'])
                     metadatas.append(metadata)
                 
+                # One contiguous float32 matrix per batch, validated once
+                embeddings = self._as_embedding_matrix([doc['embedding'] for doc in batch])
+                
                 # Add batch to collection
-                self.collection.add(
-                    ids=ids,
-                    documents=documents,
-                    embeddings=embeddings,
-                    metadatas=metadatas
-                )
+                write_start = time.perf_counter()
+                if self.content_store is not None:
+                    # Text goes to the content store first so every indexed ID can be hydrated
+                    self.content_store.put_many(ids, documents)
+                    self.collection.add(
+                        ids=ids,
+                        embeddings=embeddings,
+                        metadatas=metadatas
+                    )
+                else:
+                    self.collection.add(
+                        ids=ids,
+                        documents=documents,
+                        embeddings=embeddings,
+                        metadatas=metadatas
+                    )
+                if self.quantized_index is not None:
+                    self.quantized_index.add(ids, embeddings)
+                write_time = time.perf_counter() - write_start
+                
+                if adaptive and len(batch) == size:  # A short final batch says little about throughput
+                    self._write_batch_size = self._next_write_batch_size(len(batch), write_time)
                 
+                i += len(batch)
+                batch_count += 1
                 added_count += len(batch)
-                print(f"   Processed batch {i//batch_size + 1}: {added_count}/{total_docs} documents")
+                # Approximate on-disk growth until the next full size refresh: ChromaDB
+                # keeps vectors in SQLite and HNSW, and text in the table and its FTS index
+                added_bytes += 2 * sum(len(text.encode("utf-8")) for text in documents)
+                added_bytes += 2 * embeddings.nbytes
+                
+                # Report progress every 10% rather than every batch
+                if added_count >= next_report * total_docs or added_count == total_docs:
+                    print(f"   Processed {added_count}/{total_docs} documents "
+                          f"({batch_count} batches, last {len(batch)} in {write_time:.2f}s)")
+                    while next_report * total_docs <= added_count:
+                        next_report += 0.1
             
             # Update statistics
-            self.stats["total_documents_stored"] += added_count
-            self.stats["total_batch_operations"] += 1
-            self.stats["last_updated"] = datetime.now().isoformat()
+            with self._stats_lock:
+                if self._cached_count is not None:
+                    self._cached_count += added_count
+                self._pending_size_bytes += added_bytes
+                self.stats["total_documents_stored"] += added_count
+                self.stats["total_batch_operations"] += 1
+                self.stats["last_updated"] = datetime.now().isoformat()
             self._update_stats()
             
             result = {
                 "success": True,
                 "documents_added": added_count,
-                "total_documents": self.collection.count(),
-                "batch_count": (total_docs + batch_size - 1) // batch_size,
+                "total_documents": self._document_count(),
+                "batch_count": batch_count,
+                "next_batch_size": self._write_batch_size if adaptive else batch_size,
                 "processing_time": "calculated_elsewhere"
             }
             
@@ -207,12 +537,60 @@ class EnterpriseVectorStorage:
         except Exception as e:
             raise VectorStorageError(f"Failed to add documents to vector storage: {str(e)}")
     
+    def _next_write_batch_size(self, size: int, write_time: float) -> int:
+        """
+        Scale the next write batch toward target_write_seconds.
+        
+        Growth and shrinkage are limited to 2x per batch so one slow write
+        (e.g. an HNSW sync) does not collapse the batch size.
+        """
+        factor = self.target_write_seconds / write_time if write_time > 0 else 2.0
+        factor = min(2.0, max(0.5, factor))
+        return int(min(self.max_write_batch_size, max(self.MIN_WRITE_BATCH_SIZE, size * factor)))
+    
+    def _as_embedding_matrix(self, embeddings) -> np.ndarray:
+        """
+        Convert one vector or a batch of vectors to a contiguous float32 matrix.
+        
+        Validation (numeric, 2-D, finite, consistent width) runs once on the
+        whole batch, and the matrix is handed to ChromaDB as-is instead of
+        as nested Python lists of boxed floats.
+        
+        Args:
+            embeddings: 1-D vector, 2-D array, or sequence of equal-length vectors
+            
+        Returns:
+            Array of shape (n, embedding_dim) and dtype float32
+            
+        Raises:
+            VectorStorageError: If the vectors are malformed
+        """
+        try:
+            matrix = np.asarray(embeddings, dtype=np.float32)
+        except (TypeError, ValueError) as e:
+            raise VectorStorageError(f"Embeddings must be equal-length numeric vectors: {str(e)}")
+        
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.ndim != 2 or matrix.shape[1] == 0:
+            raise VectorStorageError(f"Expected a batch of vectors, got shape {matrix.shape}")
+        if self.embedding_dim is not None and matrix.shape[1] != self.embedding_dim:
+            raise VectorStorageError(
+                f"Embedding dimension {matrix.shape[1]} does not match collection dimension {self.embedding_dim}"
+            )
+        if not np.isfinite(matrix).all():
+            raise VectorStorageError("Embeddings contain NaN or infinite values")
+        
+        self.embedding_dim = matrix.shape[1]
+        return np.ascontiguousarray(matrix)
+    
     def similarity_search(
         self,
         query_embedding: np.ndarray,
         top_k: int = 5,
         metadata_filter: Optional[Dict[str, Any]] = None,
-        include_distances: bool = True
+        include_distances: bool = True,
+        exhaustive: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Perform similarity search against stored embeddings.
@@ -222,6 +600,10 @@ class EnterpriseVectorStorage:
             top_k: Number of most similar documents to return
             metadata_filter: Optional metadata filter for pre-filtering
             include_distances: Whether to include similarity distances
+            exhaustive: Scan every vector through the quantized index and
+                re-score its candidates in float32 instead of searching the
+                HNSW index (default: False). Needs vector_quantization and
+                no metadata_filter.
             
         Returns:
             List of most similar documents with metadata and optional distances
@@ -232,12 +614,28 @@ class EnterpriseVectorStorage:
         if query_embedding is None or query_embedding.size == 0:
             raise VectorStorageError("Invalid query embedding provided")
         
+        if exhaustive and (self.quantized_index is None or metadata_filter):
+            raise VectorStorageError(
+                "Exhaustive search needs a quantized index and no metadata filter"
+            )
+        
         try:
+            if exhaustive:
+                results = self._quantized_query(self._as_embedding_matrix(query_embedding)[0], top_k)
+                self.stats["total_queries_performed"] += 1
+                formatted_results = self._format_query_results(results, include_distances)
+                print(f"✅ Similarity search completed: {len(formatted_results)} results found")
+                return formatted_results
+            
             # Prepare query parameters
+            include = ["metadatas", "distances"] if include_distances else ["metadatas"]
+            if self.content_store is None:
+                include.append("documents")
+            
             query_params = {
-                "query_embeddings": [query_embedding.tolist()],
+                "query_embeddings": self._as_embedding_matrix(query_embedding),
                 "n_results": top_k,
-                "include": ["documents", "metadatas", "distances"] if include_distances else ["documents", "metadatas"]
+                "include": include
             }
             
             # Add metadata filter if provided
@@ -251,25 +649,7 @@ class EnterpriseVectorStorage:
             self.stats["total_queries_performed"] += 1
             
             # Format results for consistency
-            formatted_results = []
-            
-            if results["ids"] and results["ids"][0]:  # Check if we have results
-                for i in range(len(results["ids"][0])):
-                    result_doc = {
-                        "id": results["ids"][0][i],
-                        "content": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i],
-                    }
-                    
-                    if include_distances and "distances" in results:
-                        # Convert ChromaDB distance to similarity score
-                        # For cosine distance: similarity = 1 - distance
-                        distance = results["distances"][0][i]
-                        similarity = 1 - distance if self.distance_metric == "cosine" else distance
-                        result_doc["similarity"] = float(similarity)
-                        result_doc["distance"] = float(distance)
-                    
-                    formatted_results.append(result_doc)
+            formatted_results = self._format_query_results(results, include_distances)
             
             print(f"✅ Similarity search completed: {len(formatted_results)} results found")
             return formatted_results
@@ -277,6 +657,188 @@ class EnterpriseVectorStorage:
         except Exception as e:
             raise VectorStorageError(f"Similarity search failed: {str(e)}")
     
+    def _quantized_query(self, query: np.ndarray, top_k: int) -> Dict[str, Any]:
+        """
+        Search the quantized index and re-score its candidates exactly.
+        
+        The compact scan only has to place the true top_k among
+        rescore_candidates candidates; their float32 vectors are then read
+        from ChromaDB and ranked with the collection's distance metric.
+        
+        Returns:
+            Results shaped like a single-query collection.query() response
+        """
+        candidates = self.quantized_index.search(
+            query,
+            num_candidates=max(top_k, self.rescore_candidates),
+            distance_metric=self.distance_metric
+        )
+        if not candidates:
+            return {"ids": [[]], "metadatas": [[]], "documents": [[]], "distances": [[]]}
+        
+        include = ["embeddings", "metadatas"]
+        if self.content_store is None:
+            include.append("documents")
+        records = self.collection.get(ids=[chunk_id for chunk_id, _ in candidates], include=include)
+        if not records["ids"]:
+            return {"ids": [[]], "metadatas": [[]], "documents": [[]], "distances": [[]]}
+        
+        vectors = np.asarray(records["embeddings"], dtype=np.float32)
+        scores = vectors @ query
+        if self.distance_metric == "cosine":
+            norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+            distances = 1.0 - scores / np.maximum(norms, 1e-12)
+        elif self.distance_metric == "ip":
+            distances = 1.0 - scores
+        else:  # Squared L2, as ChromaDB reports it
+            distances = np.sum((vectors - query) ** 2, axis=1)
+        
+        order = np.argsort(distances, kind="stable")[:top_k]
+        return {
+            "ids": [[records["ids"][i] for i in order]],
+            "metadatas": [[records["metadatas"][i] for i in order]],
+            "documents": [[records["documents"][i] for i in order]] if self.content_store is None else None,
+            "distances": [[float(distances[i]) for i in order]]
+        }
+    
+    def _build_quantized_index(self, batch_size: Optional[int] = None) -> int:
+        """Quantize every vector already in the collection; returns the count."""
+        batch_size = batch_size or self.max_write_batch_size or self.DEFAULT_MAX_WRITE_BATCH_SIZE
+        print(f"🗜️ Building {self.quantized_index.mode} index for {self.collection_name}...")
+        indexed = 0
+        while True:
+            page = self.collection.get(limit=batch_size, offset=indexed, include=["embeddings"])
+            if not page["ids"]:
+                break
+            self.quantized_index.add(page["ids"], np.asarray(page["embeddings"], dtype=np.float32))
+            indexed += len(page["ids"])
+        print(f"   Quantized {indexed} vectors")
+        return indexed
+    
+    def _format_query_results(
+        self,
+        results: Dict[str, Any],
+        include_distances: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert a ChromaDB query response into result dictionaries.
+        
+        Args:
+            results: Raw response from collection.query() for a single query
+            include_distances: Whether to attach similarity and distance scores
+            
+        Returns:
+            List of result documents with content, metadata and optional scores
+        """
+        formatted_results = []
+        
+        if not results["ids"] or not results["ids"][0]:  # Check if we have results
+            return formatted_results
+        
+        ids = results["ids"][0]
+        
+        if self.content_store is not None:
+            # Hydrate all hits with one batched read from the content store
+            contents = self.content_store.get_many(ids)
+        else:
+            contents = results["documents"][0]
+        
+        for i in range(len(ids)):
+            result_doc = {
+                "id": ids[i],
+                "content": contents[i] if contents[i] is not None else "",
+                "metadata": results["metadatas"][0][i],
+            }
+            
+            if include_distances and results.get("distances"):
+                # Convert ChromaDB distance to similarity score
+                # For cosine distance: similarity = 1 - distance
+                distance = results["distances"][0][i]
+                similarity = 1 - distance if self.distance_metric == "cosine" else distance
+                result_doc["similarity"] = float(similarity)
+                result_doc["distance"] = float(distance)
+            
+            formatted_results.append(result_doc)
+        
+        return formatted_results
+    
+    def mmr_search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform similarity search diversified with Maximal Marginal Relevance.
+        
+        Over-fetches fetch_k candidates together with their embeddings, then
+        selects top_k of them with maximal_marginal_relevance() so near-duplicate
+        chunks (e.g. repeated 10-Q boilerplate) do not crowd out other content.
+        
+        Args:
+            query_embedding: Query embedding vector
+            top_k: Number of documents to return
+            fetch_k: Number of candidates to fetch before diversification
+            lambda_mult: Relevance/diversity trade-off (1.0 = plain top-k)
+            metadata_filter: Optional metadata filter for pre-filtering
+            
+        Returns:
+            List of selected documents with metadata and distances, in MMR order
+            
+        Raises:
+            VectorStorageError: If the search fails
+        """
+        if query_embedding is None or query_embedding.size == 0:
+            raise VectorStorageError("Invalid query embedding provided")
+        
+        if not 0.0 <= lambda_mult <= 1.0:
+            raise VectorStorageError(f"lambda_mult must be between 0 and 1, got {lambda_mult}")
+        
+        try:
+            include = ["metadatas", "distances", "embeddings"]
+            if self.content_store is None:
+                include.append("documents")
+            
+            query_params = {
+                "query_embeddings": self._as_embedding_matrix(query_embedding),
+                "n_results": max(fetch_k, top_k),
+                "include": include
+            }
+            
+            if metadata_filter:
+                query_params["where"] = metadata_filter
+            
+            results = self.collection.query(**query_params)
+            self.stats["total_queries_performed"] += 1
+            
+            if not results["ids"] or not results["ids"][0]:
+                return []
+            
+            selected = maximal_marginal_relevance(
+                query_embedding,
+                np.asarray(results["embeddings"][0]),
+                top_k=top_k,
+                lambda_mult=lambda_mult
+            )
+            
+            # Keep only the selected candidates, in selection order
+            selected_results = {
+                key: [[values[0][i] for i in selected]]
+                for key, values in results.items()
+                if key in ("ids", "documents", "metadatas", "distances") and values is not None
+            }
+            formatted_results = self._format_query_results(selected_results, include_distances=True)
+            
+            print(f"✅ MMR search completed: {len(formatted_results)} of {len(results['ids'][0])} candidates selected")
+            return formatted_results
+            
+        except VectorStorageError:
+            raise
+        except Exception as e:
+            raise VectorStorageError(f"MMR search failed: {str(e)}")
+    
     def search_by_text(
         self,
         query_text: str,
@@ -315,15 +877,21 @@ class EnterpriseVectorStorage:
             Document data if found, None otherwise
         """
         try:
+            include = ["metadatas"] if self.content_store is not None else ["documents", "metadatas"]
             results = self.collection.get(
                 ids=[doc_id],
-                include=["documents", "metadatas"]
+                include=include
             )
             
             if results["ids"] and len(results["ids"]) > 0:
+                if self.content_store is not None:
+                    content = self.content_store.get_many([doc_id])[0] or ""
+                else:
+                    content = results["documents"][0]
+                
                 return {
                     "id": results["ids"][0],
-                    "content": results["documents"][0],
+                    "content": content,
                     "metadata": results["metadatas"][0]
                 }
             
@@ -336,6 +904,9 @@ class EnterpriseVectorStorage:
         """
         Delete documents by their IDs.
         
+        IDs are deleted in write-sized batches; only IDs that exist are
+        counted, so no full collection count is needed.
+        
         Args:
             doc_ids: List of document IDs to delete
             
@@ -343,24 +914,221 @@ class EnterpriseVectorStorage:
             Dictionary with deletion results
         """
         try:
-            initial_count = self.collection.count()
-            
-            self.collection.delete(ids=doc_ids)
-            
-            final_count = self.collection.count()
-            deleted_count = initial_count - final_count
+            deleted_count = 0
+            for i in range(0, len(doc_ids), self.max_write_batch_size):
+                batch = doc_ids[i:i + self.max_write_batch_size]
+                existing = self.collection.get(ids=batch, include=[])["ids"]
+                deleted_count += self._delete_batch(existing)
             
             print(f"✅ Deleted {deleted_count} documents from vector storage")
             
             return {
                 "success": True,
                 "documents_deleted": deleted_count,
-                "remaining_documents": final_count
+                "remaining_documents": self._document_count()
             }
             
         except Exception as e:
             raise VectorStorageError(f"Failed to delete documents: {str(e)}")
     
+    def delete_by_metadata(
+        self,
+        metadata_filter: Dict[str, Any],
+        batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Delete every document matching a metadata filter, in bulk batches.
+        
+        Typical filters:
+        - {"source": "msft_data/10-Q_2015-04-23.txt"}: a re-issued filing
+        - {"fiscal_year": 2016}: a whole fiscal year
+        - {"file_type": ".pptx"}: all slide decks
+        
+        Args:
+            metadata_filter: ChromaDB where clause selecting documents to delete
+            batch_size: IDs fetched and deleted per batch (default: max write batch size)
+            
+        Returns:
+            Dictionary with deletion results
+            
+        Raises:
+            VectorStorageError: If the filter is empty or deletion fails
+        """
+        if not metadata_filter:
+            raise VectorStorageError("A metadata filter is required; refusing to delete everything")
+        
+        batch_size = batch_size or self.max_write_batch_size
+        
+        try:
+            deleted_count = 0
+            batch_count = 0
+            while True:
+                # Deleted rows drop out of the filter, so always read the first page
+                ids = self.collection.get(where=metadata_filter, limit=batch_size, include=[])["ids"]
+                if not ids:
+                    break
+                deleted_count += self._delete_batch(ids)
+                batch_count += 1
+            
+            print(f"✅ Deleted {deleted_count} documents matching {metadata_filter} ({batch_count} batches)")
+            
+            return {
+                "success": True,
+                "metadata_filter": metadata_filter,
+                "documents_deleted": deleted_count,
+                "batch_count": batch_count,
+                "remaining_documents": self._document_count()
+            }
+            
+        except Exception as e:
+            raise VectorStorageError(f"Failed to delete documents by metadata: {str(e)}")
+    
+    def _delete_batch(self, ids: List[str]) -> int:
+        """Delete existing IDs from the collection and content store; returns the count."""
+        if not ids:
+            return 0
+        
+        self.collection.delete(ids=ids)
+        if self.content_store is not None:
+            self.content_store.delete_many(ids)
+        if self.quantized_index is not None:
+            self.quantized_index.delete(ids)
+        
+        with self._stats_lock:
+            if self._cached_count is not None:
+                self._cached_count = max(0, self._cached_count - len(ids))
+            self.stats["last_updated"] = datetime.now().isoformat()
+        return len(ids)
+    
+    def compact(self, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Rebuild collections to drop deleted vectors from the HNSW index.
+        
+        HNSW only marks deleted vectors, so after large deletions searches
+        still walk (and the index still stores) the dead entries. Each
+        collection is copied into a fresh one, which then replaces the
+        original; the content store is compacted too.
+        
+        Args:
+            batch_size: Records copied per batch (default: max write batch size)
+            
+        Returns:
+            Dictionary with records copied and storage size before and after
+            
+        Raises:
+            VectorStorageError: For sharded storage or if the rebuild fails
+        """
+        if self.num_shards:
+            raise VectorStorageError("Compaction of sharded storage is not supported; compact each shard path")
+        
+        batch_size = batch_size or self.max_write_batch_size
+        self.refresh_stats()
+        size_before = self._cached_size_mb
+        
+        try:
+            print(f"🧹 Compacting collection {self.collection_name}...")
+            if self.partition_by:
+                names = [collection.name for collection in self.collection.partitions().values()]
+            else:
+                names = [self.collection_name]
+            
+            records_copied = sum(self._rebuild_collection(name, batch_size) for name in names)
+            
+            # Reopen handles to the rebuilt collections
+            if self.partition_by:
+                self.collection = PartitionedCollection(
+                    client=self.client,
+                    base_name=self.collection_name,
+                    partition_key=self.partition_by,
+                    metadata_factory=self._collection_metadata
+                )
+            else:
+                self.collection = self.client.get_collection(name=self.collection_name)
+            
+            content_result = self.content_store.compact() if self.content_store is not None else None
+            quantized_result = self.quantized_index.compact() if self.quantized_index is not None else None
+            self._vacuum_database()
+            
+            self.refresh_stats()
+            result = {
+                "success": True,
+                "collections_rebuilt": len(names),
+                "records_copied": records_copied,
+                "size_before_mb": size_before,
+                "size_after_mb": self._cached_size_mb,
+                "content_store": content_result,
+                "quantized_index": quantized_result
+            }
+            print(f"✅ Compaction complete: {size_before:.2f} MB -> {self._cached_size_mb:.2f} MB")
+            return result
+            
+        except Exception as e:
+            raise VectorStorageError(f"Failed to compact collection: {str(e)}")
+    
+    def _vacuum_database(self) -> None:
+        """
+        Reclaim disk space left behind by deleted records and collections.
+        
+        VACUUMs the SQLite file and removes HNSW segment directories that no
+        longer belong to any collection (ChromaDB leaves them on disk when a
+        collection is dropped).
+        """
+        database_path = os.path.join(self.storage_path, "chroma.sqlite3")
+        if not os.path.exists(database_path):
+            return
+        
+        connection = sqlite3.connect(database_path, timeout=30)
+        try:
+            connection.execute("VACUUM")
+            live_segments = {row[0] for row in connection.execute("SELECT id FROM segments")}
+        finally:
+            connection.close()
+        
+        for entry in os.listdir(self.storage_path):
+            path = os.path.join(self.storage_path, entry)
+            if os.path.isdir(path) and self.SEGMENT_DIR_PATTERN.match(entry) and entry not in live_segments:
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def _rebuild_collection(self, name: str, batch_size: int) -> int:
+        """
+        Copy a collection into a fresh one and swap it in under the same name.
+        
+        The copy is complete before the original is dropped; if the process
+        dies between the drop and the rename, _recover_interrupted_rebuilds()
+        finishes the rename on the next open, for partitions as well.
+        """
+        source = self.client.get_collection(name=name)
+        rebuild_name = f"{self.REBUILD_PREFIX}{name}"
+        try:
+            self.client.delete_collection(name=rebuild_name)  # Leftover from an interrupted run
+        except Exception:
+            pass
+        target = self.client.create_collection(name=rebuild_name, metadata=source.metadata)
+        
+        copied = 0
+        while True:
+            page = source.get(
+                limit=batch_size,
+                offset=copied,
+                include=["embeddings", "metadatas", "documents"]
+            )
+            if not page["ids"]:
+                break
+            params = {
+                "ids": page["ids"],
+                "embeddings": page["embeddings"],
+                "metadatas": page["metadatas"]
+            }
+            if page.get("documents") is not None and any(doc is not None for doc in page["documents"]):
+                params["documents"] = page["documents"]
+            target.add(**params)
+            copied += len(page["ids"])
+        
+        self.client.delete_collection(name=name)
+        target.modify(name=name)
+        print(f"   Rebuilt {name}: {copied} records")
+        return copied
+    
     def _prepare_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
         Prepare metadata for ChromaDB storage (handle type restrictions).
@@ -374,6 +1142,9 @@ class EnterpriseVectorStorage:
         prepared = {}
         
         for key, value in metadata.items():
+            if self.content_store is not None and key in self.SLIM_METADATA_EXCLUDED_KEYS:
+                continue
+            
             # ChromaDB supports strings, integers, floats, and booleans
             if isinstance(value, (str, int, float, bool)):
                 prepared[key] = value
@@ -394,11 +1165,11 @@ class EnterpriseVectorStorage:
             Dictionary with collection statistics and metadata
         """
         try:
-            doc_count = self.collection.count()
+            doc_count = self._document_count()
             collection_metadata = self.collection.metadata or {}
             
             # Get storage size
-            storage_size = self._calculate_storage_size()
+            storage_size = self._storage_size_mb()
             
             return {
                 "collection_name": self.collection_name,
@@ -407,7 +1178,18 @@ class EnterpriseVectorStorage:
                 "distance_metric": self.distance_metric,
                 "storage_size_mb": storage_size,
                 "collection_metadata": collection_metadata,
+                "partitions": (
+                    {value: c.count() for value, c in self.collection.partitions().items()}
+                    if self.partition_by else None
+                ),
+                "shards": (
+                    {"num_shards": self.num_shards, **self.collection.last_query_stats}
+                    if self.num_shards else None
+                ),
+                "content_store": self.content_store.get_store_info() if self.content_store is not None else None,
+                "quantized_index": self.quantized_index.get_index_info() if self.quantized_index is not None else None,
                 "last_updated": self.stats.get("last_updated"),
+                "stats_age_seconds": round(time.monotonic() - self._stats_refreshed_at, 1),
                 "total_queries": self.stats.get("total_queries_performed", 0)
             }
             
@@ -426,38 +1208,68 @@ class EnterpriseVectorStorage:
         except Exception:
             return 0.0
     
+    def refresh_stats(self) -> None:
+        """Recount documents and re-measure on-disk size now."""
+        self._cached_count = self.collection.count()
+        self._cached_size_mb = self._calculate_storage_size()
+        self._pending_size_bytes = 0
+        self._stats_refreshed_at = time.monotonic()
+    
+    def _stats_expired(self) -> bool:
+        """Check whether the cached count and size are due for a refresh."""
+        return time.monotonic() - self._stats_refreshed_at >= self.stats_refresh_interval
+    
+    def _document_count(self) -> int:
+        """Get the document count, recounting only when the cache expired."""
+        if self._cached_count is None or self._stats_expired():
+            self.refresh_stats()
+        return self._cached_count
+    
+    def _storage_size_mb(self) -> float:
+        """Get the storage size, walking the directory only when the cache expired."""
+        if self._cached_count is None or self._stats_expired():
+            self.refresh_stats()
+        return self._cached_size_mb + self._pending_size_bytes / (1024 * 1024)
+    
     def _update_stats(self):
         """Update internal statistics."""
-        self.stats["storage_size_mb"] = self._calculate_storage_size()
+        self.stats["storage_size_mb"] = self._storage_size_mb()
     
-    def backup_collection(self, backup_path: str) -> Dict[str, Any]:
+    def backup_collection(self, backup_path: str, label: Optional[str] = None) -> Dict[str, Any]:
         """
-        Create a backup of the collection.
+        Create an incremental, deduplicated backup of the storage directory.
+        
+        backup_path is a backup repository: each call adds a restorable
+        point-in-time backup but stores only blocks that changed since the
+        previous one. Restore with IncrementalBackupManager(backup_path).restore().
         
         Args:
-            backup_path: Path to store the backup
+            backup_path: Path of the backup repository
+            label: Optional label recorded with the backup
             
         Returns:
             Dictionary with backup results
         """
         try:
-            import shutil
-            
-            # Create backup directory
-            os.makedirs(backup_path, exist_ok=True)
-            
-            # Copy storage files
-            shutil.copytree(self.storage_path, backup_path, dirs_exist_ok=True)
+            backup_manager = IncrementalBackupManager(backup_path)
+            result = backup_manager.create_backup(self.storage_path, label=label)
             
             backup_info = {
                 "success": True,
                 "backup_path": backup_path,
-                "document_count": self.collection.count(),
+                "backup_id": result["backup_id"],
+                "document_count": self._document_count(),
                 "backup_time": datetime.now().isoformat(),
-                "backup_size_mb": self._calculate_storage_size()
+                "backup_size_mb": result["logical_bytes"] / (1024 * 1024),
+                "new_data_mb": result["bytes_written"] / (1024 * 1024),
+                "files_unchanged": result["files_unchanged"],
+                "blocks_written": result["blocks_written"],
+                "blocks_reused": result["blocks_reused"],
+                "duration": round(result["duration"], 3)
             }
             
-            print(f"✅ Collection backed up to: {backup_path}")
+            print(f"✅ Collection backed up to: {backup_path} (backup {result['backup_id']}, "
+                  f"{backup_info['new_data_mb']:.2f} MB new)")
             return backup_info
             
         except Exception as e:
@@ -468,4 +1280,130 @@ class EnterpriseVectorStorage:
         return {
             **self.stats,
             "collection_info": self.get_collection_info()
-        }
\ No newline at end of file
+        }
+
+
+class BackgroundVectorWriter:
+    """
+    Writes embedded documents to vector storage on background threads.
+    
+    Lets ingestion overlap embedding of the next slice of chunks with the
+    ChromaDB write of the previous one. submit() blocks once max_pending
+    slices are queued, so memory stays bounded when writes fall behind.
+    
+    Usage:
+        with BackgroundVectorWriter(vector_storage) as writer:
+            for embedded_slice in slices:
+                writer.submit(embedded_slice)
+        writer.result  # totals, available after the block exits
+    """
+    
+    def __init__(
+        self,
+        vector_storage: EnterpriseVectorStorage,
+        num_threads: int = 1,
+        max_pending: int = 4
+    ):
+        """
+        Start the writer threads.
+        
+        Args:
+            vector_storage: Storage to write into
+            num_threads: Writer threads (ChromaDB serializes commits, so 1-2 is plenty)
+            max_pending: Maximum queued slices before submit() blocks
+        """
+        if num_threads < 1:
+            raise VectorStorageError("num_threads must be at least 1")
+        
+        self.vector_storage = vector_storage
+        self.result: Optional[Dict[str, Any]] = None
+        
+        self._queue: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._errors: List[str] = []
+        self._documents_added = 0
+        self._write_time = 0.0
+        self._closed = False
+        
+        self._threads = [
+            threading.Thread(target=self._run, name=f"vector-writer-{i}", daemon=True)
+            for i in range(num_threads)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def _run(self) -> None:
+        """Writer thread loop: drain slices until a stop sentinel arrives."""
+        while True:
+            embedded_docs = self._queue.get()
+            try:
+                if embedded_docs is None:
+                    return
+                if self._errors:
+                    continue  # A write already failed; drain without writing
+                
+                start = time.perf_counter()
+                result = self.vector_storage.add_documents(embedded_docs)
+                with self._lock:
+                    self._documents_added += result["documents_added"]
+                    self._write_time += time.perf_counter() - start
+            except Exception as e:
+                with self._lock:
+                    self._errors.append(str(e))
+            finally:
+                self._queue.task_done()
+    
+    def submit(self, embedded_docs: List[Dict[str, Any]]) -> None:
+        """
+        Queue a slice of embedded documents for writing.
+        
+        Raises:
+            VectorStorageError: If the writer is closed or a previous write failed
+        """
+        if self._closed:
+            raise VectorStorageError("Writer is closed")
+        if self._errors:
+            raise VectorStorageError(f"Background write failed: {self._errors[0]}")
+        if embedded_docs:
+            self._queue.put(embedded_docs)
+    
+    def close(self) -> Dict[str, Any]:
+        """
+        Wait for queued writes to finish and stop the threads.
+        
+        Returns:
+            Dictionary with documents written and time spent writing
+            
+        Raises:
+            VectorStorageError: If any background write failed
+        """
+        if not self._closed:
+            self._closed = True
+            for _ in self._threads:
+                self._queue.put(None)
+            for thread in self._threads:
+                thread.join()
+            
+            self.result = {
+                "success": not self._errors,
+                "documents_added": self._documents_added,
+                "write_time": self._write_time,
+                "errors": list(self._errors)
+            }
+        
+        if self._errors:
+            raise VectorStorageError(f"Background write failed: {self._errors[0]}")
+        return self.result
+    
+    def __enter__(self) -> "BackgroundVectorWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't mask the original error with a write failure
+            try:
+                self.close()
+            except VectorStorageError:
+                pass
@@ -22,6 +22,10 @@ from typing import Dict, Any, List, Optional, Tuple
 
 from modules.embedding_generator import EnterpriseEmbeddingGenerator
 from modules.vector_storage import EnterpriseVectorStorage
+from modules.document_store import DocumentTextStore, DEFAULT_STORE_DIRNAME
+from modules.metadata_extractor import FilingMetadataExtractor
+from modules.snapshot_manager import SnapshotManager
+from modules.pca_projector import PCAProjector, pca_projection_path
 
 
 class QueryPipelineError(Exception):
@@ -46,6 +50,7 @@ class EnterpriseQueryPipeline:
     - Source citation with confidence scoring
     - Performance monitoring and statistics
     - Production-ready error handling
+    - Hot reload of newly published storage snapshots
     """
     
     def __init__(
@@ -55,7 +60,12 @@ class EnterpriseQueryPipeline:
         model_name: str = "llama3.1:8b-instruct-q4_K_M",
         ollama_host: str = "http://localhost:11434",
         top_k_results: int = 5,
-        max_context_length: int = 2000
+        max_context_length: int = 2000,
+        expand_to_parents: bool = True,
+        use_mmr: bool = False,
+        mmr_lambda: float = 0.5,
+        mmr_fetch_k: int = 20,
+        auto_filter: bool = True
     ):
         """
         Initialize the query pipeline with production configurations.
@@ -67,6 +77,13 @@ class EnterpriseQueryPipeline:
             ollama_host: Ollama server URL
             top_k_results: Number of chunks to retrieve
             max_context_length: Maximum context characters for LLM
+            expand_to_parents: Replace child chunk hits with their parent windows
+                when the collection was ingested with parent chunking
+            use_mmr: Diversify retrieved chunks with Maximal Marginal Relevance
+            mmr_lambda: MMR relevance/diversity trade-off (1.0 = plain top-k)
+            mmr_fetch_k: Candidates fetched before MMR selection
+            auto_filter: Detect fiscal year/quarter, form type and file type in
+                the question and pre-filter retrieval on them
         """
         self.collection_name = collection_name
         self.storage_path = storage_path
@@ -74,10 +91,19 @@ class EnterpriseQueryPipeline:
         self.ollama_host = ollama_host
         self.top_k_results = top_k_results
         self.max_context_length = max_context_length
+        self.expand_to_parents = expand_to_parents
+        self.use_mmr = use_mmr
+        self.mmr_lambda = mmr_lambda
+        self.mmr_fetch_k = mmr_fetch_k
+        self.auto_filter = auto_filter
+        self.metadata_extractor = FilingMetadataExtractor()
+        self.snapshot_manager = SnapshotManager(storage_path)
+        self.snapshot_version = None
         
         # Initialize components
         self.embedding_generator = None
         self.vector_storage = None
+        self.text_store = None
         
         # Statistics tracking
         self.stats = {
@@ -86,7 +112,8 @@ class EnterpriseQueryPipeline:
             "avg_retrieval_time": 0.0,
             "avg_generation_time": 0.0,
             "successful_queries": 0,
-            "failed_queries": 0
+            "failed_queries": 0,
+            "snapshot_reloads": 0
         }
     
     def initialize_components(self) -> None:
@@ -105,11 +132,7 @@ class EnterpriseQueryPipeline:
             
             # Initialize vector storage
             print("2. Initializing Vector Storage...")
-            self.vector_storage = EnterpriseVectorStorage(
-                storage_path=self.storage_path,
-                collection_name=self.collection_name,
-                distance_metric="cosine"
-            )
+            self._open_storage(self.snapshot_manager.current_version())
             print(f"   ✅ Vector Storage ready (collection: {self.collection_name})")
             
             # Test Ollama connection
@@ -122,6 +145,72 @@ class EnterpriseQueryPipeline:
         except Exception as e:
             raise QueryPipelineError(f"Component initialization failed: {str(e)}")
     
+    def _open_storage(self, snapshot_version: Optional[str]) -> None:
+        """
+        Open vector storage (and the parent text store) for a snapshot.
+        
+        Args:
+            snapshot_version: Published snapshot to open, or None for
+                storage that is not managed by snapshots
+        """
+        storage_path = (
+            self.snapshot_manager.snapshot_path(snapshot_version)
+            if snapshot_version else self.storage_path
+        )
+        
+        vector_storage = EnterpriseVectorStorage(
+            storage_path=storage_path,
+            collection_name=self.collection_name,
+            distance_metric="cosine"
+        )
+        
+        # Collections ingested with --pca-dims are queried through the same projection
+        projection_path = pca_projection_path(storage_path, self.collection_name)
+        projector = PCAProjector.load(projection_path) if os.path.exists(projection_path) else None
+        
+        # Parent windows are read lazily from the text store written at ingest
+        text_store = None
+        text_store_path = os.path.join(storage_path, DEFAULT_STORE_DIRNAME)
+        if self.expand_to_parents and os.path.isdir(text_store_path):
+            text_store = DocumentTextStore(text_store_path)
+            print(f"   ✅ Parent document store ready ({text_store_path})")
+        
+        self.embedding_generator.set_projector(projector)
+        self.vector_storage = vector_storage
+        self.text_store = text_store
+        self.snapshot_version = snapshot_version
+        if snapshot_version:
+            print(f"   ✅ Serving snapshot {snapshot_version}")
+    
+    def refresh_snapshot(self) -> bool:
+        """
+        Switch to a newly published snapshot, if any.
+        
+        Only storage is reopened; the embedding model stays loaded. If the
+        new snapshot cannot be opened, the current one keeps serving.
+        
+        Returns:
+            True if the pipeline switched to a new snapshot
+        """
+        version = self.snapshot_manager.current_version()
+        if version is None or version == self.snapshot_version:
+            return False
+        
+        previous_storage = self.vector_storage
+        try:
+            print(f"🔄 New snapshot published: {version}")
+            self._open_storage(version)
+        except Exception as e:
+            print(f"⚠️ Could not open snapshot {version}, keeping {self.snapshot_version}: {e}")
+            return False
+        
+        # Sharded storage runs shard processes that must be stopped explicitly
+        if previous_storage is not None and hasattr(previous_storage.collection, "close"):
+            previous_storage.collection.close()
+        
+        self.stats["snapshot_reloads"] += 1
+        return True
+    
     def _test_ollama_connection(self) -> None:
         """Test connection to Ollama server."""
         try:
@@ -158,6 +247,9 @@ class EnterpriseQueryPipeline:
             query = query.strip()
             print(f"🔍 Processing query: '{query}'\n")
             
+            # Pick up a snapshot published by a re-ingest since the last query
+            self.refresh_snapshot()
+            
             # Step 1: Generate query embedding
             embedding_start = time.time()
             print("📐 Step 1: Generating query embedding...")
@@ -168,11 +260,22 @@ class EnterpriseQueryPipeline:
             # Step 2: Retrieve relevant chunks
             retrieval_start = time.time()
             print("🔎 Step 2: Retrieving relevant chunks...")
-            retrieved_chunks = self.vector_storage.similarity_search(
-                query_embedding=query_embedding,
-                top_k=self.top_k_results,
-                include_distances=True
-            )
+            metadata_filter = None
+            if self.auto_filter:
+                constraints = self.metadata_extractor.detect_query_constraints(query)
+                metadata_filter = self.metadata_extractor.build_metadata_filter(constraints)
+                if metadata_filter:
+                    print(f"   🎯 Auto-detected filter: {metadata_filter}")
+            
+            retrieved_chunks = self._retrieve_chunks(query_embedding, metadata_filter)
+            
+            if metadata_filter and not retrieved_chunks:
+                # Detected constraints may not match how the corpus was tagged
+                print("   ⚠️ No chunks matched the detected filter, searching full collection")
+                metadata_filter = None
+                retrieved_chunks = self._retrieve_chunks(query_embedding, None)
+            
+            retrieved_chunks = self._expand_to_parent_windows(retrieved_chunks)
             retrieval_time = time.time() - retrieval_start
             print(f"   ✅ Retrieved {len(retrieved_chunks)} chunks ({retrieval_time:.3f}s)")
             
@@ -202,8 +305,11 @@ class EnterpriseQueryPipeline:
                 "context_used": context_info['context'][:200] + "..." if len(context_info['context']) > 200 else context_info['context'],
                 "retrieval_stats": {
                     "chunks_found": len(retrieved_chunks),
+                    "metadata_filter": metadata_filter,
+                    "retrieval_mode": f"mmr (lambda={self.mmr_lambda}, fetch_k={self.mmr_fetch_k})" if self.use_mmr else "similarity",
                     "top_similarity_score": retrieved_chunks[0].get('distance', 0) if retrieved_chunks else 0,
-                    "context_length": len(context_info['context'])
+                    "context_length": len(context_info['context']),
+                    "snapshot_version": self.snapshot_version
                 },
                 "performance": {
                     "total_time": round(total_time, 3),
@@ -233,6 +339,78 @@ class EnterpriseQueryPipeline:
             print(f"\n❌ Query processing failed: {str(e)}")
             return error_result
     
+    def _retrieve_chunks(
+        self,
+        query_embedding,
+        metadata_filter: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Retrieve chunks with plain similarity search or MMR, honouring the filter."""
+        if self.use_mmr:
+            return self.vector_storage.mmr_search(
+                query_embedding=query_embedding,
+                top_k=self.top_k_results,
+                fetch_k=self.mmr_fetch_k,
+                lambda_mult=self.mmr_lambda,
+                metadata_filter=metadata_filter
+            )
+        
+        return self.vector_storage.similarity_search(
+            query_embedding=query_embedding,
+            top_k=self.top_k_results,
+            metadata_filter=metadata_filter,
+            include_distances=True
+        )
+    
+    def _expand_to_parent_windows(self, retrieved_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Expand child chunk hits to their parent windows (small-to-big retrieval).
+        
+        Children that share a parent collapse into a single result at the rank
+        of the best-scoring child. Chunks without parent metadata pass through.
+        
+        Args:
+            retrieved_chunks: Chunks returned by similarity search
+            
+        Returns:
+            Chunks with content replaced by parent window text where available
+        """
+        if self.text_store is None or not retrieved_chunks:
+            return retrieved_chunks
+        
+        expanded = []
+        spans = []
+        span_positions = []
+        seen_parents = set()
+        
+        for chunk in retrieved_chunks:
+            metadata = chunk.get('metadata', {})
+            doc_key = metadata.get('parent_doc_key')
+            
+            if doc_key is None:
+                expanded.append(chunk)
+                continue
+            
+            parent_id = (doc_key, metadata.get('parent_byte_start'))
+            if parent_id in seen_parents:
+                continue  # Parent already represented by a higher-ranked child
+            seen_parents.add(parent_id)
+            
+            spans.append((doc_key, int(metadata['parent_byte_start']), int(metadata['parent_byte_end'])))
+            span_positions.append(len(expanded))
+            expanded.append({**chunk, "child_content": chunk.get('content', '')})
+        
+        if spans:
+            try:
+                parent_texts = self.text_store.read_spans(spans)
+                for position, parent_text in zip(span_positions, parent_texts):
+                    if parent_text:
+                        expanded[position]["content"] = parent_text
+            except Exception as e:
+                # Fall back to child text rather than failing the query
+                print(f"   ⚠️ Parent expansion failed, using child chunks: {str(e)}")
+        
+        return expanded
+    
     def _assemble_context(self, retrieved_chunks: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Assemble context from retrieved chunks with source tracking.
@@ -389,6 +567,7 @@ ANALYSIS & ANSWER:"""
         
         return {
             **self.stats,
+            "snapshot_version": self.snapshot_version,
             "avg_total_time": round(avg_total_time, 3),
             "success_rate": round(
                 (self.stats["successful_queries"] / max(1, self.stats["queries_processed"])) * 100, 1
@@ -406,6 +585,7 @@ Examples:
   python query.py "What are the Q1 2025 budget projections?"
   python query.py "Who won the most Stanley Cups?" --top-k 3
   python query.py "What are the client onboarding plans?" --collection mydata
+  python query.py "Summarize FY2020 performance" --mmr --mmr-lambda 0.4 --mmr-fetch-k 30
         """
     )
     
@@ -446,6 +626,32 @@ Examples:
         help="Maximum context length for LLM (default: 2000)"
     )
     
+    parser.add_argument(
+        "--mmr",
+        action="store_true",
+        help="Diversify retrieved chunks with Maximal Marginal Relevance"
+    )
+    
+    parser.add_argument(
+        "--mmr-lambda",
+        type=float,
+        default=0.5,
+        help="MMR relevance/diversity trade-off, 1.0 = plain top-k (default: 0.5)"
+    )
+    
+    parser.add_argument(
+        "--mmr-fetch-k",
+        type=int,
+        default=20,
+        help="Candidates fetched before MMR selection (default: 20)"
+    )
+    
+    parser.add_argument(
+        "--no-auto-filter",
+        action="store_true",
+        help="Disable automatic fiscal year/form type filters detected in the question"
+    )
+    
     parser.add_argument(
         "--show-stats",
         action="store_true",
@@ -467,7 +673,11 @@ Examples:
             storage_path=args.storage_path,
             model_name=args.model_name,
             top_k_results=args.top_k,
-            max_context_length=args.max_context
+            max_context_length=args.max_context,
+            use_mmr=args.mmr,
+            mmr_lambda=args.mmr_lambda,
+            mmr_fetch_k=args.mmr_fetch_k,
+            auto_filter=not args.no_auto_filter
         )
         
         # Initialize components
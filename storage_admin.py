@@ -0,0 +1,229 @@
+"""
+Enterprise RAG Storage Administration
+
+Maintenance commands for the vector storage directory:
+- backup: incremental, deduplicated backup into a backup repository
+- restore: restore any backup into an empty directory
+- list-backups: show the backups in a repository
+- prune-backups: drop old backups and unreferenced blocks
+- delete: bulk-delete chunks by source, fiscal year or file type
+- compact: rebuild collections after large deletions
+
+Storage built with ingest.py --publish-snapshot is resolved through its
+CURRENT pointer, so backup acts on the published snapshot. Delete and
+compact never modify the published snapshot in place (query processes have
+it open): they run on a copy in a new snapshot version and publish it.
+
+Author: Enterprise RAG Pipeline
+Usage: python storage_admin.py <command> [options]
+"""
+
+import json
+import shutil
+import argparse
+from typing import Any, Callable, Dict
+
+from modules.backup_manager import IncrementalBackupManager
+from modules.vector_storage import EnterpriseVectorStorage
+from modules.snapshot_manager import SnapshotManager
+
+
+def _print_result(title: str, result: dict) -> None:
+    """Print a command result as an indented key/value list."""
+    print(f"\n{title}")
+    for key, value in result.items():
+        if isinstance(value, float):
+            value = round(value, 3)
+        print(f"  {key}: {value}")
+
+
+def _resolve_storage_path(storage_path: str) -> str:
+    """Follow the CURRENT pointer of snapshot-managed storage to the published snapshot."""
+    snapshots = SnapshotManager(storage_path)
+    resolved = snapshots.resolve_storage_path()
+    if resolved != storage_path:
+        print(f"📸 Using published snapshot {snapshots.current_version()} at {resolved}")
+    return resolved
+
+
+def cmd_backup(args) -> None:
+    manager = IncrementalBackupManager(args.backup_path, block_size=args.block_size * 1024 * 1024)
+    storage_path = _resolve_storage_path(args.storage_path)
+    print(f"💾 Backing up {storage_path} into {args.backup_path}...")
+    result = manager.create_backup(storage_path, label=args.label)
+    _print_result("✅ Backup complete", result)
+
+
+def cmd_restore(args) -> None:
+    manager = IncrementalBackupManager(args.backup_path)
+    backup_id = args.backup_id or (manager.list_backups() or [None])[-1]
+    if backup_id is None:
+        raise SystemExit(f"No backups found in {args.backup_path}")
+    print(f"♻️ Restoring backup {backup_id} into {args.target_path}...")
+    result = manager.restore(backup_id, args.target_path)
+    _print_result("✅ Restore complete", result)
+
+
+def cmd_list_backups(args) -> None:
+    manager = IncrementalBackupManager(args.backup_path)
+    print(f"📚 Backups in {args.backup_path}:")
+    for backup_id in manager.list_backups():
+        manifest = manager.load_manifest(backup_id)
+        stats = manifest["stats"]
+        label = f" [{manifest['label']}]" if manifest.get("label") else ""
+        print(f"  {backup_id}{label}: {stats['files']} files, "
+              f"{stats['logical_bytes'] / (1024 * 1024):.2f} MB logical, "
+              f"{stats['bytes_written'] / (1024 * 1024):.2f} MB new")
+    info = manager.get_repository_info()
+    print(f"  Repository size: {info['stored_size_mb']:.2f} MB in {info['block_count']} blocks")
+
+
+def cmd_prune_backups(args) -> None:
+    manager = IncrementalBackupManager(args.backup_path)
+    result = manager.prune(keep=args.keep)
+    _print_result("✅ Prune complete", result)
+
+
+def _modify_storage(args, operation: Callable[[EnterpriseVectorStorage], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run a modifying operation on the vector storage.
+
+    Snapshot-managed storage is copied from the published snapshot into a
+    new version, modified there and published once the operation succeeds;
+    a failed run discards the copy and leaves the published snapshot as is.
+    Old snapshots beyond args.keep_snapshots are pruned after publishing.
+    """
+    snapshots = SnapshotManager(args.storage_path)
+    if not snapshots.is_managed():
+        return operation(EnterpriseVectorStorage(
+            storage_path=args.storage_path,
+            collection_name=args.collection_name
+        ))
+
+    current = snapshots.current_version()
+    version = snapshots.create_snapshot()
+    print(f"📸 Copying published snapshot {current} into {version}...")
+    try:
+        shutil.copytree(snapshots.snapshot_path(current), snapshots.snapshot_path(version), dirs_exist_ok=True)
+        result = operation(EnterpriseVectorStorage(
+            storage_path=snapshots.snapshot_path(version),
+            collection_name=args.collection_name
+        ))
+        snapshots.publish(version)
+    except BaseException:
+        snapshots.discard(version)
+        raise
+
+    removed = snapshots.prune(keep=args.keep_snapshots)
+    print(f"📸 Published snapshot {version} (previous: {current}, pruned: {len(removed)})")
+    return result
+
+
+def cmd_delete(args) -> None:
+    conditions = []
+    if args.source:
+        conditions.append({"source": args.source})
+    if args.fiscal_year:
+        conditions.append({"fiscal_year": args.fiscal_year})
+    if args.file_type:
+        conditions.append({"file_type": args.file_type})
+    if args.where:
+        conditions.append(json.loads(args.where))
+    if not conditions:
+        raise SystemExit("Give at least one of --source, --fiscal-year, --file-type or --where")
+
+    metadata_filter = conditions[0] if len(conditions) == 1 else {"$and": conditions}
+    result = _modify_storage(args, lambda storage: storage.delete_by_metadata(metadata_filter))
+    _print_result("✅ Delete complete", result)
+
+
+def cmd_compact(args) -> None:
+    result = _modify_storage(args, lambda storage: storage.compact())
+    _print_result("✅ Compaction complete", result)
+
+
+def main():
+    """Main entry point for storage administration."""
+    parser = argparse.ArgumentParser(
+        description="Enterprise RAG Storage Administration",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python storage_admin.py backup --backup-path ./backups
+  python storage_admin.py list-backups --backup-path ./backups
+  python storage_admin.py restore --backup-path ./backups --target-path ./chroma_db_restored
+  python storage_admin.py prune-backups --backup-path ./backups --keep 7
+  python storage_admin.py delete --source msft_data/10-Q_2015-04-23.txt
+  python storage_admin.py delete --fiscal-year 2016 --file-type .pptx
+  python storage_admin.py compact
+        """
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    backup_parser = subparsers.add_parser("backup", help="Create an incremental backup")
+    backup_parser.add_argument("--storage-path", default="./chroma_db",
+                               help="Storage directory to back up (default: ./chroma_db)")
+    backup_parser.add_argument("--backup-path", default="./backups",
+                               help="Backup repository (default: ./backups)")
+    backup_parser.add_argument("--label", default=None, help="Optional label for the backup")
+    backup_parser.add_argument("--block-size", type=int, default=1,
+                               help="Block size in MiB (default: 1)")
+    backup_parser.set_defaults(func=cmd_backup)
+
+    restore_parser = subparsers.add_parser("restore", help="Restore a backup")
+    restore_parser.add_argument("--backup-path", default="./backups",
+                                help="Backup repository (default: ./backups)")
+    restore_parser.add_argument("--backup-id", default=None,
+                                help="Backup to restore (default: latest)")
+    restore_parser.add_argument("--target-path", required=True,
+                                help="Empty directory to restore into")
+    restore_parser.set_defaults(func=cmd_restore)
+
+    list_parser = subparsers.add_parser("list-backups", help="List backups")
+    list_parser.add_argument("--backup-path", default="./backups",
+                             help="Backup repository (default: ./backups)")
+    list_parser.set_defaults(func=cmd_list_backups)
+
+    prune_parser = subparsers.add_parser("prune-backups", help="Delete old backups")
+    prune_parser.add_argument("--backup-path", default="./backups",
+                              help="Backup repository (default: ./backups)")
+    prune_parser.add_argument("--keep", type=int, default=5,
+                              help="Number of newest backups to keep (default: 5)")
+    prune_parser.set_defaults(func=cmd_prune_backups)
+
+    delete_parser = subparsers.add_parser("delete", help="Bulk-delete chunks by metadata")
+    delete_parser.add_argument("--storage-path", default="./chroma_db",
+                               help="Vector storage path (default: ./chroma_db)")
+    delete_parser.add_argument("--collection-name", default="smb_documents",
+                               help="Collection name (default: smb_documents)")
+    delete_parser.add_argument("--source", default=None, help="Delete chunks of this source file path")
+    delete_parser.add_argument("--fiscal-year", type=int, default=None, help="Delete chunks of this fiscal year")
+    delete_parser.add_argument("--file-type", default=None, help="Delete chunks of this file type (e.g. .pdf)")
+    delete_parser.add_argument("--where", default=None, help="Additional ChromaDB where clause as JSON")
+    delete_parser.add_argument("--keep-snapshots", type=int, default=3,
+                               help="Snapshots kept after publishing snapshot-managed storage (default: 3)")
+    delete_parser.set_defaults(func=cmd_delete)
+
+    compact_parser = subparsers.add_parser("compact", help="Rebuild collections to reclaim deleted space")
+    compact_parser.add_argument("--storage-path", default="./chroma_db",
+                                help="Vector storage path (default: ./chroma_db)")
+    compact_parser.add_argument("--collection-name", default="smb_documents",
+                                help="Collection name (default: smb_documents)")
+    compact_parser.add_argument("--keep-snapshots", type=int, default=3,
+                                help="Snapshots kept after publishing snapshot-managed storage (default: 3)")
+    compact_parser.set_defaults(func=cmd_compact)
+
+    args = parser.parse_args()
+
+    try:
+        args.func(args)
+    except KeyboardInterrupt:
+        print(f"\n⚠️ Interrupted by user")
+        exit(130)
+    except Exception as e:
+        print(f"\n💥 Fatal error: {str(e)}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import io
+import shutil
+import tempfile
+import zipfile
+
+from modules.archive_loader import ZipArchiveLoader
+from modules.document_loader import EnterpriseDocumentLoader
+
+# The path to our test file (EDGAR filing bundle: primary .htm, exhibits, XBRL)
+zip_file_path = "backup_microsoft_sec/10-K_2020-07-30.zip"
+
+print(f"--- Loading ZIP archive: {zip_file_path} ---")
+
+loader = ZipArchiveLoader(zip_file_path)
+docs = loader.load()
+
+# --- Validation ---
+if not docs:
+    print("!!! Test Failed: No documents were loaded.")
+else:
+    print(f"+++ Test Passed: Loaded {len(docs)} document(s) from {loader.stats['members_loaded']} member(s), "
+          f"{loader.stats['members_skipped']} skipped.")
+
+    if any(doc.metadata["archive_member"].endswith((".xml", ".xsd")) for doc in docs):
+        print("!!! Test Failed: XBRL schema/linkbase members were loaded.")
+    else:
+        print("+++ Test Passed: XBRL schema/linkbase members were skipped.")
+
+    if all(doc.metadata["archive_path"] == zip_file_path
+           and doc.metadata["source"] == f"{zip_file_path}/{doc.metadata['archive_member']}" for doc in docs):
+        print("+++ Test Passed: Every document records its archive and member path.")
+    else:
+        print("!!! Test Failed: Missing archive provenance metadata.")
+
+    print("\n--- Document 1 Content (first 200 chars) ---")
+    print(docs[0].page_content[:200])
+    print("\n--- Document Metadata ---")
+    print(docs[0].metadata)
+
+# Build an earnings package with a table member, a workbook and a nested archive
+temp_dir = tempfile.mkdtemp()
+package_path = os.path.join(temp_dir, "FY16Q1-zip.zip")
+
+nested = io.BytesIO()
+with zipfile.ZipFile(nested, "w", zipfile.ZIP_DEFLATED) as inner:
+    inner.write("business_data/financial_data/metrics/Metrics_FY16Q3_Metrics.csv", "Metrics_FY16Q3_Metrics.csv")
+
+with zipfile.ZipFile(package_path, "w", zipfile.ZIP_DEFLATED) as package:
+    package.write("msft_data/FY16Q1-zip/KPI_FY16Q1.xlsx", "FY16Q1/KPI_FY16Q1.xlsx")
+    package.write("business_data/financial_data/metrics/KPI_FY16Q2_Metrics.csv", "FY16Q1/KPI_FY16Q2_Metrics.csv")
+    package.writestr("FY16Q1/logo.png", b"\x89PNG")
+    package.writestr("__MACOSX/FY16Q1/._KPI_FY16Q1.xlsx", b"")
+    package.writestr("FY16Q1/extra.zip", nested.getvalue())
+
+print(f"\n--- Loading earnings package through EnterpriseDocumentLoader: {package_path} ---")
+
+try:
+    package_docs = EnterpriseDocumentLoader().load_single_document(package_path)
+    members = sorted({doc.metadata["archive_member"] for doc in package_docs})
+    print(f"+++ Test Passed: Loaded {len(package_docs)} document(s) from members {members}.")
+
+    expected = {"FY16Q1/KPI_FY16Q1.xlsx", "FY16Q1/KPI_FY16Q2_Metrics.csv", "FY16Q1/extra.zip/Metrics_FY16Q3_Metrics.csv"}
+    if set(members) == expected:
+        print("+++ Test Passed: Workbook, CSV and nested archive members dispatched; junk skipped.")
+    else:
+        print(f"!!! Test Failed: Expected members {sorted(expected)}.")
+
+    workbook_doc = next(doc for doc in package_docs if doc.metadata["archive_member"].endswith(".xlsx"))
+    if workbook_doc.metadata["file_type"] == ".xlsx" and "sheet_name" in workbook_doc.metadata:
+        print("+++ Test Passed: Members keep their own file type and loader metadata.")
+    else:
+        print(f"!!! Test Failed: Unexpected member metadata: {workbook_doc.metadata}")
+
+    csv_doc = next(doc for doc in package_docs if doc.metadata["archive_member"].endswith("FY16Q2_Metrics.csv"))
+    if (workbook_doc.metadata.get("fiscal_year"), workbook_doc.metadata.get("fiscal_quarter")) == (2016, 1) \
+            and csv_doc.metadata.get("fiscal_quarter") == 2:
+        print("+++ Test Passed: Filing metadata derived from member names, then archive folders.")
+    else:
+        print("!!! Test Failed: Filing metadata was not derived from the member path.")
+except Exception as e:
+    print(f"!!! Test Failed: {e}")
+finally:
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+print("\n--- Test Complete ---")
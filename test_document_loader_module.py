@@ -105,6 +105,29 @@ def test_document_loader():
         is_supported = loader.is_supported_file(file_path)
         print(f"   📁 {file_path}: {file_type} (Supported: {is_supported})")
     
+    print("\n" + "="*50 + "\n")
+    
+    # Test 6: Filing metadata extraction
+    print("6. Testing filing metadata extraction...")
+    metadata_tests = [
+        ("msft_data/FY22Q1-zip/deck.pptx", {"fiscal_year": 2022, "fiscal_quarter": 1}),
+        ("business_data/regulatory_filings/annual_reports/MSFT_FY17_10K.docx",
+         {"fiscal_year": 2017, "form_type": "10-K"}),
+        ("business_data/regulatory_filings/quarterly_reports/10-Q_2015-04-23.txt",
+         {"fiscal_year": 2015, "fiscal_quarter": 3, "form_type": "10-Q", "filing_year": 2015}),
+        ("backup_microsoft_sec/10-K_2019-08-01.zip",
+         {"fiscal_year": 2019, "fiscal_quarter": 4, "form_type": "10-K"}),
+    ]
+    
+    for file_path, expected in metadata_tests:
+        extracted = loader.metadata_extractor.extract(file_path)
+        matches = all(extracted.get(key) == value for key, value in expected.items())
+        print(f"   {'✅' if matches else '❌'} {file_path}: {extracted}")
+    
+    question = "What did the FY22 Q1 10-Q say about cloud revenue?"
+    constraints = loader.metadata_extractor.detect_query_constraints(question)
+    print(f"   🎯 Query constraints for '{question}': {constraints}")
+    
     print("\n=== Document Loader Validation Complete ===")
 
 if __name__ == "__main__":
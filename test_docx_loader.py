@@ -1,4 +1,4 @@
-from langchain_community.document_loaders import UnstructuredWordDocumentLoader
+from modules.office_loader import DocxXMLLoader
 
 # The path to our test file
 docx_file_path = "data/fake.docx"
@@ -6,7 +6,7 @@ docx_file_path = "data/fake.docx"
 print(f"--- Loading Word Document file: {docx_file_path} ---")
 
 # Create the loader
-loader = UnstructuredWordDocumentLoader(docx_file_path)
+loader = DocxXMLLoader(docx_file_path)
 
 # Load the documents
 docs = loader.load()
@@ -0,0 +1,41 @@
+from modules.edgar_loader import EdgarFilingLoader
+
+# The path to our test file (raw EDGAR full-submission filing)
+txt_file_path = "backup_microsoft_sec/8-K_2023-11-06.txt"
+
+print(f"--- Loading EDGAR filing: {txt_file_path} ---")
+
+# Create the loader
+loader = EdgarFilingLoader(txt_file_path)
+
+# Load the documents
+docs = loader.load()
+
+# --- Validation ---
+if not docs:
+    print("!!! Test Failed: No documents were loaded.")
+else:
+    print(f"+++ Test Passed: Successfully loaded {len(docs)} filing section(s).")
+    print(f"Loader stats: {loader.stats}")
+
+    binary_types = [doc.metadata["document_type"] for doc in docs
+                    if doc.metadata["document_type"] in ("GRAPHIC", "ZIP", "EXCEL", "XML", "JSON")]
+    if binary_types:
+        print(f"!!! Test Failed: Binary sections were loaded: {binary_types}")
+    else:
+        print("+++ Test Passed: Binary and data sections were skipped.")
+
+    leftover_markup = [doc.metadata["document_filename"] for doc in docs if "<div" in doc.page_content]
+    if leftover_markup:
+        print(f"!!! Test Failed: HTML left in {leftover_markup}")
+    else:
+        print("+++ Test Passed: HTML was stripped.")
+
+    # Print the content of the first few elements to verify
+    for i, doc in enumerate(docs[:2]): # Limit to first 2 elements for brevity
+        print(f"\n--- Document {i+1} Content (first 200 chars) ---")
+        print(doc.page_content[:200])
+        print("\n--- Document Metadata ---")
+        print(doc.metadata)
+
+print("\n--- Test Complete ---")
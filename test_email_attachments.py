@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+from email.message import EmailMessage
+
+from modules.document_loader import EnterpriseDocumentLoader
+
+# Attachments taken from the repo's own data
+pdf_path = "business_data/financial_data/metrics/Metrics_FY22Q3_Metrics.pdf"
+csv_path = "business_data/financial_data/metrics/Metrics_FY16Q3_Metrics.csv"
+docx_path = "business_data/investor_relations/earnings_transcripts/TranscriptFY18Q1.docx"
+
+
+def build_message(subject, body, attachments):
+    message = EmailMessage()
+    message["From"] = "Investor Relations <ir@example.com>"
+    message["To"] = "finance-team@example.com"
+    message["Subject"] = subject
+    message["Date"] = "Thu, 26 Oct 2017 16:30:00 -0700"
+    message["Message-ID"] = f"<{subject.replace(' ', '-').lower()}@example.com>"
+    message.set_content(body)
+    for path in attachments:
+        with open(path, "rb") as f:
+            message.add_attachment(f.read(), maintype="application", subtype="octet-stream",
+                                   filename=os.path.basename(path))
+    return message
+
+
+temp_dir = tempfile.mkdtemp()
+mbox_path = os.path.join(temp_dir, "ir-mailbox.mbox")
+
+# Three messages; the last one forwards the first as an attached message
+first = build_message("FY22 Q3 metrics", "Metrics deck attached.\nFrom now on we send CSVs too.", [pdf_path, csv_path])
+second = build_message("FY18 Q1 call transcript", "Transcript attached.", [docx_path])
+third = build_message("Fwd: FY22 Q3 metrics", "See the forwarded message.", [])
+third.add_attachment(first)
+
+with open(mbox_path, "wb") as f:
+    for message in [first, second, third]:
+        f.write(b"From ir@example.com Thu Oct 26 16:30:00 2017\n")
+        # mboxrd: escape body lines that look like separators
+        f.write(message.as_bytes().replace(b"\nFrom ", b"\n>From "))
+        f.write(b"\n")
+
+print(f"--- Loading mailbox: {mbox_path} ---")
+
+try:
+    loader = EnterpriseDocumentLoader()
+    docs = loader.load_single_document(mbox_path)
+
+    # --- Validation ---
+    bodies = [doc for doc in docs if "attachment_filename" not in doc.metadata]
+    attachments = [doc for doc in docs if "attachment_filename" in doc.metadata]
+
+    if len(bodies) == 4 and "From now on" in bodies[0].page_content:
+        print(f"+++ Test Passed: 3 messages and 1 forwarded message split from the mailbox.")
+    else:
+        print(f"!!! Test Failed: Expected 4 message bodies, got {len(bodies)}.")
+
+    filenames = {doc.metadata["attachment_filename"] for doc in attachments}
+    if filenames == {os.path.basename(p) for p in [pdf_path, csv_path, docx_path]}:
+        print(f"+++ Test Passed: Attachments parsed by their own loaders ({len(attachments)} documents).")
+    else:
+        print(f"!!! Test Failed: Unexpected attachments {sorted(filenames)}.")
+
+    transcript = [doc for doc in attachments if doc.metadata["original_filename"] == os.path.basename(docx_path)]
+    if transcript and all(doc.metadata["email_subject"] == "FY18 Q1 call transcript" and
+                          doc.metadata["file_type"] == ".docx" and
+                          doc.metadata.get("fiscal_year") == 2018 for doc in transcript):
+        print("+++ Test Passed: Attachments carry parent message headers and their own file metadata.")
+    else:
+        print("!!! Test Failed: Attachment metadata incomplete.")
+    # Print the content of the first few elements to verify
+    for i, doc in enumerate(docs[:2]): # Limit to first 2 elements for brevity
+        print(f"\n--- Document {i+1} Content (first 200 chars) ---")
+        print(doc.page_content[:200])
+        print("\n--- Document Metadata ---")
+        print(doc.metadata)
+except Exception as e:
+    print(f"!!! Test Failed: {e}")
+finally:
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+print("\n--- Test Complete ---")
@@ -1,4 +1,4 @@
-from langchain_community.document_loaders import UnstructuredEmailLoader
+from modules.email_loader import EmailMessageLoader
 
 # The path to our test file
 email_file_path = "data/fake-email.eml"
@@ -6,7 +6,7 @@ email_file_path = "data/fake-email.eml"
 print(f"--- Loading Email file: {email_file_path} ---")
 
 # Create the loader
-loader = UnstructuredEmailLoader(email_file_path)
+loader = EmailMessageLoader(email_file_path)
 
 # Load the documents
 docs = loader.load()
@@ -8,6 +8,7 @@ with all-MiniLM-L6-v2 model for optimal RAG performance.
 from modules.embedding_generator import EnterpriseEmbeddingGenerator
 from modules.text_chunker import EnterpriseTextChunker
 from modules.document_loader import EnterpriseDocumentLoader
+from modules.pca_projector import PCAProjector
 import numpy as np
 
 def test_embedding_generator():
@@ -247,6 +248,29 @@ def test_embedding_generator():
     except Exception as e:
         print(f"   ❌ Batch processing test failed: {e}")
     
+    print("\n" + "="*50 + "\n")
+    
+    # Test 9: PCA projection
+    print("9. Testing PCA dimensionality reduction...")
+    try:
+        projector = PCAProjector.fit(batch_embeddings, n_components=16)
+        embedder.set_projector(projector)
+        
+        projected_docs = embedder.generate_embeddings(test_texts[:5], show_progress=False)
+        projected_query = embedder.generate_query_embedding("test sentence number 3")
+        
+        print(f"   ✅ Projected {batch_embeddings.shape[1]} -> {projector.output_dim} dimensions "
+              f"({projector.get_projection_info()['explained_variance']:.1%} variance kept)")
+        print(f"   {'✅' if projected_docs.shape[1] == projected_query.shape[0] == 16 else '❌'} "
+              f"Documents and queries share the projected space")
+        print(f"   {'✅' if np.allclose(np.linalg.norm(projected_docs, axis=1), 1.0, atol=1e-5) else '❌'} "
+              f"Projected embeddings are normalized")
+        
+        embedder.set_projector(None)
+        
+    except Exception as e:
+        print(f"   ❌ PCA projection test failed: {e}")
+    
     print("\n=== Embedding Generator Validation Complete ===")
 
 if __name__ == "__main__":
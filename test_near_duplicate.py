@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+
+from modules.document_loader import EnterpriseDocumentLoader
+
+# Two different 10-Qs and two different 8-Ks, one of them stored twice
+msft_dir = "msft_data"
+backup_dir = "backup_microsoft_sec"
+
+temp_dir = tempfile.mkdtemp()
+data_dir = os.path.join(temp_dir, "data")
+index_path = os.path.join(temp_dir, "near_duplicates.json")
+os.makedirs(data_dir)
+
+shutil.copy(os.path.join(msft_dir, "FY25Q1-zip", "MSFT FY25Q1 10-Q.docx"), data_dir)
+shutil.copy(os.path.join(msft_dir, "FY25Q2-zip", "MSFT FY25Q2 10-Q FINAL.docx"), data_dir)
+shutil.copy(os.path.join(backup_dir, "8-K_2019-04-24.txt"), data_dir)
+shutil.copy(os.path.join(backup_dir, "8-K_2019-10-23.txt"), data_dir)
+shutil.copy(os.path.join(backup_dir, "8-K_2019-04-24.txt"), os.path.join(data_dir, "8-K_2019-04-24_copy.txt"))
+
+print(f"--- Loading {data_dir} with near-duplicate detection ---")
+
+try:
+    loader = EnterpriseDocumentLoader(deduplicate=True, dedup_index_path=index_path)
+    documents = loader.load_directory(data_dir)
+    report = loader.dedup_report
+    sources = {os.path.basename(doc.metadata["source"]) for doc in documents}
+
+    # --- Validation ---
+    duplicates = {os.path.basename(key): os.path.basename(canonical)
+                  for key, (canonical, _) in report["duplicates"].items()}
+    if len(duplicates) == 1 and set(duplicates.items()) <= {
+            ("8-K_2019-04-24_copy.txt", "8-K_2019-04-24.txt"), ("8-K_2019-04-24.txt", "8-K_2019-04-24_copy.txt")}:
+        print(f"+++ Test Passed: Copied 8-K dropped ({report['characters_dropped']} characters not embedded).")
+    else:
+        print(f"!!! Test Failed: Unexpected duplicates {duplicates}.")
+
+    expected = {"MSFT FY25Q1 10-Q.docx", "MSFT FY25Q2 10-Q FINAL.docx", "8-K_2019-10-23.txt"}
+    if expected <= sources and len(sources) == 4:
+        print("+++ Test Passed: Different quarters and different 8-Ks are all kept.")
+    else:
+        print(f"!!! Test Failed: Kept sources {sorted(sources)}.")
+
+    # A later run drops a new copy of a stored filing
+    loader.near_duplicates.save()
+    later_dir = os.path.join(temp_dir, "later")
+    os.makedirs(later_dir)
+    shutil.copy(os.path.join(backup_dir, "8-K_2019-10-23.txt"), os.path.join(later_dir, "8-K_resent.txt"))
+    later_loader = EnterpriseDocumentLoader(deduplicate=True, dedup_index_path=index_path)
+    later_documents = later_loader.load_directory(later_dir)
+    if not later_documents and later_loader.dedup_report["duplicate_sources"] == 1:
+        print("+++ Test Passed: Copy of a stored filing dropped against the saved index.")
+    else:
+        print(f"!!! Test Failed: Later run kept {len(later_documents)} documents.")
+
+    # Re-loading the same files is not a duplicate of themselves
+    again_loader = EnterpriseDocumentLoader(deduplicate=True, dedup_index_path=index_path)
+    again_documents = again_loader.load_directory(data_dir)
+    if len(again_documents) == len(documents) and again_loader.dedup_report["duplicate_sources"] == 1:
+        print("+++ Test Passed: Re-loading stored sources keeps them.")
+    else:
+        print(f"!!! Test Failed: Re-load kept {len(again_documents)} of {len(documents)} documents.")
+except Exception as e:
+    print(f"!!! Test Failed: {e}")
+finally:
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+print("\n--- Test Complete ---")
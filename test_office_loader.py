@@ -0,0 +1,62 @@
+from modules.office_loader import DocxXMLLoader, PptxXMLLoader
+
+# The path to our test file (an earnings call transcript)
+docx_file_path = "business_data/investor_relations/earnings_transcripts/TranscriptFY18Q1.docx"
+
+print(f"--- Loading Word Document file: {docx_file_path} ---")
+
+# Create the loader (reads word/document.xml directly, one document per section)
+loader = DocxXMLLoader(docx_file_path)
+
+# Load the documents
+docs = loader.load()
+
+# --- Validation ---
+if not docs:
+    print("!!! Test Failed: No documents were loaded.")
+else:
+    print(f"+++ Test Passed: Successfully loaded {len(docs)} document(s).")
+
+    speakers = {doc.metadata["speaker"] for doc in docs if "speaker" in doc.metadata}
+    if "SATYA NADELLA" in speakers and "AMY HOOD" in speakers:
+        print(f"+++ Test Passed: Transcript split into speaker turns ({len(speakers)} speakers, "
+              f"{loader.stats['paragraphs']} paragraphs).")
+    else:
+        print(f"!!! Test Failed: Speaker turns not detected ({sorted(speakers)}).")
+    # Print the content of the first few elements to verify
+    for i, doc in enumerate(docs[:2]): # Limit to first 2 elements for brevity
+        print(f"\n--- Document {i+1} Content (first 200 chars) ---")
+        print(doc.page_content[:200])
+        print("\n--- Document Metadata ---")
+        print(doc.metadata)
+
+# The path to our test file (an outlook deck with text slides)
+pptx_file_path = "business_data/investor_relations/presentations/OutlookFY16Q3.pptx"
+
+print(f"\n--- Loading PowerPoint file: {pptx_file_path} ---")
+
+# Create the loader (reads the slide XML directly, one document per slide)
+loader = PptxXMLLoader(pptx_file_path)
+
+# Load the documents
+docs = loader.load()
+
+# --- Validation ---
+if not docs:
+    print("!!! Test Failed: No documents were loaded.")
+else:
+    print(f"+++ Test Passed: Successfully loaded {len(docs)} document(s).")
+
+    if all("page" in doc.metadata and doc.metadata["slide_title"] for doc in docs):
+        print(f"+++ Test Passed: One document per slide with its title "
+              f"({loader.stats['empty_slides']} picture-only slide(s) skipped).")
+    else:
+        print("!!! Test Failed: Slide number or title metadata missing.")
+    # Print the content of the first few elements to verify
+    for i, doc in enumerate(docs[:2]): # Limit to first 2 elements for brevity
+        print(f"\n--- Document {i+1} Content (first 200 chars) ---")
+        print(doc.page_content[:200])
+        print("\n--- Document Metadata ---")
+        print(doc.metadata)
+
+print("\n--- Test Complete ---")
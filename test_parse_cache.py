@@ -0,0 +1,67 @@
+import os
+import time
+import shutil
+import tempfile
+
+from modules.document_loader import EnterpriseDocumentLoader
+
+# The directory to load twice (PDF, CSV and text metrics exports)
+data_dir = "business_data/financial_data/metrics"
+
+temp_dir = tempfile.mkdtemp()
+cache_path = os.path.join(temp_dir, "parse_cache")
+
+print(f"--- Loading {data_dir} with a parse cache: {cache_path} ---")
+
+try:
+    cold_loader = EnterpriseDocumentLoader(parse_cache_path=cache_path)
+    start = time.time()
+    cold_docs = cold_loader.load_directory(data_dir)
+    cold_time = time.time() - start
+
+    warm_loader = EnterpriseDocumentLoader(parse_cache_path=cache_path)
+    start = time.time()
+    warm_docs = warm_loader.load_directory(data_dir)
+    warm_time = time.time() - start
+
+    # --- Validation ---
+    if cold_loader.parse_cache.stats["entries_written"] and \
+            warm_loader.parse_cache.stats["hits"] == cold_loader.parse_cache.stats["entries_written"]:
+        print(f"+++ Test Passed: Second run served {warm_loader.parse_cache.stats['hits']} file(s) from the cache "
+              f"({cold_time:.2f}s -> {warm_time:.2f}s).")
+    else:
+        print(f"!!! Test Failed: Unexpected cache stats {warm_loader.parse_cache.stats}.")
+
+    if len(cold_docs) == len(warm_docs) and all(
+            a.page_content == b.page_content and a.metadata == b.metadata for a, b in zip(cold_docs, warm_docs)):
+        print(f"+++ Test Passed: Cached documents match a fresh parse ({len(warm_docs)} documents).")
+    else:
+        print("!!! Test Failed: Cached documents differ from a fresh parse.")
+
+    # A copied file hits the same entry but reports its own path
+    copy_dir = os.path.join(temp_dir, "copy")
+    os.makedirs(copy_dir)
+    csv_name = "Metrics_FY19Q2_Metrics.csv"
+    shutil.copy(os.path.join(data_dir, csv_name), copy_dir)
+    copy_loader = EnterpriseDocumentLoader(parse_cache_path=cache_path)
+    copy_docs = copy_loader.load_single_document(os.path.join(copy_dir, csv_name))
+    if copy_loader.parse_cache.stats["hits"] == 1 and \
+            all(doc.metadata["source"] == os.path.join(copy_dir, csv_name) for doc in copy_docs):
+        print("+++ Test Passed: Copied file reuses the cache entry with its own source path.")
+    else:
+        print(f"!!! Test Failed: Copied file metadata {copy_docs[0].metadata}.")
+
+    # Changing the content produces a miss
+    with open(os.path.join(copy_dir, csv_name), "a") as f:
+        f.write("Extra,1\n")
+    copy_loader.load_single_document(os.path.join(copy_dir, csv_name))
+    if copy_loader.parse_cache.stats["misses"] == 1:
+        print("+++ Test Passed: Edited file is parsed again.")
+    else:
+        print("!!! Test Failed: Edited file was served from the cache.")
+except Exception as e:
+    print(f"!!! Test Failed: {e}")
+finally:
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+print("\n--- Test Complete ---")
@@ -0,0 +1,123 @@
+import os
+import time
+import shutil
+import tempfile
+
+from langchain_core.documents import Document
+from langchain_core.document_loaders import BaseLoader
+
+from modules.document_loader import EnterpriseDocumentLoader
+from modules.table_loader import TableCSVLoader
+
+
+# Pathological loaders; module level so the spawned parse worker can import them
+class HangingLoader(BaseLoader):
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def lazy_load(self):
+        time.sleep(60)
+        yield Document(page_content="never", metadata={"source": self.file_path})
+
+
+class MemoryHogLoader(BaseLoader):
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def lazy_load(self):
+        hog = bytearray(600 * 1024 * 1024)
+        time.sleep(60)
+        yield Document(page_content=str(len(hog)), metadata={"source": self.file_path})
+
+
+class CrashingLoader(BaseLoader):
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def lazy_load(self):
+        os._exit(3)
+        yield
+
+
+class PathologicalDocumentLoader(EnterpriseDocumentLoader):
+    LOADER_MAPPING = {
+        '.csv': TableCSVLoader,
+        '.hang': HangingLoader,
+        '.hog': MemoryHogLoader,
+        '.crash': CrashingLoader
+    }
+
+
+if __name__ == "__main__":
+    temp_dir = tempfile.mkdtemp()
+    data_dir = os.path.join(temp_dir, "data")
+    os.makedirs(data_dir)
+    quarantine_path = os.path.join(temp_dir, "parse_quarantine.json")
+
+    shutil.copy("business_data/financial_data/metrics/Metrics_FY19Q2_Metrics.csv", data_dir)
+    for name in ["stuck.hang", "huge.hog", "broken.crash"]:
+        with open(os.path.join(data_dir, name), "w") as f:
+            f.write("pathological")
+
+    print(f"--- Loading directory with isolated parsing: {data_dir} ---")
+
+    try:
+        loader = PathologicalDocumentLoader(
+            isolate_parsing=True,
+            parse_timeout=3,
+            max_parse_memory_mb=300,
+            quarantine_path=quarantine_path
+        )
+        start = time.time()
+        docs = loader.load_directory(data_dir)
+        first_run = time.time() - start
+
+        # --- Validation ---
+        if docs and all(doc.metadata["original_filename"].endswith(".csv") for doc in docs):
+            print(f"+++ Test Passed: Healthy file loaded ({len(docs)} documents) next to pathological ones.")
+        else:
+            print("!!! Test Failed: Healthy file was not loaded.")
+
+        if first_run < 30:
+            print(f"+++ Test Passed: Hanging, memory-hungry and crashing parses were killed ({first_run:.1f}s).")
+        else:
+            print(f"!!! Test Failed: Run took {first_run:.1f}s; limits were not enforced.")
+
+        if len(loader.quarantine) == 3:
+            print("+++ Test Passed: All three pathological files were quarantined.")
+            for path, entry in loader.quarantine.entries.items():
+                print(f"    {os.path.basename(path)}: {entry['reason']}")
+        else:
+            print(f"!!! Test Failed: Expected 3 quarantined files, got {len(loader.quarantine)}.")
+        loader.close()
+
+        print("\n--- Second run with the saved quarantine list ---")
+        loader = PathologicalDocumentLoader(
+            isolate_parsing=True,
+            parse_timeout=3,
+            max_parse_memory_mb=300,
+            quarantine_path=quarantine_path
+        )
+        start = time.time()
+        docs = loader.load_directory(data_dir)
+        second_run = time.time() - start
+
+        if docs and second_run < 5:
+            print(f"+++ Test Passed: Quarantined files skipped instantly ({second_run:.1f}s).")
+        else:
+            print(f"!!! Test Failed: Second run took {second_run:.1f}s.")
+
+        # A changed file leaves quarantine and is tried again
+        with open(os.path.join(data_dir, "broken.crash"), "a") as f:
+            f.write(" edited")
+        if loader.quarantine.get_reason(os.path.join(data_dir, "broken.crash")) is None:
+            print("+++ Test Passed: Edited file is released from quarantine.")
+        else:
+            print("!!! Test Failed: Edited file is still quarantined.")
+        loader.close()
+    except Exception as e:
+        print(f"!!! Test Failed: {e}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print("\n--- Test Complete ---")
@@ -1,12 +1,12 @@
-from langchain_community.document_loaders import UnstructuredPDFLoader
+from modules.pdf_loader import TieredPDFLoader
 
 # The path to our test file
 pdf_file_path = "data/sample-business-report.pdf"
 
 print(f"--- Loading PDF file: {pdf_file_path} ---")
 
-# Create the loader
-loader = UnstructuredPDFLoader(pdf_file_path)
+# Create the loader (text layer first, Unstructured only for pages without text)
+loader = TieredPDFLoader(pdf_file_path)
 
 # Load the documents
 docs = loader.load()
@@ -16,6 +16,12 @@ if not docs:
     print("!!! Test Failed: No documents were loaded.")
 else:
     print(f"+++ Test Passed: Successfully loaded {len(docs)} document(s).")
+
+    if all("page" in doc.metadata and "extraction_tier" in doc.metadata for doc in docs):
+        print(f"+++ Test Passed: One document per page, file tier '{loader.stats['tier']}' "
+              f"({loader.stats['text_layer_pages']} text-layer, {loader.stats['fallback_pages']} fallback page(s)).")
+    else:
+        print("!!! Test Failed: Page number or extraction tier metadata missing.")
     # Print the content of the first few elements to verify
     for i, doc in enumerate(docs[:2]): # Limit to first 2 elements for brevity
         print(f"\n--- Document {i+1} Content (first 200 chars) ---")
@@ -1,4 +1,4 @@
-from langchain_community.document_loaders import UnstructuredPowerPointLoader
+from modules.office_loader import PptxXMLLoader
 
 # The path to our test file
 pptx_file_path = "data/fake-power-point.pptx"
@@ -6,7 +6,7 @@ pptx_file_path = "data/fake-power-point.pptx"
 print(f"--- Loading PowerPoint file: {pptx_file_path} ---")
 
 # Create the loader
-loader = UnstructuredPowerPointLoader(pptx_file_path)
+loader = PptxXMLLoader(pptx_file_path)
 
 # Load the documents
 docs = loader.load()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+
+from modules.table_loader import TableCSVLoader, TableXLSXLoader
+
+# The path to our test file (quarterly investor metrics export)
+csv_file_path = "business_data/financial_data/metrics/Metrics_FY19Q2_Metrics.csv"
+
+print(f"--- Loading CSV table: {csv_file_path} ---")
+
+# Create the loader (blocks of roughly 250 tokens)
+loader = TableCSVLoader(csv_file_path, max_tokens=250)
+
+# Load the documents
+docs = loader.load()
+
+# --- Validation ---
+if not docs:
+    print("!!! Test Failed: No documents were loaded.")
+else:
+    print(f"+++ Test Passed: Successfully loaded {len(docs)} block(s) "
+          f"for {docs[0].metadata['table_rows']} table rows.")
+
+    header_line = docs[0].page_content.split("\n")[0]
+    if all(doc.page_content.startswith(header_line) for doc in docs):
+        print("+++ Test Passed: Every block repeats the table header.")
+    else:
+        print("!!! Test Failed: Some blocks are missing the table header.")
+
+    if "Q2'19" in docs[0].metadata["columns"]:
+        print(f"+++ Test Passed: Column names kept as metadata: {docs[0].metadata['columns']}")
+    else:
+        print(f"!!! Test Failed: Unexpected columns: {docs[0].metadata['columns']}")
+
+    # Print the content of the first few elements to verify
+    for i, doc in enumerate(docs[:2]): # Limit to first 2 elements for brevity
+        print(f"\n--- Block {i+1} Content (first 200 chars) ---")
+        print(doc.page_content[:200])
+        print("\n--- Block Metadata ---")
+        print(doc.metadata)
+
+# The path to our workbook test file
+xlsx_file_path = "msft_data/FY16Q1-zip/KPI_FY16Q1.xlsx"
+
+print(f"\n--- Loading XLSX workbook: {xlsx_file_path} ---")
+
+workbook_docs = TableXLSXLoader(xlsx_file_path).load()
+
+if not workbook_docs:
+    print("!!! Test Failed: No documents were loaded.")
+else:
+    sheets = sorted({doc.metadata["sheet_name"] for doc in workbook_docs})
+    print(f"+++ Test Passed: Loaded {len(workbook_docs)} block(s) from sheets {sheets}.")
+
+    if "%" in workbook_docs[0].page_content:
+        print("+++ Test Passed: Percentage cells keep their formatting.")
+    else:
+        print("!!! Test Failed: Percentage cells were rendered as raw fractions.")
+
+    print("\n--- Block 1 Content (first 200 chars) ---")
+    print(workbook_docs[0].page_content[:200])
+
+# A text-only table: no row below the header may be taken for a header line
+print("\n--- Loading text-only CSV table ---")
+
+with tempfile.TemporaryDirectory() as temp_dir:
+    text_csv_path = os.path.join(temp_dir, "customers.csv")
+    with open(text_csv_path, "w") as f:
+        f.write("name,city,segment\n"
+                "Alice Smith,Paris,Retail\n"
+                "Bob Jones,Rome,Enterprise\n"
+                "Carol White,Berlin,Public Sector\n")
+    text_docs = TableCSVLoader(text_csv_path).load()
+
+if text_docs and text_docs[0].metadata["columns"] == ["name", "city", "segment"] \
+        and text_docs[0].metadata["table_rows"] == 3:
+    print("+++ Test Passed: Text rows stay data rows under a one-line header.")
+else:
+    print(f"!!! Test Failed: Unexpected table: "
+          f"{text_docs[0].metadata if text_docs else 'no documents'}")
+
+print("\n--- Test Complete ---")
@@ -7,6 +7,9 @@ and ensures chunks meet quality standards for RAG applications.
 
 from modules.text_chunker import EnterpriseTextChunker
 from modules.document_loader import EnterpriseDocumentLoader
+from modules.document_store import DocumentTextStore
+from langchain_core.documents import Document
+import tempfile
 
 def test_text_chunker():
     """Test the text chunker with various document types and scenarios."""
@@ -186,6 +189,42 @@ def test_text_chunker():
     except Exception as e:
         print(f"   ❌ Custom chunking failed: {e}")
     
+    print("\n" + "="*50 + "\n")
+    
+    # Test 7: Parent-document (small-to-big) chunking
+    print("7. Testing parent-document chunking...")
+    try:
+        parent_chunker = EnterpriseTextChunker(
+            chunk_size=200,
+            chunk_overlap=20,
+            parent_chunk_size=1000,
+            parent_chunk_overlap=100
+        )
+        text_store = DocumentTextStore(tempfile.mkdtemp())
+        
+        parent_text = sample_text * 5
+        children = parent_chunker.chunk_documents_with_parents(
+            [Document(page_content=parent_text, metadata={"source": "sample_report"})],
+            text_store
+        )
+        
+        # Every child must be contained in the parent window it points to
+        mismatches = 0
+        for child in children:
+            meta = child.metadata
+            window = text_store.read_span(
+                meta["parent_doc_key"], meta["parent_byte_start"], meta["parent_byte_end"]
+            )
+            if child.page_content not in window:
+                mismatches += 1
+        
+        parents = {(c.metadata["parent_doc_key"], c.metadata["parent_index"]) for c in children}
+        print(f"   ✅ Created {len(children)} children across {len(parents)} parent windows")
+        print(f"   {'✅' if mismatches == 0 else '❌'} Children outside their parent window: {mismatches}")
+        
+    except Exception as e:
+        print(f"   ❌ Parent-document chunking failed: {e}")
+    
     print("\n=== Text Chunker Validation Complete ===")
 
 if __name__ == "__main__":
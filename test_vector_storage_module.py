@@ -6,6 +6,8 @@ document storage, similarity search, and production features.
 """
 
 from modules.vector_storage import EnterpriseVectorStorage
+from modules.snapshot_manager import SnapshotManager
+from modules.backup_manager import IncrementalBackupManager
 from modules.embedding_generator import EnterpriseEmbeddingGenerator
 from modules.text_chunker import EnterpriseTextChunker
 from modules.document_loader import EnterpriseDocumentLoader
@@ -231,7 +233,17 @@ def test_vector_storage():
             print(f"   ✅ Backup files verified at: {backup_path}")
         else:
             print(f"   ❌ Backup files not found")
-        
+
+        # A second backup of unchanged storage writes no new blocks
+        second_backup = vector_store.backup_collection(backup_path)
+        print(f"   {'✅' if second_backup['new_data_mb'] < backup_result['backup_size_mb'] else '❌'} "
+              f"Incremental backup wrote {second_backup['new_data_mb']:.2f} MB")
+
+        restore_result = IncrementalBackupManager(backup_path).restore(
+            backup_result["backup_id"], os.path.join(backup_path, "restored")
+        )
+        print(f"   ✅ Restored {restore_result['files_restored']} files from {restore_result['backup_id']}")
+
     except Exception as e:
         print(f"   ❌ Backup functionality failed: {e}")
     
@@ -292,12 +304,237 @@ def test_vector_storage():
     
     print("\n" + "="*50 + "\n")
     
+    # Test 11: External compressed content store
+    print("11. Testing external content storage...")
+    external_db_path = "./test_chroma_db_external"
+    try:
+        if os.path.exists(external_db_path):
+            shutil.rmtree(external_db_path)
+        
+        external_store = EnterpriseVectorStorage(
+            storage_path=external_db_path,
+            collection_name="test_smb_documents",
+            external_content=True
+        )
+        external_store.add_documents(embedded_docs)
+        
+        # Chroma must not hold the text; search must still return it
+        raw = external_store.collection.get(limit=1, include=["documents"])
+        external_results = external_store.similarity_search(query_embedding, top_k=3)
+        hydrated = all(result['content'] for result in external_results)
+        
+        print(f"   {'✅' if not any(raw['documents'] or []) else '❌'} ChromaDB documents empty")
+        print(f"   {'✅' if hydrated else '❌'} Search results hydrated: {len(external_results)}")
+        print(f"   📦 Content store: {external_store.get_collection_info()['content_store']}")
+        
+    except Exception as e:
+        print(f"   ❌ External content storage failed: {e}")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # Test 12: Maximal Marginal Relevance diversification
+    print("12. Testing MMR search...")
+    try:
+        plain_results = vector_store.similarity_search(query_embedding, top_k=3)
+        mmr_results = vector_store.mmr_search(
+            query_embedding, top_k=3, fetch_k=10, lambda_mult=0.5
+        )
+        
+        # With lambda=1.0 MMR must reduce to plain top-k
+        relevance_only = vector_store.mmr_search(
+            query_embedding, top_k=3, fetch_k=10, lambda_mult=1.0
+        )
+        same_as_plain = [r['id'] for r in relevance_only] == [r['id'] for r in plain_results]
+        
+        print(f"   ✅ MMR returned {len(mmr_results)} results")
+        print(f"   {'✅' if same_as_plain else '❌'} lambda=1.0 matches plain similarity search")
+        print(f"   🔀 Plain: {[r['id'][:8] for r in plain_results]}")
+        print(f"   🔀 MMR:   {[r['id'][:8] for r in mmr_results]}")
+        
+    except Exception as e:
+        print(f"   ❌ MMR search failed: {e}")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # Test 13: Time-partitioned collections
+    print("13. Testing partitioned collections...")
+    partitioned_db_path = "./test_chroma_db_partitioned"
+    try:
+        if os.path.exists(partitioned_db_path):
+            shutil.rmtree(partitioned_db_path)
+        
+        partitioned_store = EnterpriseVectorStorage(
+            storage_path=partitioned_db_path,
+            collection_name="test_smb_documents",
+            partition_by="fiscal_year"
+        )
+        
+        # Spread the sample chunks over three fiscal years
+        partitioned_docs = [
+            {**doc, "metadata": {**doc["metadata"], "fiscal_year": 2020 + i % 3}}
+            for i, doc in enumerate(embedded_docs)
+        ]
+        partitioned_store.add_documents(partitioned_docs)
+        
+        routed = partitioned_store.collection.route({"fiscal_year": 2021})
+        fy_results = partitioned_store.similarity_search(
+            query_embedding, top_k=3, metadata_filter={"fiscal_year": 2021}
+        )
+        only_fy21 = all(r['metadata'].get('fiscal_year') == 2021 for r in fy_results)
+        
+        print(f"   ✅ Partitions: {partitioned_store.get_collection_info()['partitions']}")
+        print(f"   {'✅' if routed == ['2021'] else '❌'} FY2021 filter routed to: {routed}")
+        print(f"   {'✅' if only_fy21 else '❌'} Filtered results all from FY2021: {len(fy_results)}")
+        
+    except Exception as e:
+        print(f"   ❌ Partitioned collections failed: {e}")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # Test 14: Sharded storage
+    print("14. Testing sharded scatter-gather search...")
+    sharded_db_path = "./test_chroma_db_sharded"
+    try:
+        if os.path.exists(sharded_db_path):
+            shutil.rmtree(sharded_db_path)
+        
+        sharded_store = EnterpriseVectorStorage(
+            storage_path=sharded_db_path,
+            collection_name="test_smb_documents",
+            num_shards=2
+        )
+        sharded_store.add_documents(embedded_docs)
+        
+        sharded_results = sharded_store.similarity_search(query_embedding, top_k=3)
+        flat_results = vector_store.similarity_search(query_embedding, top_k=3)
+        same_order = [r['content'] for r in sharded_results] == [r['content'] for r in flat_results]
+        shard_stats = sharded_store.collection.last_query_stats
+        
+        print(f"   ✅ Sharded count: {sharded_store.collection.count()} over {sharded_store.num_shards} shards")
+        print(f"   {'✅' if same_order else '❌'} Merged top-3 matches unsharded search")
+        print(f"   {'✅' if not shard_stats['shards_timed_out'] else '❌'} Shards responded: {shard_stats['shards_responded']}")
+        
+        sharded_store.collection.close()
+        
+    except Exception as e:
+        print(f"   ❌ Sharded storage failed: {e}")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # Test 15: Snapshot publishing
+    print("15. Testing snapshot publish and reader hot-swap...")
+    snapshot_root = "./test_chroma_db_snapshots"
+    try:
+        if os.path.exists(snapshot_root):
+            shutil.rmtree(snapshot_root)
+        
+        snapshots = SnapshotManager(snapshot_root)
+        first_version = snapshots.create_snapshot("v1")
+        first_store = EnterpriseVectorStorage(
+            storage_path=snapshots.snapshot_path(first_version),
+            collection_name="test_smb_documents"
+        )
+        first_store.add_documents(embedded_docs[:2])
+        snapshots.publish(first_version)
+        
+        # A second build is invisible to readers until it is published
+        second_version = snapshots.create_snapshot("v2")
+        second_store = EnterpriseVectorStorage(
+            storage_path=snapshots.snapshot_path(second_version),
+            collection_name="test_smb_documents"
+        )
+        second_store.add_documents(embedded_docs)
+        before_publish = snapshots.current_version()
+        snapshots.publish(second_version)
+        
+        reader = EnterpriseVectorStorage(
+            storage_path=snapshots.resolve_storage_path(),
+            collection_name="test_smb_documents"
+        )
+        
+        print(f"   {'✅' if before_publish == 'v1' else '❌'} Unpublished build hidden (current: {before_publish})")
+        print(f"   {'✅' if snapshots.current_version() == 'v2' else '❌'} Published: {snapshots.current_version()}")
+        print(f"   {'✅' if reader.collection.count() == len(embedded_docs) else '❌'} Reader sees new snapshot: {reader.collection.count()} documents")
+        print(f"   ✅ Pruned: {snapshots.prune(keep=1)}")
+        
+    except Exception as e:
+        print(f"   ❌ Snapshot publishing failed: {e}")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # Test 16: Bulk delete and compaction
+    print("16. Testing delete-by-metadata and compaction...")
+    try:
+        before_count = vector_store.collection.count()
+        purge_result = vector_store.delete_by_metadata({"doc_type": "test_document"})
+        compact_result = vector_store.compact()
+        after_count = vector_store.collection.count()
+        
+        print(f"   {'✅' if purge_result['documents_deleted'] == before_count - after_count else '❌'} "
+              f"Deleted {purge_result['documents_deleted']} test documents in {purge_result['batch_count']} batches")
+        print(f"   ✅ Compacted: {compact_result['size_before_mb']:.2f} MB -> {compact_result['size_after_mb']:.2f} MB")
+        print(f"   {'✅' if vector_store.similarity_search(query_embedding, top_k=1) else '❌'} Search works after compaction")
+        
+    except Exception as e:
+        print(f"   ❌ Bulk delete and compaction failed: {e}")
+    
+    print("\n" + "="*50 + "\n")
+    
+    # Test 17: Quantized search with exact re-scoring
+    print("17. Testing int8 quantized search...")
+    quantized_db_path = "./test_chroma_db_quantized"
+    try:
+        if os.path.exists(quantized_db_path):
+            shutil.rmtree(quantized_db_path)
+        
+        quantized_store = EnterpriseVectorStorage(
+            storage_path=quantized_db_path,
+            collection_name="test_smb_documents",
+            vector_quantization="int8"
+        )
+        # Own copy of the memo chunks, independent of earlier tests' deletes
+        quantized_docs = [
+            {**doc, "metadata": {**doc["metadata"], "doc_type": "quantized_test"}}
+            for doc in embedded_docs
+        ]
+        quantized_store.add_documents(quantized_docs)
+        
+        quantized_results = quantized_store.similarity_search(query_embedding, top_k=3, exhaustive=True)
+        
+        # Exact float32 cosine ranking over the same documents
+        doc_vectors = np.array([doc["embedding"] for doc in quantized_docs], dtype=np.float32)
+        exact_scores = doc_vectors @ query_embedding / (
+            np.linalg.norm(doc_vectors, axis=1) * np.linalg.norm(query_embedding)
+        )
+        exact_order = np.argsort(-exact_scores, kind="stable")[:3]
+        same_order = [r['content'] for r in quantized_results] == [quantized_docs[i]['content'] for i in exact_order]
+        same_scores = np.allclose(
+            [r['similarity'] for r in quantized_results], exact_scores[exact_order], atol=1e-4
+        )
+        index_info = quantized_store.get_collection_info()["quantized_index"]
+        
+        print(f"   ✅ Quantized {index_info['live_vectors']} vectors ({index_info['compression_vs_float32']}x smaller copy)")
+        print(f"   {'✅' if same_order else '❌'} Re-scored top-3 matches exact float32 ranking")
+        print(f"   {'✅' if same_scores else '❌'} Re-scored similarities match float32 scores")
+        
+        reopened_store = EnterpriseVectorStorage(storage_path=quantized_db_path, collection_name="test_smb_documents")
+        print(f"   {'✅' if reopened_store.vector_quantization == 'int8' else '❌'} Quantized index detected on reopen")
+        
+    except Exception as e:
+        print(f"   ❌ Quantized search failed: {e}")
+    
+    print("\n" + "="*50 + "\n")
+    
     # Cleanup
-    print("11. Cleanup test databases...")
+    print("18. Cleanup test databases...")
     try:
         if os.path.exists(test_db_path):
             shutil.rmtree(test_db_path)
             print("   ✅ Test database cleaned up")
+        
+        for extra_db_path in (external_db_path, partitioned_db_path, sharded_db_path, snapshot_root, quantized_db_path):
+            if os.path.exists(extra_db_path):
+                shutil.rmtree(extra_db_path)
             
         if os.path.exists("./test_backup"):
             shutil.rmtree("./test_backup")
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """
 Microsoft XLSX Sheet Extractor & PDF Converter
-Extracts individual sheets from XLSX files and converts half to PDF format
+Extracts individual sheets from XLSX files and optionally converts some to PDF format
+
+Ingestion reads .xlsx workbooks natively (see modules/table_loader.py), so
+this script is only needed to export sheets for other tools.
 """
 
 import pandas as pd
@@ -62,8 +65,8 @@ def extract_xlsx_sheets(source_dirs, output_base_dir, convert_to_pdf_ratio=0.5):
             
             for i, sheet_name in enumerate(sheets):
                 try:
-                    # Read sheet data
-                    df = pd.read_excel(xlsx_file, sheet_name=sheet_name)
+                    # Read sheet data from the already opened workbook
+                    df = xl_file.parse(sheet_name)
                     
                     # Skip empty sheets
                     if df.empty:
@@ -76,8 +79,8 @@ def extract_xlsx_sheets(source_dirs, output_base_dir, convert_to_pdf_ratio=0.5):
                     # Create filename with temporal info
                     output_name = f"{base_name}_{clean_sheet_name}"
                     
-                    # Decide format: PDF or CSV (50/50 split roughly)
-                    should_convert_to_pdf = (total_sheets % 2 == 0)
+                    # Decide format: PDF for convert_to_pdf_ratio of the sheets, CSV otherwise
+                    should_convert_to_pdf = pdf_count < convert_to_pdf_ratio * (total_sheets + 1)
                     
                     if should_convert_to_pdf:
                         # Convert to PDF
@@ -172,7 +175,8 @@ if __name__ == "__main__":
     print(f"  CSV: {output_base}/extracted_csv/")
     print(f"  PDF: {output_base}/extracted_pdf/")
     print("Starting XLSX sheet extraction...")
-    csv_count, pdf_count = extract_xlsx_sheets(source_dirs, output_base, convert_to_pdf_ratio=0.5)
+    # PDFs were only needed for ingestion, which now reads .xlsx directly
+    csv_count, pdf_count = extract_xlsx_sheets(source_dirs, output_base, convert_to_pdf_ratio=0.0)
     
     print(f"\n=== EXTRACTION COMPLETE ===")
     print(f"CSV files created: {csv_count}")